@@ -4,16 +4,18 @@ A backup Streamlit application for the voting workshop.
 """
 
 import streamlit as st
-import json
-from web3 import Web3
-from eth_account import Account
-from eth_account.messages import encode_defunct
+import os
 import pandas as pd
-import plotly.graph_objects as go
 import time
 from datetime import datetime
-import base64
-import nacl.public
+from concurrent.futures import ThreadPoolExecutor
+from workshop.chain import connect, load_contract
+from workshop.charts import PRIVATE_COLOR, PUBLIC_COLOR, STYLE_BACKUP, lightweight_charts_default, results_figure, results_spec
+from workshop.config import load_votes_config
+from workshop.archive import archive_file_name, build_export_archive, summarize_manifest
+from workshop.decryption import get_vote_signature_options
+from workshop.decryption_jobs import get_decryption_job
+from workshop.rpc_scheduler import PRIORITY_BACKGROUND, bind_priority
 
 # Page configuration
 st.set_page_config(
@@ -89,8 +91,13 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Contract configuration
-CONTRACT_ADDRESS = "0xBA2741D011e34F154FF6E886e051c4278aC8B9AF"
+# Vote and contract configuration, shared with the other dashboards and the
+# frontend (src/config/votes.json, parsed once per process)
+VOTES_CONFIG = load_votes_config()
+
+# Contract configuration (override with the CONTRACT_ADDRESS environment
+# variable, e.g. to point at a local deployment from scripts/simulate_workshop.py)
+CONTRACT_ADDRESS = os.environ.get("CONTRACT_ADDRESS", VOTES_CONFIG.contract_address)
 
 # Default RPC endpoint
 DEFAULT_RPC_URL = "https://public.sepolia.rpc.status.network"
@@ -98,197 +105,11 @@ DEFAULT_RPC_URL = "https://public.sepolia.rpc.status.network"
 # Default decryption key (Base64 encoded)
 DEFAULT_DECRYPTION_KEY = "UgsmFEqNQrYE32riH1Ph0mBV7g2IVQ1FIXPEbTyb0zY="
 
-# Vote configuration (matches votesConfig.ts)
-VOTE_CONFIGS = {
-    "vote0": {
-        "voteKey": "vote0",
-        "electionId": 1,
-        "type": "public",
-        "title": "Training Ground",
-        "options": [
-            {"id": 1, "text": "Feeling Messi-level productive today"},
-            {"id": 2, "text": "Surviving on empanadas and wine"},
-            {"id": 3, "text": "Could use a siesta."},
-            {"id": 4, "text": "Like the Buenos Aires weather - a bit unpredictable"},
-        ],
-    },
-    "vote1a": {
-        "voteKey": "vote1a",
-        "electionId": 2,
-        "type": "public",
-        "title": "Vote 1a: Coordination",
-        "options": [
-            {"id": 1, "text": "District A"},
-            {"id": 2, "text": "District B"},
-            {"id": 3, "text": "District C"},
-            {"id": 4, "text": "District D"},
-        ],
-    },
-    "vote1b": {
-        "voteKey": "vote1b",
-        "electionId": 3,
-        "type": "private",
-        "title": "Vote 1b: Private Coordination",
-        "options": [
-            {"id": 1, "text": "District A"},
-            {"id": 2, "text": "District B"},
-            {"id": 3, "text": "District C"},
-            {"id": 4, "text": "District D"},
-        ],
-    },
-    "vote2a": {
-        "voteKey": "vote2a",
-        "electionId": 4,
-        "type": "public",
-        "title": "Vote 2a: Strategic Initiative - Round 1 (Public)",
-        "options": [
-            {"id": 1, "text": "A – Citywide Campaign (Marketing)"},
-            {"id": 2, "text": "B – Process Upgrade (Operations)"},
-            {"id": 3, "text": "C – Community Program (Community)"},
-            {"id": 4, "text": "D – Shared Hub (Everyone)"},
-        ],
-    },
-    "vote2b": {
-        "voteKey": "vote2b",
-        "electionId": 5,
-        "type": "public",
-        "title": "Vote 2b: Strategic Initiative - Round 2 (Public)",
-        "options": [
-            {"id": 1, "text": "A – Citywide Campaign (Marketing)"},
-            {"id": 2, "text": "B – Process Upgrade (Operations)"},
-            {"id": 3, "text": "C – Community Program (Community)"},
-            {"id": 4, "text": "D – Shared Hub (Everyone)"},
-        ],
-    },
-    "vote2c": {
-        "voteKey": "vote2c",
-        "electionId": 6,
-        "type": "private",
-        "title": "Vote 2c: Strategic Initiative - Round 3 (Private)",
-        "options": [
-            {"id": 1, "text": "A – Citywide Campaign (Marketing)"},
-            {"id": 2, "text": "B – Process Upgrade (Operations)"},
-            {"id": 3, "text": "C – Community Program (Community)"},
-            {"id": 4, "text": "D – Shared Hub (Everyone)"},
-        ],
-    },
-    "vote2d": {
-        "voteKey": "vote2d",
-        "electionId": 7,
-        "type": "private",
-        "title": "Vote 2d: Strategic Initiative - Round 4 (Final, Private)",
-        "options": [
-            {"id": 1, "text": "A – Citywide Campaign (Marketing)"},
-            {"id": 2, "text": "B – Process Upgrade (Operations)"},
-            {"id": 3, "text": "C – Community Program (Community)"},
-            {"id": 4, "text": "D – Shared Hub (Everyone, bonus if ≥50%)"},
-        ],
-    },
-    "vote3": {
-        "voteKey": "vote3",
-        "electionId": 8,
-        "type": "public",
-        "title": "Vote 3: Merit vs Luck",
-        "options": [
-            {"id": 1, "text": "Award to current 3rd place participant"},
-            {"id": 2, "text": "Random draw among all participants"},
-        ],
-    },
-}
-
-# Generate vote options for signature verification (for private votes)
-# These are the messages users sign: "I vote for [option text]"
-def get_vote_signature_options(vote_config):
-    """Generate signature verification options from vote config"""
-    return [f"I vote for {opt['text']}" for opt in vote_config['options']]
-
-# Decryption functions
-def decrypt_signature(encrypted_base64, private_key_base64):
-    """Decrypt an encrypted signature using the private key"""
-    try:
-        # Decode private key
-        private_key_bytes = base64.b64decode(private_key_base64)
-        
-        if len(private_key_bytes) != 32:
-            raise ValueError(f"Invalid private key length: {len(private_key_bytes)} bytes (expected 32)")
-        
-        # Decode encrypted message
-        full_message = base64.b64decode(encrypted_base64)
-        
-        # Extract components
-        ephemeral_public_key = full_message[0:32]
-        nonce = full_message[32:56]
-        encrypted = full_message[56:]
-        
-        # Create NaCl box for decryption
-        private_key = nacl.public.PrivateKey(private_key_bytes)
-        public_key = nacl.public.PublicKey(ephemeral_public_key)
-        box = nacl.public.Box(private_key, public_key)
-        
-        # Decrypt
-        decrypted = box.decrypt(encrypted, nonce)
-        
-        # Convert to string (should be hex signature)
-        signature = decrypted.decode('utf-8')
-        
-        return signature
-    except Exception as e:
-        raise Exception(f"Decryption error: {str(e)}")
+# Number of concurrent RPC requests used by the bulk export
+EXPORT_WORKERS = 8
 
-def verify_vote_signature(signature, voter_address, options):
-    """Verify which option a signature corresponds to"""
-    try:
-        # Try each option
-        for i, message in enumerate(options):
-            try:
-                # Encode the message
-                encoded_message = encode_defunct(text=message)
-                
-                # Recover the address from the signature
-                recovered_address = Account.recover_message(encoded_message, signature=signature)
-                
-                # Check if it matches the voter address
-                if recovered_address.lower() == voter_address.lower():
-                    return {
-                        'optionIndex': i,
-                        'optionText': message,
-                        'choice': i + 1  # 1-indexed for display
-                    }
-            except Exception:
-                # This option doesn't match, continue
-                continue
-        
-        # No match found
-        return None
-    except Exception as e:
-        raise Exception(f"Signature verification error: {str(e)}")
-
-def decrypt_and_verify_vote(encrypted_bytes, voter_address, private_key_base64, options):
-    """Complete flow: Decrypt and verify a vote from contract bytes"""
-    try:
-        # encrypted_bytes is already the encrypted signature from contract (bytes)
-        # Convert to base64 if needed
-        if isinstance(encrypted_bytes, bytes):
-            encrypted_signature = base64.b64encode(encrypted_bytes).decode('utf-8')
-        else:
-            encrypted_signature = encrypted_bytes
-        
-        # Step 1: Decrypt signature
-        decrypted_signature = decrypt_signature(encrypted_signature, private_key_base64)
-        
-        # Step 2: Verify which option was voted for
-        vote = verify_vote_signature(decrypted_signature, voter_address, options)
-        
-        return {
-            'encryptedSignature': encrypted_signature,
-            'decryptedSignature': decrypted_signature,
-            'vote': vote
-        }
-    except Exception as e:
-        raise Exception(f"Failed to decrypt and verify vote: {str(e)}")
-
-# Contract ABI (full ABI from deployed contract)
-CONTRACT_ABI = json.loads('''[{"inputs":[],"stateMutability":"nonpayable","type":"constructor"},{"inputs":[{"internalType":"address","name":"owner","type":"address"}],"name":"OwnableInvalidOwner","type":"error"},{"inputs":[{"internalType":"address","name":"account","type":"address"}],"name":"OwnableUnauthorizedAccount","type":"error"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"uint256","name":"electionId","type":"uint256"},{"indexed":false,"internalType":"uint256","name":"timestamp","type":"uint256"}],"name":"ElectionClosed","type":"event"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"uint256","name":"electionId","type":"uint256"},{"indexed":false,"internalType":"bool","name":"isPublic","type":"bool"},{"indexed":false,"internalType":"uint256","name":"timestamp","type":"uint256"}],"name":"ElectionOpened","type":"event"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"address","name":"previousOwner","type":"address"},{"indexed":true,"internalType":"address","name":"newOwner","type":"address"}],"name":"OwnershipTransferred","type":"event"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"uint256","name":"electionId","type":"uint256"},{"indexed":true,"internalType":"uint256","name":"userId","type":"uint256"},{"indexed":false,"internalType":"uint256","name":"timestamp","type":"uint256"}],"name":"PrivateVoteCast","type":"event"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"uint256","name":"electionId","type":"uint256"},{"indexed":true,"internalType":"uint256","name":"userId","type":"uint256"},{"indexed":false,"internalType":"uint256","name":"choice","type":"uint256"},{"indexed":false,"internalType":"uint256","name":"timestamp","type":"uint256"}],"name":"PublicVoteCast","type":"event"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"address","name":"user","type":"address"},{"indexed":true,"internalType":"uint256","name":"userId","type":"uint256"}],"name":"UserRegistered","type":"event"},{"inputs":[{"internalType":"address","name":"","type":"address"}],"name":"addressToId","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"uint256","name":"electionId","type":"uint256"},{"internalType":"bytes","name":"encryptedSignature","type":"bytes"}],"name":"castPrivateVote","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"uint256","name":"electionId","type":"uint256"},{"internalType":"uint256","name":"choice","type":"uint256"}],"name":"castPublicVote","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"uint256","name":"electionId","type":"uint256"}],"name":"closeElection","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"uint256","name":"","type":"uint256"}],"name":"electionIds","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"uint256","name":"","type":"uint256"}],"name":"elections","outputs":[{"internalType":"uint256","name":"id","type":"uint256"},{"internalType":"enum VotingWorkshop.ElectionStatus","name":"status","type":"uint8"},{"internalType":"bool","name":"isPublic","type":"bool"},{"internalType":"uint256","name":"openedAt","type":"uint256"},{"internalType":"uint256","name":"closedAt","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"uint256","name":"electionId","type":"uint256"}],"name":"getAllPrivateVotes","outputs":[{"internalType":"uint256[]","name":"userIds","type":"uint256[]"},{"internalType":"bytes[]","name":"signatures","type":"bytes[]"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"uint256","name":"electionId","type":"uint256"}],"name":"getAllPublicVotes","outputs":[{"internalType":"uint256[]","name":"userIds","type":"uint256[]"},{"internalType":"uint256[]","name":"choices","type":"uint256[]"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"uint256","name":"electionId","type":"uint256"},{"internalType":"uint256","name":"choice","type":"uint256"}],"name":"getChoiceVoteCount","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"uint256","name":"electionId","type":"uint256"}],"name":"getElection","outputs":[{"components":[{"internalType":"uint256","name":"id","type":"uint256"},{"internalType":"enum VotingWorkshop.ElectionStatus","name":"status","type":"uint8"},{"internalType":"bool","name":"isPublic","type":"bool"},{"internalType":"uint256","name":"openedAt","type":"uint256"},{"internalType":"uint256","name":"closedAt","type":"uint256"}],"internalType":"struct VotingWorkshop.Election","name":"","type":"tuple"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"uint256","name":"electionId","type":"uint256"},{"internalType":"uint256","name":"numChoices","type":"uint256"}],"name":"getElectionResults","outputs":[{"internalType":"uint256[]","name":"counts","type":"uint256[]"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"uint256","name":"electionId","type":"uint256"},{"internalType":"uint256","name":"userId","type":"uint256"}],"name":"getPrivateVote","outputs":[{"internalType":"bytes","name":"","type":"bytes"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"uint256","name":"electionId","type":"uint256"},{"internalType":"uint256","name":"startIndex","type":"uint256"},{"internalType":"uint256","name":"limit","type":"uint256"}],"name":"getPrivateVotesBatch","outputs":[{"internalType":"uint256[]","name":"userIds","type":"uint256[]"},{"internalType":"bytes[]","name":"signatures","type":"bytes[]"},{"internalType":"uint256","name":"total","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"uint256","name":"electionId","type":"uint256"},{"internalType":"uint256","name":"userId","type":"uint256"}],"name":"getPublicVote","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"getTotalElections","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"getTotalRegistered","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"uint256","name":"electionId","type":"uint256"}],"name":"getVoteCount","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"uint256","name":"electionId","type":"uint256"}],"name":"getVotersInElection","outputs":[{"internalType":"uint256[]","name":"","type":"uint256[]"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"uint256","name":"electionId","type":"uint256"},{"internalType":"address","name":"userAddress","type":"address"}],"name":"hasUserVoted","outputs":[{"internalType":"bool","name":"","type":"bool"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"uint256","name":"","type":"uint256"},{"internalType":"uint256","name":"","type":"uint256"}],"name":"hasVoted","outputs":[{"internalType":"bool","name":"","type":"bool"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"uint256","name":"","type":"uint256"}],"name":"idToAddress","outputs":[{"internalType":"address","name":"","type":"address"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"uint256","name":"electionId","type":"uint256"}],"name":"isElectionOpen","outputs":[{"internalType":"bool","name":"","type":"bool"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"address","name":"user","type":"address"}],"name":"isRegistered","outputs":[{"internalType":"bool","name":"","type":"bool"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"uint256","name":"electionId","type":"uint256"},{"internalType":"bool","name":"isPublic","type":"bool"}],"name":"openElection","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"nonpayable","type":"function"},{"inputs":[],"name":"owner","outputs":[{"internalType":"address","name":"","type":"address"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"uint256","name":"","type":"uint256"},{"internalType":"uint256","name":"","type":"uint256"}],"name":"publicVotes","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"register","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[],"name":"renounceOwnership","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"address","name":"newOwner","type":"address"}],"name":"transferOwnership","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"uint256","name":"","type":"uint256"},{"internalType":"uint256","name":"","type":"uint256"}],"name":"voteCountPerChoice","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"}]''')
+# Vote configuration by vote key
+VOTE_CONFIGS = VOTES_CONFIG.by_key
 
 # Initialize session state
 if 'web3' not in st.session_state:
@@ -299,32 +120,34 @@ if 'contract' not in st.session_state:
     st.session_state.contract = None
 if 'last_refresh' not in st.session_state:
     st.session_state.last_refresh = None
+if 'lightweight_charts' not in st.session_state:
+    st.session_state.lightweight_charts = lightweight_charts_default()
+
+@st.cache_resource(show_spinner=False)
+def get_connection(rpc_url: str):
+    """Web3 connection and contract object for an RPC endpoint, shared by every session"""
+    w3 = connect(rpc_url)
+    return w3, load_contract(w3, CONTRACT_ADDRESS)
+
+def show_results_chart(election_id, labels, votes, total, bar_color):
+    """Vote distribution bar chart - Plotly, or a Vega-Lite spec in lightweight mode"""
+    if st.session_state.lightweight_charts:
+        st.vega_lite_chart(results_spec(labels, votes, total, "Vote Distribution", bar_color), width='stretch')
+    else:
+        st.plotly_chart(
+            results_figure(election_id, labels, votes, total, "Vote Distribution", bar_color, STYLE_BACKUP),
+            width='stretch'
+        )
 
 def initialize_web3(rpc_url: str, private_key: str):
     """Initialize Web3 connection and account"""
     try:
         with st.spinner("Connecting to blockchain..."):
-            # Connect to blockchain with timeout settings
-            # Set request timeout to 5 seconds for faster failures
-            from web3.providers import HTTPProvider
-            from web3 import Web3 as Web3Class
-            
-            provider = HTTPProvider(
-                rpc_url,
-                request_kwargs={
-                    'timeout': 5  # 5 second timeout per request
-                }
-            )
-            w3 = Web3Class(provider)
-            
-            # Add POA middleware for compatibility
-            try:
-                from web3.middleware.proof_of_authority import ExtraDataToPOAMiddleware
-                w3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
-            except ImportError:
-                pass
+            # Connection and contract are shared by every session of this process
+            w3, contract = get_connection(rpc_url)
             
             if not w3.is_connected():
+                get_connection.clear()
                 st.error("❌ Failed to connect to blockchain")
                 return False
             
@@ -332,14 +155,9 @@ def initialize_web3(rpc_url: str, private_key: str):
             if not private_key.startswith('0x'):
                 private_key = '0x' + private_key
             
+            from eth_account import Account
             account = Account.from_key(private_key)
             
-            # Initialize contract
-            contract = w3.eth.contract(
-                address=Web3.to_checksum_address(CONTRACT_ADDRESS),
-                abi=CONTRACT_ABI
-            )
-            
             # Store in session state
             st.session_state.web3 = w3
             st.session_state.account = account
@@ -351,6 +169,137 @@ def initialize_web3(rpc_url: str, private_key: str):
         st.error(f"❌ Error initializing Web3: {str(e)}")
         return False
 
+def public_votes_dataframe(user_ids, choices, options):
+    """Build the public votes table (User ID, Choice) with option names from the vote config"""
+    choice_names = []
+    for choice in choices:
+        choice_idx = int(choice) - 1  # Convert to 0-based index
+        if 0 <= choice_idx < len(options):
+            choice_names.append(options[choice_idx]['text'])
+        else:
+            choice_names.append(f"Option {int(choice)}")
+    
+    votes_df = pd.DataFrame({
+        'User ID': [int(uid) for uid in user_ids],
+        'Choice': choice_names
+    })
+    
+    # Sort by User ID for better readability
+    return votes_df.sort_values('User ID').reset_index(drop=True)
+
+def decrypt_private_votes(contract, vote_config, decryption_key, progress=None):
+    """
+    Decrypt and verify every private vote of an election
+    
+    Runs through the shared background decryption job, so an interrupted run
+    resumes from its checkpoint and votes already decrypted are not redone.
+    
+    Args:
+        progress: Optional callback progress(done, total) for UI updates
+    
+    Returns:
+        Tuple of (decrypted_votes, failed_decrypts) as lists of row dicts
+    
+    Raises:
+        RuntimeError: If the job stopped early (e.g. an RPC failure)
+    """
+    options = vote_config['options']
+    job = get_decryption_job(contract, vote_config['electionId'], get_vote_signature_options(vote_config))
+    job.start(decryption_key)
+    job.wait(progress=progress)
+    
+    status = job.status()
+    if status['state'] == 'error':
+        raise RuntimeError(f"Decryption stopped at vote {status['done'] + 1}: {status['error']}")
+    
+    decrypted_votes = [
+        {
+            'User ID': user_id,
+            'Choice': options[vote['choice'] - 1]['text'],
+            'Vote Text': vote['optionText']
+        }
+        for user_id, vote in sorted(job.results().items())
+    ]
+    failed_decrypts = [
+        {'User ID': user_id, 'Error': error}
+        for user_id, error in sorted(job.failures().items())
+    ]
+    return decrypted_votes, failed_decrypts
+
+def fetch_election_export(contract, vote_config):
+    """Fetch the raw on-chain data of one election for the bulk export"""
+    election_id = vote_config['electionId']
+    try:
+        election = contract.functions.getElection(election_id).call()
+    except Exception:
+        # Election not created yet
+        return {'config': vote_config, 'status': 'Not Created', 'user_ids': [], 'payload': []}
+    
+    if vote_config['type'] == 'private':
+        # Ciphertexts are read by the decryption job
+        user_ids, payload = contract.functions.getVotersInElection(election_id).call(), []
+    else:
+        user_ids, payload = contract.functions.getAllPublicVotes(election_id).call()
+    
+    return {
+        'config': vote_config,
+        'status': "Open" if election[1] == 1 else "Closed",
+        'user_ids': list(user_ids),
+        'payload': list(payload)
+    }
+
+def export_all_elections(contract, decryption_key):
+    """
+    Fetch, decrypt and tabulate every election in VOTE_CONFIGS
+    
+    Elections are fetched concurrently and the private elections are decrypted
+    by their background jobs in parallel.
+    
+    Returns:
+        List of election dicts as expected by build_export_archive
+    """
+    vote_configs = list(VOTE_CONFIGS.values())
+    
+    # Step 1: Fetch all elections concurrently, behind any interactive reads
+    fetch = bind_priority(lambda config: fetch_election_export(contract, config), PRIORITY_BACKGROUND)
+    with ThreadPoolExecutor(max_workers=EXPORT_WORKERS) as pool:
+        raw_elections = list(pool.map(fetch, vote_configs))
+    
+    # Step 2: Start every private decryption job so they run side by side
+    if decryption_key:
+        for raw in raw_elections:
+            config = raw['config']
+            if config['type'] == 'private' and raw['user_ids']:
+                get_decryption_job(contract, config['electionId'], get_vote_signature_options(config)).start(decryption_key)
+    
+    # Step 3: Tabulate public votes and decrypt private votes
+    elections = []
+    for raw in raw_elections:
+        config = raw['config']
+        failed_decrypts = []
+        votes_df = None
+        
+        if raw['user_ids']:
+            if config['type'] == 'public':
+                votes_df = public_votes_dataframe(raw['user_ids'], raw['payload'], config['options'])
+            elif decryption_key:
+                decrypted_votes, failed_decrypts = decrypt_private_votes(contract, config, decryption_key)
+                if decrypted_votes:
+                    votes_df = pd.DataFrame(decrypted_votes).sort_values('User ID').reset_index(drop=True)
+        
+        elections.append({
+            'voteKey': config['voteKey'],
+            'electionId': config['electionId'],
+            'type': config['type'],
+            'title': config['title'],
+            'status': raw['status'],
+            'voteCount': len(raw['user_ids']),
+            'votes_df': votes_df,
+            'failed': failed_decrypts
+        })
+    
+    return elections
+
 # Main UI
 st.title("📊 Voting Workshop Backup Dashboard")
 
@@ -437,6 +386,11 @@ else:
         
         # Display vote info
         st.caption(f"**Type:** {selected_vote_config['type'].title()} | **Election ID:** {selected_vote_config['electionId']} | **Options:** {len(selected_vote_config['options'])}")
+        st.toggle(
+            "Lightweight charts",
+            key="lightweight_charts",
+            help="Draw results with a simple built-in chart instead of Plotly"
+        )
     
     with col_input2:
         st.markdown("<br>", unsafe_allow_html=True)  # Spacer for alignment
@@ -548,40 +502,8 @@ else:
                         col1, col2 = st.columns([2, 1])
                         
                         with col1:
-                            # Create horizontal bar chart with Plotly
-                            colors = ['#ff6b6b' if v == max_votes else '#4ecdc4' for v in df['Votes']]
-                            
-                            fig = go.Figure(data=[
-                                go.Bar(
-                                    y=df['Option'],
-                                    x=df['Votes'],
-                                    orientation='h',
-                                    marker=dict(
-                                        color=colors,
-                                        line=dict(color='rgba(0,0,0,0.1)', width=1)
-                                    ),
-                                    text=[f"{v} ({p:.1f}%)" for v, p in zip(df['Votes'], df['Percentage'])],
-                                    textposition='outside',
-                                    hovertemplate='<b>%{y}</b><br>Votes: %{x}<br><extra></extra>'
-                                )
-                            ])
-                            
-                            fig.update_layout(
-                                title="Vote Distribution",
-                                xaxis_title="Number of Votes",
-                                yaxis_title="",
-                                height=max(300, len(option_labels) * 60),
-                                showlegend=False,
-                                plot_bgcolor='rgba(0,0,0,0)',
-                                paper_bgcolor='rgba(0,0,0,0)',
-                                margin=dict(l=20, r=20, t=40, b=20),
-                                font=dict(size=12)
-                            )
-                            
-                            fig.update_xaxes(gridcolor='rgba(128,128,128,0.2)')
-                            fig.update_yaxes(gridcolor='rgba(128,128,128,0.2)')
-                            
-                            st.plotly_chart(fig, width='stretch')
+                            # Horizontal bar chart, rebuilt only when the tally changes
+                            show_results_chart(query_election_id, option_labels, df['Votes'], total_votes, PUBLIC_COLOR)
                         
                         with col2:
                             # Display summary table
@@ -598,21 +520,7 @@ else:
                     
                     if len(user_ids) > 0:
                         # Create votes dataframe with actual option names
-                        choice_names = []
-                        for choice in choices:
-                            choice_idx = int(choice) - 1  # Convert to 0-based index
-                            if 0 <= choice_idx < len(query_options):
-                                choice_names.append(query_options[choice_idx]['text'])
-                            else:
-                                choice_names.append(f"Option {int(choice)}")
-                        
-                        votes_df = pd.DataFrame({
-                            'User ID': [int(uid) for uid in user_ids],
-                            'Choice': choice_names
-                        })
-                        
-                        # Sort by User ID for better readability
-                        votes_df = votes_df.sort_values('User ID').reset_index(drop=True)
+                        votes_df = public_votes_dataframe(user_ids, choices, query_options)
                         
                         # Display table
                         st.dataframe(
@@ -693,60 +601,19 @@ else:
                                     # Decrypted votes section (collapsible)
                                     with st.expander("🔓 Decrypted Votes", expanded=False):
                                         with st.spinner("Decrypting votes..."):
-                                            decrypted_votes = []
-                                            failed_decrypts = []
+                                            progress_bar = st.progress(0.0)
                                             
-                                            # Get voter addresses
-                                            user_id_to_address = {}
-                                            for user_id in private_user_ids:
-                                                try:
-                                                    address = contract.functions.idToAddress(user_id).call()
-                                                    user_id_to_address[int(user_id)] = address
-                                                except Exception as e:
-                                                    st.warning(f"Could not fetch address for user #{user_id}: {str(e)}")
+                                            def update_progress(done, total):
+                                                progress_bar.progress(done / total if total > 0 else 0.0, text=f"🔓 Decrypting vote {done}/{total}...")
                                             
-                                            # Decrypt each vote
-                                            for i, (user_id, encrypted_sig) in enumerate(zip(private_user_ids, encrypted_signatures)):
-                                                try:
-                                                    user_address = user_id_to_address.get(int(user_id))
-                                                    if not user_address:
-                                                        failed_decrypts.append({
-                                                            'User ID': int(user_id),
-                                                            'Error': 'Address not found'
-                                                        })
-                                                        continue
-                                                    
-                                                    # Decrypt and verify
-                                                    result = decrypt_and_verify_vote(
-                                                        encrypted_sig,
-                                                        user_address,
-                                                        decryption_key,
-                                                        vote_options
-                                                    )
-                                                    
-                                                    if result['vote']:
-                                                        # Get the actual option text from vote config
-                                                        option_idx = result['vote']['optionIndex']
-                                                        if 0 <= option_idx < len(query_options):
-                                                            option_text = query_options[option_idx]['text']
-                                                        else:
-                                                            option_text = result['vote']['optionText']
-                                                        
-                                                        decrypted_votes.append({
-                                                            'User ID': int(user_id),
-                                                            'Choice': option_text,
-                                                            'Vote Text': result['vote']['optionText']
-                                                        })
-                                                    else:
-                                                        failed_decrypts.append({
-                                                            'User ID': int(user_id),
-                                                            'Error': 'Signature verification failed'
-                                                        })
-                                                except Exception as e:
-                                                    failed_decrypts.append({
-                                                        'User ID': int(user_id),
-                                                        'Error': str(e)
-                                                    })
+                                            # Decrypt each vote (resumes where an interrupted run stopped)
+                                            decrypted_votes, failed_decrypts = decrypt_private_votes(
+                                                contract,
+                                                query_vote_config,
+                                                decryption_key,
+                                                progress=update_progress
+                                            )
+                                            progress_bar.empty()
                                             
                                             # Store decrypted votes for display outside expander
                                             if decrypted_votes:
@@ -823,40 +690,8 @@ else:
                                     col1, col2 = st.columns([2, 1])
                                     
                                     with col1:
-                                        # Create horizontal bar chart with Plotly
-                                        colors = ['#ff6b6b' if v == max_votes else '#a78bfa' for v in results_df['Votes']]
-                                        
-                                        fig = go.Figure(data=[
-                                            go.Bar(
-                                                y=results_df['Option'],
-                                                x=results_df['Votes'],
-                                                orientation='h',
-                                                marker=dict(
-                                                    color=colors,
-                                                    line=dict(color='rgba(0,0,0,0.1)', width=1)
-                                                ),
-                                                text=[f"{v} ({p:.1f}%)" for v, p in zip(results_df['Votes'], results_df['Percentage'])],
-                                                textposition='outside',
-                                                hovertemplate='<b>%{y}</b><br>Votes: %{x}<br><extra></extra>'
-                                            )
-                                        ])
-                                        
-                                        fig.update_layout(
-                                            title="Vote Distribution",
-                                            xaxis_title="Number of Votes",
-                                            yaxis_title="",
-                                            height=max(300, len(option_labels) * 60),
-                                            showlegend=False,
-                                            plot_bgcolor='rgba(0,0,0,0)',
-                                            paper_bgcolor='rgba(0,0,0,0)',
-                                            margin=dict(l=20, r=20, t=40, b=20),
-                                            font=dict(size=12)
-                                        )
-                                        
-                                        fig.update_xaxes(gridcolor='rgba(128,128,128,0.2)')
-                                        fig.update_yaxes(gridcolor='rgba(128,128,128,0.2)')
-                                        
-                                        st.plotly_chart(fig, width='stretch')
+                                        # Horizontal bar chart, rebuilt only when the tally changes
+                                        show_results_chart(query_election_id, option_labels, results_df['Votes'], total_decrypted, PRIVATE_COLOR)
                                     
                                     with col2:
                                         # Display summary table
@@ -897,4 +732,50 @@ else:
                     st.error(f"❌ Election #{query_election_id} does not exist or is invalid.")
                 else:
                     st.error(f"❌ Error fetching election data: {str(e)}")
+    
+    st.divider()
+    
+    # Bulk export of every election as a single archive
+    st.header("📦 Bulk Export")
+    st.caption("Fetch every election at once and download a single ZIP archive (one CSV per election plus a manifest). Upload it to the points dashboard in one go.")
+    
+    col_bulk1, col_bulk2 = st.columns([3, 1])
+    
+    with col_bulk1:
+        bulk_decryption_key = st.text_input(
+            "Decryption Key (Base64)",
+            value=DEFAULT_DECRYPTION_KEY,
+            type="password",
+            key="bulk_decryption_key",
+            help="Used to decrypt all private elections in the export"
+        )
+    
+    with col_bulk2:
+        st.markdown("<br>", unsafe_allow_html=True)  # Spacer for alignment
+        export_button = st.button("📦 Export All Elections", type="primary", width='stretch')
+    
+    if export_button:
+        try:
+            with st.spinner("Fetching and decrypting all elections..."):
+                elections = export_all_elections(st.session_state.contract, bulk_decryption_key)
+                archive, manifest = build_export_archive(elections, CONTRACT_ADDRESS)
+                st.session_state.bulk_export_archive = archive
+                st.session_state.bulk_export_manifest = manifest
+                st.session_state.bulk_export_file_name = archive_file_name()
+        except Exception as e:
+            st.error(f"❌ Error during bulk export: {str(e)}")
+    
+    if st.session_state.get('bulk_export_archive'):
+        st.dataframe(
+            summarize_manifest(st.session_state.bulk_export_manifest),
+            width='stretch',
+            hide_index=True
+        )
+        st.download_button(
+            label="📥 Download All Elections (ZIP)",
+            data=st.session_state.bulk_export_archive,
+            file_name=st.session_state.bulk_export_file_name,
+            mime="application/zip",
+            width='stretch'
+        )
 
@@ -4,12 +4,20 @@ A Streamlit application for viewing participants and their wallet addresses.
 """
 
 import streamlit as st
-import json
-from web3 import Web3
-from eth_account import Account
+import os
+import time
+import numpy as np
 import pandas as pd
 from datetime import datetime
-import random
+from workshop.addresses import get_address_directory
+from workshop.chain import connect, load_contract
+from workshop.config import load_votes_config
+from workshop.whatif import WhatIfModel
+from workshop.ingest import DUPLICATES_LAST, DUPLICATES_REJECT, read_chain_votes, read_vote_csv
+from workshop.archive import read_export_archive, summarize_manifest
+from workshop.ranking import select_random, select_top_k
+from workshop.tables import NO_CODE, ParticipantTable, choice_lookup, short_address
+from workshop.warmup import start_warmup
 
 # Page configuration
 st.set_page_config(
@@ -78,128 +86,32 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Contract configuration
-CONTRACT_ADDRESS = "0xBA2741D011e34F154FF6E886e051c4278aC8B9AF"
+# Vote and contract configuration, shared with the other dashboards and the
+# frontend (src/config/votes.json, parsed once per process)
+VOTES_CONFIG = load_votes_config()
+
+# Contract configuration (override with the CONTRACT_ADDRESS environment
+# variable, e.g. to point at a local deployment from scripts/simulate_workshop.py)
+CONTRACT_ADDRESS = os.environ.get("CONTRACT_ADDRESS", VOTES_CONFIG.contract_address)
 
 # Default RPC endpoint
 DEFAULT_RPC_URL = "https://public.sepolia.rpc.status.network"
 
-# Contract ABI (simplified - only the functions we need)
-CONTRACT_ABI = json.loads('''[
-    {
-        "inputs": [],
-        "name": "getTotalRegistered",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function"
-    },
-    {
-        "inputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "name": "idToAddress",
-        "outputs": [{"internalType": "address", "name": "", "type": "address"}],
-        "stateMutability": "view",
-        "type": "function"
-    }
-]''')
+# Default decryption key for private votes (Base64 encoded)
+DEFAULT_DECRYPTION_KEY = "UgsmFEqNQrYE32riH1Ph0mBV7g2IVQ1FIXPEbTyb0zY="
+
+# Warm the contract's caches (participants, snapshots, private votes) in the
+# background as soon as this process serves its first page, instead of on
+# the first connect (WARMUP_RPC_URL environment variable)
+WARMUP_RPC_URL = os.environ.get("WARMUP_RPC_URL")
+if WARMUP_RPC_URL:
+    start_warmup(VOTES_CONFIG, rpc_url=WARMUP_RPC_URL, contract_address=CONTRACT_ADDRESS, decryption_key=DEFAULT_DECRYPTION_KEY)
+
+# Vote configuration by vote key
+VOTE_CONFIGS = VOTES_CONFIG.by_key
 
-# Vote configuration (matches votesConfig.ts)
-VOTE_CONFIGS = {
-    "vote0": {
-        "voteKey": "vote0",
-        "electionId": 1,
-        "type": "public",
-        "title": "Training Ground",
-        "isPractice": True,
-        "options": [
-            {"id": 1, "text": "Feeling Messi-level productive today"},
-            {"id": 2, "text": "Surviving on empanadas and wine"},
-            {"id": 3, "text": "Could use a siesta."},
-            {"id": 4, "text": "Like the Buenos Aires weather - a bit unpredictable"},
-        ],
-    },
-    "vote1a": {
-        "voteKey": "vote1a",
-        "electionId": 2,
-        "type": "public",
-        "title": "Vote 1a: Coordination",
-        "options": [
-            {"id": 1, "text": "District A"},
-            {"id": 2, "text": "District B"},
-            {"id": 3, "text": "District C"},
-            {"id": 4, "text": "District D"},
-        ],
-    },
-    "vote1b": {
-        "voteKey": "vote1b",
-        "electionId": 3,
-        "type": "private",
-        "title": "Vote 1b: Private Coordination",
-        "options": [
-            {"id": 1, "text": "District A"},
-            {"id": 2, "text": "District B"},
-            {"id": 3, "text": "District C"},
-            {"id": 4, "text": "District D"},
-        ],
-    },
-    "vote2a": {
-        "voteKey": "vote2a",
-        "electionId": 4,
-        "type": "public",
-        "title": "Vote 2a: Strategic Initiative - Round 1 (Public)",
-        "options": [
-            {"id": 1, "text": "A – Citywide Campaign (Marketing)"},
-            {"id": 2, "text": "B – Process Upgrade (Operations)"},
-            {"id": 3, "text": "C – Community Program (Community)"},
-            {"id": 4, "text": "D – Shared Hub (Everyone)"},
-        ],
-    },
-    "vote2b": {
-        "voteKey": "vote2b",
-        "electionId": 5,
-        "type": "public",
-        "title": "Vote 2b: Strategic Initiative - Round 2 (Public)",
-        "options": [
-            {"id": 1, "text": "A – Citywide Campaign (Marketing)"},
-            {"id": 2, "text": "B – Process Upgrade (Operations)"},
-            {"id": 3, "text": "C – Community Program (Community)"},
-            {"id": 4, "text": "D – Shared Hub (Everyone)"},
-        ],
-    },
-    "vote2c": {
-        "voteKey": "vote2c",
-        "electionId": 6,
-        "type": "private",
-        "title": "Vote 2c: Strategic Initiative - Round 3 (Private)",
-        "options": [
-            {"id": 1, "text": "A – Citywide Campaign (Marketing)"},
-            {"id": 2, "text": "B – Process Upgrade (Operations)"},
-            {"id": 3, "text": "C – Community Program (Community)"},
-            {"id": 4, "text": "D – Shared Hub (Everyone)"},
-        ],
-    },
-    "vote2d": {
-        "voteKey": "vote2d",
-        "electionId": 7,
-        "type": "private",
-        "title": "Vote 2d: Strategic Initiative - Round 4 (Final, Private)",
-        "options": [
-            {"id": 1, "text": "A – Citywide Campaign (Marketing)"},
-            {"id": 2, "text": "B – Process Upgrade (Operations)"},
-            {"id": 3, "text": "C – Community Program (Community)"},
-            {"id": 4, "text": "D – Shared Hub (Everyone, bonus if ≥50%)"},
-        ],
-    },
-    "vote3": {
-        "voteKey": "vote3",
-        "electionId": 8,
-        "type": "public",
-        "title": "Vote 3: Merit vs Luck",
-        "options": [
-            {"id": 1, "text": "Award to current 3rd place participant"},
-            {"id": 2, "text": "Random draw among all participants"},
-        ],
-    },
-}
+# What the options of a scored vote are, by the groups its payoff rule pays
+OPTION_NAMES = {"district": "District", "committee": "Initiative"}
 
 # Initialize session state
 if 'web3' not in st.session_state:
@@ -212,33 +124,32 @@ if 'last_refresh' not in st.session_state:
     st.session_state.last_refresh = None
 if 'participants_data' not in st.session_state:
     st.session_state.participants_data = None
+if 'duplicate_votes' not in st.session_state:
+    st.session_state.duplicate_votes = DUPLICATES_LAST
 if 'vote_data' not in st.session_state:
     st.session_state.vote_data = {}  # Store uploaded vote data by vote key
+if 'whatif_models' not in st.session_state:
+    st.session_state.whatif_models = {}  # vote key -> (vote_df, model, baseline evaluation)
+if 'chain_votes' not in st.session_state:
+    st.session_state.chain_votes = {}  # vote key -> read_chain_votes info of votes loaded from chain
+if 'decryption_key' not in st.session_state:
+    st.session_state.decryption_key = DEFAULT_DECRYPTION_KEY
+
+@st.cache_resource(show_spinner=False)
+def get_connection(rpc_url: str):
+    """Web3 connection and contract object for an RPC endpoint, shared by every session"""
+    w3 = connect(rpc_url)
+    return w3, load_contract(w3, CONTRACT_ADDRESS)
 
 def initialize_web3(rpc_url: str, private_key: str):
     """Initialize Web3 connection and account"""
     try:
         with st.spinner("Connecting to blockchain..."):
-            # Connect to blockchain with timeout settings
-            from web3.providers import HTTPProvider
-            from web3 import Web3 as Web3Class
-            
-            provider = HTTPProvider(
-                rpc_url,
-                request_kwargs={
-                    'timeout': 5  # 5 second timeout per request
-                }
-            )
-            w3 = Web3Class(provider)
-            
-            # Add POA middleware for compatibility
-            try:
-                from web3.middleware.proof_of_authority import ExtraDataToPOAMiddleware
-                w3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
-            except ImportError:
-                pass
+            # Connection and contract are shared by every session of this process
+            w3, contract = get_connection(rpc_url)
             
             if not w3.is_connected():
+                get_connection.clear()
                 st.error("❌ Failed to connect to blockchain")
                 return False
             
@@ -246,20 +157,18 @@ def initialize_web3(rpc_url: str, private_key: str):
             if not private_key.startswith('0x'):
                 private_key = '0x' + private_key
             
+            from eth_account import Account
             account = Account.from_key(private_key)
             
-            # Initialize contract
-            contract = w3.eth.contract(
-                address=Web3.to_checksum_address(CONTRACT_ADDRESS),
-                abi=CONTRACT_ABI
-            )
-            
             # Store in session state
             st.session_state.web3 = w3
             st.session_state.account = account
             st.session_state.contract = contract
             st.session_state.last_refresh = datetime.now()
             
+            # Participants, snapshots and private votes load in the background meanwhile
+            start_warmup(VOTES_CONFIG, contract, decryption_key=st.session_state.decryption_key)
+            
             return True
     except Exception as e:
         st.error(f"❌ Error initializing Web3: {str(e)}")
@@ -271,161 +180,142 @@ def load_participants():
         contract = st.session_state.contract
         
         with st.spinner("Loading participants..."):
-            # Get total number of registered users
-            total_registered = contract.functions.getTotalRegistered().call()
-            
-            if total_registered == 0:
-                return pd.DataFrame(columns=['User ID', 'Wallet Address'])
-            
-            # Fetch all participant addresses
-            participants = []
+            # Only registrations not already in the shared address directory
+            # are fetched from the blockchain
+            directory = get_address_directory(contract)
             progress_bar = st.progress(0)
             status_text = st.empty()
             
-            for user_id in range(1, total_registered + 1):
-                try:
-                    # Update progress
-                    progress = (user_id - 1) / total_registered
-                    progress_bar.progress(progress)
-                    status_text.text(f"Loading participant {user_id}/{total_registered}...")
-                    
-                    # Get address for this user ID
-                    address = contract.functions.idToAddress(user_id).call()
-                    
-                    # Only add if address is not zero (valid registration)
-                    if address and address != '0x0000000000000000000000000000000000000000':
-                        participants.append({
-                            'User ID': user_id,
-                            'Wallet Address': address
-                        })
-                except Exception as e:
-                    # Skip invalid user IDs
-                    continue
+            def update_progress(done, total):
+                progress_bar.progress(done / total)
+                status_text.text(f"Loading participant {done}/{total}...")
+            
+            directory.refresh(progress=update_progress)
             
             progress_bar.progress(1.0)
             status_text.empty()
             progress_bar.empty()
             
-            # Create DataFrame
-            df = pd.DataFrame(participants)
+            # Compact table: uint32 IDs, binary addresses, codes computed once
+            participants = ParticipantTable.from_items(directory.items())
             
             # Store in session state
-            st.session_state.participants_data = df
+            st.session_state.participants_data = participants
             st.session_state.last_refresh = datetime.now()
             
-            return df
+            return participants
             
     except Exception as e:
         st.error(f"❌ Error loading participants: {str(e)}")
         return None
 
 def parse_vote_csv(uploaded_file, vote_config):
-    """Parse uploaded CSV file for vote data"""
+    """Parse uploaded CSV file for vote data (streamed in chunks, one vote per user)"""
     try:
-        df = pd.read_csv(uploaded_file)
-        
-        # Check if it's a public or private vote format
-        if 'Vote Text' in df.columns:
-            # Private vote format: User ID, Choice, Vote Text
-            required_cols = ['User ID', 'Choice']
-        else:
-            # Public vote format: User ID, Choice
-            required_cols = ['User ID', 'Choice']
+        option_texts = [opt['text'] for opt in vote_config['options']]
+        vote_df, report = read_vote_csv(uploaded_file, option_texts, st.session_state.duplicate_votes)
         
-        # Validate required columns
-        for col in required_cols:
-            if col not in df.columns:
-                raise ValueError(f"Missing required column: {col}")
+        if report.invalid or report.duplicates:
+            problems = []
+            if report.invalid:
+                problems.append(f"{report.invalid} invalid row(s) excluded")
+            if report.duplicates:
+                resolution = "earlier votes replaced" if st.session_state.duplicate_votes == DUPLICATES_LAST else "all their votes rejected"
+                problems.append(f"{report.duplicates} repeated vote(s) ({resolution})")
+            st.warning(f"⚠️ {vote_config['title']}: {', '.join(problems)}.")
+            with st.expander(f"🔎 Rows with problems ({vote_config['title']})", expanded=False):
+                st.dataframe(report.frame, width='stretch', hide_index=True)
+                if len(report.issues) < report.invalid + report.duplicates:
+                    st.caption(f"Showing the first {len(report.issues)} of {report.invalid + report.duplicates}")
         
-        # Validate User ID column
-        if not pd.api.types.is_numeric_dtype(df['User ID']):
-            df['User ID'] = pd.to_numeric(df['User ID'], errors='coerce')
-        
-        # Remove rows with invalid User IDs
-        df = df.dropna(subset=['User ID'])
-        df['User ID'] = df['User ID'].astype(int)
-        
-        # Validate Choice column matches vote options
-        valid_choices = [opt['text'] for opt in vote_config['options']]
-        invalid_choices = df[~df['Choice'].isin(valid_choices)]
-        
-        if len(invalid_choices) > 0:
-            st.warning(f"⚠️ Found {len(invalid_choices)} invalid choices. They will be excluded.")
-            df = df[df['Choice'].isin(valid_choices)]
-        
-        return df
+        return vote_df
         
     except Exception as e:
         st.error(f"❌ Error parsing CSV: {str(e)}")
         return None
 
-def get_assigned_district(wallet_address: str, seed: str = "default") -> str:
+def load_votes_from_chain(vote_keys):
     """
-    Get assigned district for a wallet address (deterministic)
-    Uses simple hash to assign districts A, B, C, or D with equal probability
-    Matches the TypeScript implementation in votesConfig.ts
+    Read votes straight from the contract (no CSV round trip)
     
-    Args:
-        wallet_address: The wallet address to assign a district to
-        seed: Optional seed for different assignments (e.g., "vote1a", "vote1b")
+    Closed elections come from their snapshot, so a round can be scored as
+    soon as closeElection confirms. Private votes are decrypted in-process by
+    the shared decryption jobs.
     
     Returns:
-        District letter: "A", "B", "C", or "D"
+        Number of elections loaded
     """
-    # Simple hash: sum of character codes with seed
-    hash_value = 0
-    normalized = wallet_address.lower()
-    input_str = normalized + seed  # Combine address and seed for different assignments
-    
-    for char in input_str:
-        hash_value = (hash_value * 31 + ord(char)) & 0xFFFFFFFF  # >>> 0 equivalent in Python
-    
-    # Map to districts A, B, C, D (0-3)
-    district_index = hash_value % 4
-    districts = ['A', 'B', 'C', 'D']
-    
-    return districts[district_index]
+    contract = st.session_state.contract
+    loaded = 0
+    for vote_key in vote_keys:
+        vote_config = VOTE_CONFIGS[vote_key]
+        progress_bar = None
+        
+        def update_progress(done, total):
+            nonlocal progress_bar
+            if progress_bar is None:
+                progress_bar = st.progress(0.0)
+            progress_bar.progress(done / total if total > 0 else 0.0, text=f"🔓 Decrypting {vote_config['title']}: {done}/{total}")
+        
+        try:
+            with st.spinner(f"Reading {vote_config['title']} from chain..."):
+                vote_df, info = read_chain_votes(
+                    contract,
+                    vote_config,
+                    VOTES_CONFIG.signature_options(vote_config['electionId']),
+                    st.session_state.decryption_key,
+                    progress=update_progress
+                )
+        except Exception as e:
+            st.error(f"❌ {vote_config['title']}: could not load from chain ({str(e)})")
+            continue
+        finally:
+            if progress_bar is not None:
+                progress_bar.empty()
+        
+        st.session_state.vote_data[vote_key] = vote_df
+        st.session_state.chain_votes[vote_key] = dict(info, loadedAt=datetime.now())
+        loaded += 1
+        if info['failed']:
+            st.warning(f"⚠️ {vote_config['title']}: {info['failed']} vote(s) could not be decrypted")
+    return loaded
 
-def get_assigned_committee(wallet_address: str) -> str:
+def load_export_archive(uploaded_file):
     """
-    Get assigned committee for a wallet address (deterministic)
-    Uses simple hash to assign one of three committees with equal probability
-    Matches the TypeScript implementation in votesConfig.ts
-    
-    Args:
-        wallet_address: The wallet address to assign a committee to
+    Load every election from a bulk export archive (backup dashboard)
     
     Returns:
-        Committee name: "Marketing", "Operations", or "Community"
+        Tuple of (manifest, {vote_key: vote_df}) or (None, {}) on error
     """
-    # Simple hash: sum of character codes
-    hash_value = 0
-    normalized = wallet_address.lower()
-    input_str = normalized + "committee"  # Add seed for committee assignment
-    
-    for char in input_str:
-        hash_value = (hash_value * 31 + ord(char)) & 0xFFFFFFFF  # >>> 0 equivalent in Python
-    
-    # Map to committees (0-2) - equal probability
-    committee_index = hash_value % 3
-    committees = ['Marketing', 'Operations', 'Community']
+    try:
+        manifest, files = read_export_archive(uploaded_file)
+    except Exception as e:
+        st.error(f"❌ Error reading archive: {str(e)}")
+        return None, {}
+    
+    loaded = {}
+    for vote_key, csv_file in files.items():
+        vote_config = VOTE_CONFIGS.get(vote_key)
+        if vote_config is None:
+            st.warning(f"⚠️ Skipping unknown vote '{vote_key}' in archive")
+            continue
+        
+        vote_df = parse_vote_csv(csv_file, vote_config)
+        if vote_df is not None and len(vote_df) > 0:
+            loaded[vote_key] = vote_df
     
-    return committees[committee_index]
+    return manifest, loaded
 
-def calculate_vote_results(vote_df, vote_config, participants_df):
-    """Calculate vote results and match with participants"""
+def calculate_vote_results(vote_df, vote_config, participants):
+    """Calculate vote results for a compact vote table"""
     if vote_df is None or len(vote_df) == 0:
         return None
     
-    # Merge with participants to get wallet addresses
-    results_df = vote_df.merge(
-        participants_df,
-        on='User ID',
-        how='left'
-    )
+    results_df = vote_df
     
-    # Count votes per option
-    vote_counts = results_df['Choice'].value_counts().to_dict()
+    # Count votes per option (options nobody chose are left out)
+    vote_counts = results_df['Choice'].value_counts()
+    vote_counts = vote_counts[vote_counts > 0].to_dict()
     
     # Find winner(s)
     if len(vote_counts) > 0:
@@ -443,317 +333,171 @@ def calculate_vote_results(vote_df, vote_config, participants_df):
         'total_votes': len(results_df)
     }
 
-def calculate_vote1a_points(results_df, participants_df):
-    """
-    Calculate points for Vote 1a based on the payoff structure:
-    - Each vote for a district gives 6 points to every voter who lives in that district
-    - If a district gets ≥60%:
-      - School opens in that district
-      - ALL voters who voted for that district get a 50-point bonus
-      - Other districts get doubled rewards (12 points per vote instead of 6)
+def calculate_vote_points(results_df, participants, vote_key):
     """
-    if results_df is None or len(results_df) == 0:
-        return None
-    
-    # Extract district from choice (e.g., "District A" -> "A")
-    def extract_district(choice):
-        if 'District' in choice:
-            parts = choice.split()
-            if len(parts) >= 2:
-                return parts[1]  # Returns "A", "B", "C", or "D"
-        return None
-    
-    # Add district voted column
-    results_df = results_df.copy()
-    results_df['District Voted'] = results_df['Choice'].apply(extract_district)
-    
-    # Add assigned district for each participant (using vote1a seed)
-    results_df['Assigned District'] = results_df['Wallet Address'].apply(
-        lambda addr: get_assigned_district(addr, "vote1a") if pd.notna(addr) else None
-    )
-    
-    # Calculate total votes and percentages per district
-    total_votes = len(results_df)
-    district_vote_counts = results_df['District Voted'].value_counts().to_dict()
+    Calculate points for a scored vote from its payoff rule in votes.json
+    (see workshop/payoffs.py for the rule format)
     
-    # Find district(s) with ≥60% (school district)
-    school_districts = []
-    for district, count in district_vote_counts.items():
-        percentage = (count / total_votes * 100) if total_votes > 0 else 0
-        if percentage >= 60:
-            school_districts.append(district)
-    
-    # Initialize points for all participants
-    # We need to calculate points for ALL participants, not just voters
-    points_df = participants_df.copy()
-    points_df['Assigned District'] = points_df['Wallet Address'].apply(
-        lambda addr: get_assigned_district(addr, "vote1a") if pd.notna(addr) else None
-    )
-    points_df['Base Points'] = 0
-    points_df['Bonus Points'] = 0
-    points_df['Total Points'] = 0
-    
-    # Calculate points per district
-    for voted_district in ['A', 'B', 'C', 'D']:
-        votes_for_district = district_vote_counts.get(voted_district, 0)
-        if votes_for_district == 0:
-            continue
-        
-        is_school_district = voted_district in school_districts
-        has_school = len(school_districts) > 0
-        
-        # Determine points per vote
-        if is_school_district:
-            # School district: 6 points per vote
-            points_per_vote = 6
-        elif has_school:
-            # Non-school district with school: 12 points per vote (doubled)
-            points_per_vote = 12
-        else:
-            # No school district: 6 points per vote
-            points_per_vote = 6
-        
-        # Give points to all residents of the voted district
-        district_residents = points_df[points_df['Assigned District'] == voted_district]
-        for idx in district_residents.index:
-            points_df.loc[idx, 'Base Points'] += points_per_vote * votes_for_district
-    
-    # Calculate bonuses for school district backers
-    # ALL voters who voted for a school district (≥60%) get the 50-point bonus
-    if school_districts:
-        for school_district in school_districts:
-            # Get all votes for this school district
-            school_votes = results_df[results_df['District Voted'] == school_district]
-            
-            # ALL voters who voted for the school district get the bonus
-            for _, vote_row in school_votes.iterrows():
-                user_id = vote_row['User ID']
-                # Find participant and add bonus
-                participant_idx = points_df.index[points_df['User ID'] == user_id].tolist()
-                if participant_idx:
-                    points_df.loc[participant_idx[0], 'Bonus Points'] = 50
-    
-    # Calculate total points
-    points_df['Total Points'] = points_df['Base Points'] + points_df['Bonus Points']
-    
-    # Create summary
-    summary = {
-        'school_districts': school_districts,
-        'district_vote_counts': district_vote_counts,
-        'total_votes': total_votes,
-        'points_df': points_df
-    }
+    Args:
+        results_df: DataFrame with vote results
+        participants: ParticipantTable with all participants
+        vote_key: The vote key (e.g. 'vote1a'); districts are assigned with it as seed
     
-    return summary
-
-def calculate_vote1b_points(results_df, participants_df):
-    """
-    Calculate points for Vote 1b based on the payoff structure (same as Vote 1a):
-    - Each vote for a district gives 6 points to every voter who lives in that district
-    - If a district gets ≥60%:
-      - School opens in that district
-      - ALL voters who voted for that district get a 50-point bonus
-      - Other districts get doubled rewards (12 points per vote instead of 6)
-    Uses vote1b seed for district assignment (assignedDistrict1b).
+    Returns:
+        Summary dict, or None if the vote is not scored or has no votes
     """
-    if results_df is None or len(results_df) == 0:
-        return None
-    
-    # Extract district from choice (e.g., "District A" -> "A")
-    def extract_district(choice):
-        if 'District' in choice:
-            parts = choice.split()
-            if len(parts) >= 2:
-                return parts[1]  # Returns "A", "B", "C", or "D"
+    rule = VOTES_CONFIG.payoff_rule(vote_key)
+    if rule is None or results_df is None or len(results_df) == 0:
         return None
     
-    # Add district voted column
-    results_df = results_df.copy()
-    results_df['District Voted'] = results_df['Choice'].apply(extract_district)
-    
-    # Add assigned district for each participant (using vote1b seed)
-    results_df['Assigned District'] = results_df['Wallet Address'].apply(
-        lambda addr: get_assigned_district(addr, "vote1b") if pd.notna(addr) else None
-    )
-    
-    # Calculate total votes and percentages per district
+    # Option voted as a code into the rule's options (e.g. "District A" -> 0, from the vote config)
+    voted = choice_lookup(results_df['Choice'], VOTES_CONFIG.option_codes(vote_key), rule.option_codes)
     total_votes = len(results_df)
-    district_vote_counts = results_df['District Voted'].value_counts().to_dict()
-    
-    # Find district(s) with ≥60% (school district)
-    school_districts = []
-    for district, count in district_vote_counts.items():
-        percentage = (count / total_votes * 100) if total_votes > 0 else 0
-        if percentage >= 60:
-            school_districts.append(district)
+    counts = np.bincount(voted[voted != NO_CODE], minlength=len(rule.option_codes))
     
-    # Initialize points for all participants
-    # We need to calculate points for ALL participants, not just voters
-    points_df = participants_df.copy()
-    points_df['Assigned District'] = points_df['Wallet Address'].apply(
-        lambda addr: get_assigned_district(addr, "vote1b") if pd.notna(addr) else None
-    )
-    points_df['Base Points'] = 0
-    points_df['Bonus Points'] = 0
-    points_df['Total Points'] = 0
-    
-    # Calculate points per district
-    for voted_district in ['A', 'B', 'C', 'D']:
-        votes_for_district = district_vote_counts.get(voted_district, 0)
-        if votes_for_district == 0:
-            continue
-        
-        is_school_district = voted_district in school_districts
-        has_school = len(school_districts) > 0
-        
-        # Determine points per vote
-        if is_school_district:
-            # School district: 6 points per vote
-            points_per_vote = 6
-        elif has_school:
-            # Non-school district with school: 12 points per vote (doubled)
-            points_per_vote = 12
-        else:
-            # No school district: 6 points per vote
-            points_per_vote = 6
-        
-        # Give points to all residents of the voted district
-        district_residents = points_df[points_df['Assigned District'] == voted_district]
-        for idx in district_residents.index:
-            points_df.loc[idx, 'Base Points'] += points_per_vote * votes_for_district
+    # Each participant's own vote; a later row for the same user wins
+    positions = participants.positions(results_df['User ID'].to_numpy())
+    known = positions != NO_CODE
+    participant_votes = np.full(len(participants), NO_CODE, dtype=np.int8)
+    participant_votes[positions[known]] = voted[known]
     
-    # Calculate bonuses for school district backers
-    # ALL voters who voted for a school district (≥60%) get the 50-point bonus
-    if school_districts:
-        for school_district in school_districts:
-            # Get all votes for this school district
-            school_votes = results_df[results_df['District Voted'] == school_district]
-            
-            # ALL voters who voted for the school district get the bonus
-            for _, vote_row in school_votes.iterrows():
-                user_id = vote_row['User ID']
-                # Find participant and add bonus
-                participant_idx = points_df.index[points_df['User ID'] == user_id].tolist()
-                if participant_idx:
-                    points_df.loc[participant_idx[0], 'Bonus Points'] = 50
+    # Every participant is scored, including those who did not vote (residents)
+    groups = rule.group_codes(participants, vote_key)
+    result = rule.evaluate(counts, total_votes, groups, participant_votes)
     
-    # Calculate total points
-    points_df['Total Points'] = points_df['Base Points'] + points_df['Bonus Points']
+    points_df = participants.frame
+    points_df[group_column(rule)] = pd.Categorical.from_codes(groups, rule.group_labels)
+    points_df['Base Points'] = result['base']
+    points_df['Bonus Points'] = result['bonus']
+    points_df['Total Points'] = result['points']
     
     # Create summary
     summary = {
-        'school_districts': school_districts,
-        'district_vote_counts': district_vote_counts,
+        'rule': rule,
+        'vote_counts': counts,
+        'hits': result['hits'],
         'total_votes': total_votes,
         'points_df': points_df
     }
     
     return summary
 
-def calculate_vote2_points(results_df, participants_df, vote_key):
+def group_column(rule):
+    """Points table column with each participant's district / committee"""
+    return f"Assigned {rule.groups.title()}"
+
+def points_columns(rule):
+    """Points table columns to show and download (the bonus split only where a rule has thresholds)"""
+    breakdown = ['Base Points', 'Bonus Points'] if rule.has_thresholds else []
+    return ['User ID', group_column(rule)] + breakdown + ['Total Points']
+
+def get_whatif_model(vote_key, vote_df, participants):
     """
-    Calculate points for Votes 2a-2d based on the payoff structure:
-    - A – Citywide Campaign: 18 points to Marketing, 3 to others
-    - B – Process Upgrade: 18 points to Operations, 3 to others
-    - C – Community Program: 18 points to Community, 3 to others
-    - D – Shared Hub: 12 points to all voters
-    - D with ≥50% in vote2d: 20 points (12+8 bonus) to D voters only
+    What-if model of a vote, rebuilt only when its vote data changes
     
-    Args:
-        results_df: DataFrame with vote results
-        participants_df: DataFrame with all participants
-        vote_key: The vote key ('vote2a', 'vote2b', 'vote2c', or 'vote2d')
+    Returns:
+        Tuple of (model, baseline evaluation of the actual votes)
     """
-    if results_df is None or len(results_df) == 0:
-        return None
-    
-    # Extract initiative from choice (e.g., "A – Citywide Campaign (Marketing)" -> "A")
-    def extract_initiative(choice):
-        if choice.startswith('A'):
-            return 'A'
-        elif choice.startswith('B'):
-            return 'B'
-        elif choice.startswith('C'):
-            return 'C'
-        elif choice.startswith('D'):
-            return 'D'
-        return None
-    
-    # Add initiative voted column
-    results_df = results_df.copy()
-    results_df['Initiative Voted'] = results_df['Choice'].apply(extract_initiative)
-    
-    # Add assigned committee for each participant (same for all rounds 2a-2d)
-    results_df['Assigned Committee'] = results_df['Wallet Address'].apply(
-        lambda addr: get_assigned_committee(addr) if pd.notna(addr) else None
-    )
-    
-    # Calculate total votes and percentages per initiative
-    total_votes = len(results_df)
-    initiative_vote_counts = results_df['Initiative Voted'].value_counts().to_dict()
-    
-    # Check if D reached 50% threshold (only for vote2d)
-    is_vote2d = vote_key == 'vote2d'
-    d_threshold_met = False
-    if is_vote2d:
-        d_votes = initiative_vote_counts.get('D', 0)
-        d_percentage = (d_votes / total_votes * 100) if total_votes > 0 else 0
-        d_threshold_met = d_percentage >= 50
-    
-    # Initialize points for all participants
-    points_df = participants_df.copy()
-    points_df['Assigned Committee'] = points_df['Wallet Address'].apply(
-        lambda addr: get_assigned_committee(addr) if pd.notna(addr) else None
-    )
-    points_df['Points'] = 0
-    
-    # Calculate points for each vote
-    for _, vote_row in results_df.iterrows():
-        user_id = vote_row['User ID']
-        initiative = vote_row['Initiative Voted']
-        committee = vote_row['Assigned Committee']
-        
-        if initiative is None or committee is None:
-            continue
-        
-        # Find participant
-        participant_idx = points_df.index[points_df['User ID'] == user_id].tolist()
-        if not participant_idx:
-            continue
-        
-        participant_idx = participant_idx[0]
-        participant_committee = points_df.loc[participant_idx, 'Assigned Committee']
-        
-        # Calculate points based on initiative and committee
-        if initiative == 'A':
-            # A: 18 to Marketing, 3 to others
-            points = 18 if participant_committee == 'Marketing' else 3
-        elif initiative == 'B':
-            # B: 18 to Operations, 3 to others
-            points = 18 if participant_committee == 'Operations' else 3
-        elif initiative == 'C':
-            # C: 18 to Community, 3 to others
-            points = 18 if participant_committee == 'Community' else 3
-        elif initiative == 'D':
-            # D: 12 to all, or 20 (12+8) if threshold met in vote2d
-            if is_vote2d and d_threshold_met:
-                points = 20  # 12 base + 8 bonus
-            else:
-                points = 12
+    cached = st.session_state.whatif_models.get(vote_key)
+    if cached is not None and cached[0] is vote_df:
+        return cached[1], cached[2]
+    
+    rule = VOTES_CONFIG.payoff_rule(vote_key)
+    positions = participants.positions(vote_df['User ID'].to_numpy())
+    choices = choice_lookup(vote_df['Choice'], VOTES_CONFIG.option_codes(vote_key), rule.option_codes)
+    model = WhatIfModel.from_votes(rule, rule.group_codes(participants, vote_key), positions, choices)
+    
+    baseline = model.evaluate()
+    st.session_state.whatif_models[vote_key] = (vote_df, model, baseline)
+    return model, baseline
+
+@st.fragment
+def render_whatif_panel(vote_key):
+    """
+    What-if scoring for the debrief - only this panel reruns when one of its
+    controls changes, and the leaderboard is re-scored incrementally
+    """
+    vote_df = st.session_state.vote_data.get(vote_key)
+    participants = st.session_state.participants_data
+    if vote_df is None or participants is None or len(participants) == 0:
+        return
+    
+    # Expanders run their contents even when collapsed, so use a toggle
+    if not st.toggle("🔮 What-if scoring", key=f"whatif_{vote_key}", help="Try hypothetical votes and thresholds"):
+        return
+    
+    model, baseline = get_whatif_model(vote_key, vote_df, participants)
+    rule = model.rule
+    labels = rule.option_codes
+    option_name = OPTION_NAMES[rule.groups]
+    
+    # Hypothetical extra voters per option
+    st.caption(f"Extra voters per {option_name.lower()}")
+    extra_cols = st.columns(len(labels))
+    extra = []
+    for code, (col, label) in enumerate(zip(extra_cols, labels)):
+        with col:
+            extra.append(st.number_input(f"{option_name} {label}", min_value=0, max_value=len(participants), value=0, step=1, key=f"whatif_extra_{vote_key}_{code}"))
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        user_ids = participants.user_ids.tolist()
+        moved_user = st.selectbox("Change the vote of", [None] + user_ids, format_func=lambda uid: "—" if uid is None else f"User #{uid}", key=f"whatif_user_{vote_key}")
+    with col2:
+        # Starts at the user's current vote, so picking a user changes nothing
+        # (keyed by user, so the default follows a newly picked user)
+        moved_position = None if moved_user is None else int(participants.positions([moved_user])[0])
+        current = NO_CODE if moved_position is None else int(model.voted[moved_position])
+        options = list(range(len(labels))) + [NO_CODE]
+        no_vote_label = "No vote" if current == NO_CODE else "Withdraw vote"
+        moved_to = st.selectbox("to", options, index=options.index(current), format_func=lambda code: no_vote_label if code == NO_CODE else f"{option_name} {labels[code]}", key=f"whatif_option_{vote_key}_{moved_user}", disabled=moved_user is None)
+    with col3:
+        if rule.has_thresholds:
+            threshold = st.slider("Threshold (%)", min_value=5, max_value=100, value=int(model.threshold), step=5, key=f"whatif_threshold_{vote_key}")
         else:
-            points = 0
-        
-        points_df.loc[participant_idx, 'Points'] = points
-    
-    # Create summary
-    summary = {
-        'initiative_vote_counts': initiative_vote_counts,
-        'total_votes': total_votes,
-        'd_threshold_met': d_threshold_met,
-        'points_df': points_df
-    }
-    
-    return summary
+            threshold = model.threshold
+            st.caption("No threshold rule in this vote")
+    
+    started = time.perf_counter()
+    scenario = model.copy()
+    scenario.threshold = threshold
+    for code, votes in enumerate(extra):
+        scenario.set_extra(code, votes)
+    if moved_position is not None:
+        scenario.set_vote(moved_position, moved_to)
+    result = scenario.evaluate()
+    delta = result['points'] - baseline['points']
+    
+    # Only the top of the leaderboard is turned into a table
+    top = min(10, len(participants))
+    candidates = np.argpartition(-result['points'], top - 1)[:top]
+    candidates = candidates[np.lexsort((participants.user_ids[candidates], -result['points'][candidates]))]
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    
+    for threshold_rule, hits in zip(rule.thresholds, result['hits']):
+        reached = [f"{option_name} {labels[i]}" for i in np.flatnonzero(hits)]
+        st.markdown(f"**{threshold_rule['name']}:** {', '.join(reached) if reached else 'not reached'}")
+    
+    total = result['counts'].sum()
+    counts_df = pd.DataFrame({
+        option_name: labels,
+        'Votes': result['counts'],
+        'Change': result['counts'] - baseline['counts'],
+        'Percentage': np.round(result['counts'] / total * 100, 1) if total > 0 else 0.0
+    })
+    leaderboard_df = participants.with_addresses(pd.DataFrame({
+        'User ID': participants.user_ids[candidates],
+        'Points': result['points'][candidates],
+        'Change': delta[candidates]
+    }), short=True)
+    
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        st.dataframe(counts_df, hide_index=True, width='stretch')
+        st.metric("Participants affected", int(np.count_nonzero(delta)), delta=f"{int(delta.sum()):+d} points in total")
+    with col2:
+        st.dataframe(leaderboard_df, hide_index=True, width='stretch')
+    st.caption(f"Re-scored {len(participants)} participants in {elapsed_ms:.1f} ms")
 
 # Main UI
 st.title("⭐ Voting Workshop Points Dashboard")
@@ -823,16 +567,16 @@ else:
     
     # Load participants if not already loaded or if refresh was requested
     if st.session_state.participants_data is None:
-        participants_df = load_participants()
+        participants = load_participants()
     else:
-        participants_df = st.session_state.participants_data
+        participants = st.session_state.participants_data
     
-    if participants_df is not None and len(participants_df) > 0:
+    if participants is not None and len(participants) > 0:
         # Display summary metrics
         col1, col2 = st.columns(2)
         
         with col1:
-            st.metric("Total Participants", len(participants_df))
+            st.metric("Total Participants", len(participants))
         
         with col2:
             st.metric("Status", "✅ Loaded")
@@ -842,18 +586,15 @@ else:
         # Display participants table
         st.subheader("📋 Participant List")
         
-        # Format wallet addresses for better readability
-        display_df = participants_df.copy()
-        display_df['Wallet Address'] = display_df['Wallet Address'].apply(
-            lambda x: f"{x[:6]}...{x[-4:]}" if len(x) > 10 else x
-        )
+        # Addresses are formatted from the compact table only for display
+        participants_df = participants.with_addresses(participants.frame)
         
         # Display table with full addresses on hover
         st.dataframe(
             participants_df,
             width='stretch',
             hide_index=True,
-            height=min(600, 50 + len(participants_df) * 40),
+            height=min(600, 50 + len(participants) * 40),
             column_config={
                 "User ID": st.column_config.NumberColumn(
                     "User ID",
@@ -878,23 +619,68 @@ else:
             width='stretch'
         )
         
-    elif participants_df is not None and len(participants_df) == 0:
+    elif participants is not None and len(participants) == 0:
         st.info("📭 No participants registered yet.")
     else:
         st.warning("⚠️ Failed to load participants. Please try refreshing.")
     
     # Vote sections
-    if participants_df is not None and len(participants_df) > 0:
+    if participants is not None and len(participants) > 0:
         st.divider()
         st.header("🗳️ Vote Data Upload")
-        st.caption("Upload CSV files exported from the backup dashboard for each vote")
+        st.caption("Load each vote straight from the chain, or upload CSV files exported from the backup dashboard")
+        st.radio(
+            "Users with more than one vote",
+            [DUPLICATES_LAST, DUPLICATES_REJECT],
+            format_func=lambda policy: "Count their last vote" if policy == DUPLICATES_LAST else "Reject all their votes",
+            key="duplicate_votes",
+            horizontal=True,
+            help="Applied when a CSV is loaded"
+        )
         
-        # Filter out vote0 (Training Ground) and vote3 (Merit vs Luck)
-        scored_votes = {
-            vote_key: vote_config 
-            for vote_key, vote_config in VOTE_CONFIGS.items() 
-            if vote_key not in ['vote0', 'vote3']
-        }
+        # Only votes with a payoff rule in votes.json are scored
+        scored_votes = {vote_key: VOTE_CONFIGS[vote_key] for vote_key in VOTES_CONFIG.scored_vote_keys}
+        
+        # Direct chain source - no export/upload round trip between rounds
+        with st.expander("⛓️ Load from Chain", expanded=False):
+            st.text_input(
+                "Decryption Key (Base64)",
+                key="decryption_key",
+                type="password",
+                help="Base64 encoded private key used to decrypt private votes"
+            )
+            if st.button("⛓️ Load All Scored Votes from Chain", key="chain_all", type="primary", width='stretch'):
+                loaded = load_votes_from_chain(list(scored_votes))
+                if loaded:
+                    st.success(f"✅ Loaded {loaded} election(s) from chain")
+        
+        # Bulk upload of all elections at once
+        with st.expander("📦 Upload Bulk Export (ZIP)", expanded=False):
+            archive_file = st.file_uploader(
+                "Upload the ZIP archive from the backup dashboard's bulk export",
+                type=['zip'],
+                key="upload_archive",
+                help="Loads every election contained in the archive in one go."
+            )
+            
+            if archive_file is not None:
+                archive_id = (archive_file.name, archive_file.size)
+                if st.session_state.get('loaded_archive_id') != archive_id:
+                    manifest, loaded_votes = load_export_archive(archive_file)
+                    if manifest is not None:
+                        st.session_state.vote_data.update(loaded_votes)
+                        for vote_key in loaded_votes:
+                            st.session_state.chain_votes.pop(vote_key, None)
+                        st.session_state.loaded_archive_id = archive_id
+                        st.session_state.loaded_archive_manifest = manifest
+                        st.success(f"✅ Loaded {len(loaded_votes)} election(s) from archive")
+                
+                if st.session_state.get('loaded_archive_manifest'):
+                    st.dataframe(
+                        summarize_manifest(st.session_state.loaded_archive_manifest),
+                        width='stretch',
+                        hide_index=True
+                    )
         
         # Create tabs for scored votes only
         vote_tabs = st.tabs([config['title'] for config in scored_votes.values()])
@@ -924,217 +710,161 @@ else:
                     help=f"Upload a CSV file exported from backup dashboard. Expected format: 'User ID,Choice' for public votes or 'User ID,Choice,Vote Text' for private votes."
                 )
                 
-                # Process uploaded file
+                if st.button("⛓️ Load from Chain", key=f"chain_{vote_key}", help="Read this vote straight from the contract instead of uploading a CSV"):
+                    load_votes_from_chain([vote_key])
+                
+                # Process uploaded file, or the votes last loaded from chain
+                vote_df = None
                 if uploaded_file is not None:
                     vote_df = parse_vote_csv(uploaded_file, vote_config)
-                    
                     if vote_df is not None and len(vote_df) > 0:
                         # Store in session state
                         st.session_state.vote_data[vote_key] = vote_df
-                        
+                        st.session_state.chain_votes.pop(vote_key, None)
                         st.success(f"✅ Successfully loaded {len(vote_df)} votes!")
+                elif vote_key in st.session_state.chain_votes:
+                    vote_df = st.session_state.vote_data[vote_key]
+                    chain_info = st.session_state.chain_votes[vote_key]
+                    source = "final snapshot" if chain_info['source'] == 'snapshot' else f"live, election {chain_info['status'].lower()}"
+                    st.success(f"⛓️ Loaded {len(vote_df)} votes from chain ({source}, {chain_info['loadedAt'].strftime('%H:%M:%S')})")
+                
+                if vote_df is not None and len(vote_df) > 0:
+                    
+                    # Calculate and display results
+                    results = calculate_vote_results(vote_df, vote_config, participants)
+                    
+                    if results:
+                        st.divider()
+                        st.markdown("### 📊 Vote Results")
+                        
+                        # Display summary metrics
+                        col1, col2, col3 = st.columns(3)
+                        with col1:
+                            st.metric("Total Votes", results['total_votes'])
+                        with col2:
+                            st.metric("Unique Voters", len(results['results_df']['User ID'].unique()))
+                        with col3:
+                            if len(results['winners']) == 1:
+                                st.metric("Winner", results['winners'][0])
+                            else:
+                                st.metric("Tie", f"{len(results['winners'])} options")
+                        
+                        # Display vote counts
+                        st.markdown("#### Vote Distribution")
+                        vote_counts_df = pd.DataFrame({
+                            'Option': list(results['vote_counts'].keys()),
+                            'Votes': list(results['vote_counts'].values())
+                        })
+                        vote_counts_df = vote_counts_df.sort_values('Votes', ascending=False)
+                        vote_counts_df['Percentage'] = (vote_counts_df['Votes'] / results['total_votes'] * 100).round(1)
                         
-                        # Calculate and display results
-                        results = calculate_vote_results(vote_df, vote_config, participants_df)
+                        st.dataframe(
+                            vote_counts_df,
+                            width='stretch',
+                            hide_index=True,
+                            column_config={
+                                "Option": st.column_config.TextColumn("Option", width="large"),
+                                "Votes": st.column_config.NumberColumn("Votes", width="small"),
+                                "Percentage": st.column_config.NumberColumn("Percentage (%)", width="small", format="%.1f")
+                            }
+                        )
                         
-                        if results:
+                        # Display individual votes
+                        st.markdown("#### Individual Votes")
+                        votes_display_df = participants.with_addresses(results['results_df'][['User ID', 'Choice']])
+                        st.dataframe(
+                            votes_display_df,
+                            width='stretch',
+                            hide_index=True,
+                            height=min(400, 50 + len(results['results_df']) * 35),
+                            column_config={
+                                "User ID": st.column_config.NumberColumn("User ID", width="small"),
+                                "Wallet Address": st.column_config.TextColumn("Wallet Address", width="medium"),
+                                "Choice": st.column_config.TextColumn("Choice", width="large")
+                            }
+                        )
+                        
+                        # Download processed results
+                        csv = votes_display_df.to_csv(index=False)
+                        st.download_button(
+                            label=f"📥 Download Processed Results (CSV)",
+                            data=csv,
+                            file_name=f"{vote_key}_processed_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                            mime="text/csv",
+                            key=f"download_{vote_key}",
+                            width='stretch'
+                        )
+                        
+                        # Points calculation for votes with a payoff rule
+                        points_summary = calculate_vote_points(results['results_df'], participants, vote_key)
+                        if points_summary:
                             st.divider()
-                            st.markdown("### 📊 Vote Results")
+                            st.markdown("### ⭐ Points Calculation")
+                            
+                            rule = points_summary['rule']
+                            option_name = OPTION_NAMES[rule.groups]
+                            hits = points_summary['hits']
                             
-                            # Display summary metrics
-                            col1, col2, col3 = st.columns(3)
-                            with col1:
-                                st.metric("Total Votes", results['total_votes'])
-                            with col2:
-                                st.metric("Unique Voters", len(results['results_df']['User ID'].unique()))
-                            with col3:
-                                if len(results['winners']) == 1:
-                                    st.metric("Winner", results['winners'][0])
+                            # Display threshold status (school, Shared Hub bonus, ...)
+                            for threshold, threshold_hits in zip(rule.thresholds, hits):
+                                reached = [f"{option_name} {rule.option_codes[i]}" for i in np.flatnonzero(threshold_hits)]
+                                if reached:
+                                    st.success(f"🎯 **{threshold['name']}:** {', '.join(reached)}")
+                                    st.caption(rule.describe(threshold))
                                 else:
-                                    st.metric("Tie", f"{len(results['winners'])} options")
+                                    st.info(f"ℹ️ No {option_name.lower()} reached the {threshold['share']}% threshold - {threshold['name']} not reached")
                             
-                            # Display vote counts
-                            st.markdown("#### Vote Distribution")
-                            vote_counts_df = pd.DataFrame({
-                                'Option': list(results['vote_counts'].keys()),
-                                'Votes': list(results['vote_counts'].values())
+                            # Display option vote summary
+                            st.markdown(f"#### {option_name} Vote Summary")
+                            option_texts = {code: text for text, code in VOTES_CONFIG.option_codes(vote_key).items()}
+                            total_votes = points_summary['total_votes']
+                            option_summary_df = pd.DataFrame({
+                                option_name: [option_texts[code] for code in rule.option_codes],
+                                'Votes': points_summary['vote_counts'],
+                                'Percentage': [f"{(votes / total_votes * 100) if total_votes > 0 else 0:.1f}%" for votes in points_summary['vote_counts']]
                             })
-                            vote_counts_df = vote_counts_df.sort_values('Votes', ascending=False)
-                            vote_counts_df['Percentage'] = (vote_counts_df['Votes'] / results['total_votes'] * 100).round(1)
+                            if rule.has_thresholds:
+                                option_summary_df['Status'] = [
+                                    ', '.join(threshold['name'] for threshold, hit in zip(rule.thresholds, hits[:, i]) if hit) or '—'
+                                    for i in range(len(rule.option_codes))
+                                ]
+                            st.dataframe(option_summary_df, hide_index=True, width='stretch')
                             
-                            st.dataframe(
-                                vote_counts_df,
-                                width='stretch',
-                                hide_index=True,
-                                column_config={
-                                    "Option": st.column_config.TextColumn("Option", width="large"),
-                                    "Votes": st.column_config.NumberColumn("Votes", width="small"),
-                                    "Percentage": st.column_config.NumberColumn("Percentage (%)", width="small", format="%.1f")
-                                }
-                            )
+                            # Display points leaderboard
+                            st.markdown("#### Points Leaderboard")
+                            columns = points_columns(rule)
+                            points_display_df = points_summary['points_df'].sort_values('Total Points', ascending=False)
+                            points_display_df = participants.with_addresses(points_display_df[columns], short=True)
                             
-                            # Display individual votes
-                            st.markdown("#### Individual Votes")
                             st.dataframe(
-                                results['results_df'][['User ID', 'Wallet Address', 'Choice']],
+                                points_display_df,
                                 width='stretch',
                                 hide_index=True,
-                                height=min(400, 50 + len(results['results_df']) * 35),
+                                height=min(600, 50 + len(points_display_df) * 40),
                                 column_config={
                                     "User ID": st.column_config.NumberColumn("User ID", width="small"),
                                     "Wallet Address": st.column_config.TextColumn("Wallet Address", width="medium"),
-                                    "Choice": st.column_config.TextColumn("Choice", width="large")
+                                    group_column(rule): st.column_config.TextColumn(rule.groups.title(), width="small"),
+                                    "Base Points": st.column_config.NumberColumn("Base Points", width="small"),
+                                    "Bonus Points": st.column_config.NumberColumn("Bonus Points", width="small"),
+                                    "Total Points": st.column_config.NumberColumn("Total Points", width="small", format="%d")
                                 }
                             )
                             
-                            # Download processed results
-                            csv = results['results_df'][['User ID', 'Wallet Address', 'Choice']].to_csv(index=False)
+                            # Download points data
+                            points_csv = participants.with_addresses(points_summary['points_df'][columns]).to_csv(index=False)
                             st.download_button(
-                                label=f"📥 Download Processed Results (CSV)",
-                                data=csv,
-                                file_name=f"{vote_key}_processed_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                                label="📥 Download Points Data (CSV)",
+                                data=points_csv,
+                                file_name=f"{vote_key}_points_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
                                 mime="text/csv",
-                                key=f"download_{vote_key}",
+                                key=f"download_points_{vote_key}",
                                 width='stretch'
                             )
                             
-                            # Points calculation for Vote 1a, 1b, and 2a-2d
-                            if vote_key in ['vote1a', 'vote1b', 'vote2a', 'vote2b', 'vote2c', 'vote2d']:
-                                st.divider()
-                                st.markdown("### ⭐ Points Calculation")
-                                
-                                # Use appropriate calculation function based on vote
-                                if vote_key == 'vote1a':
-                                    points_summary = calculate_vote1a_points(results['results_df'], participants_df)
-                                elif vote_key == 'vote1b':
-                                    points_summary = calculate_vote1b_points(results['results_df'], participants_df)
-                                elif vote_key in ['vote2a', 'vote2b', 'vote2c', 'vote2d']:
-                                    points_summary = calculate_vote2_points(results['results_df'], participants_df, vote_key)
-                                else:
-                                    points_summary = None
-                                
-                                if points_summary:
-                                    # Handle votes 1a/1b (district-based)
-                                    if vote_key in ['vote1a', 'vote1b']:
-                                        # Display school district status
-                                        if points_summary['school_districts']:
-                                            st.success(f"🏫 **School District(s):** {', '.join([f'District {d}' for d in points_summary['school_districts']])}")
-                                            st.caption("A programming school will be opened in the district(s) with ≥60% of votes")
-                                        else:
-                                            st.info("ℹ️ No district reached 60% threshold - no school will be opened")
-                                        
-                                        # Display district vote summary
-                                        st.markdown("#### District Vote Summary")
-                                        district_summary_data = []
-                                        for district in ['A', 'B', 'C', 'D']:
-                                            votes = points_summary['district_vote_counts'].get(district, 0)
-                                            percentage = (votes / points_summary['total_votes'] * 100) if points_summary['total_votes'] > 0 else 0
-                                            is_school = district in points_summary['school_districts']
-                                            district_summary_data.append({
-                                                'District': district,
-                                                'Votes': votes,
-                                                'Percentage': f"{percentage:.1f}%",
-                                                'Status': '🏫 School District' if is_school else 'Regular District'
-                                            })
-                                        
-                                        district_summary_df = pd.DataFrame(district_summary_data)
-                                        st.dataframe(district_summary_df, hide_index=True, width='stretch')
-                                        
-                                        # Display points leaderboard
-                                        st.markdown("#### Points Leaderboard")
-                                        points_display_df = points_summary['points_df'][['User ID', 'Wallet Address', 'Assigned District', 'Base Points', 'Bonus Points', 'Total Points']].copy()
-                                        points_display_df = points_display_df.sort_values('Total Points', ascending=False)
-                                        
-                                        # Format wallet addresses for display
-                                        points_display_df['Wallet Address'] = points_display_df['Wallet Address'].apply(
-                                            lambda x: f"{x[:6]}...{x[-4:]}" if pd.notna(x) and len(str(x)) > 10 else x
-                                        )
-                                        
-                                        st.dataframe(
-                                            points_display_df,
-                                            width='stretch',
-                                            hide_index=True,
-                                            height=min(600, 50 + len(points_display_df) * 40),
-                                            column_config={
-                                                "User ID": st.column_config.NumberColumn("User ID", width="small"),
-                                                "Wallet Address": st.column_config.TextColumn("Wallet Address", width="medium"),
-                                                "Assigned District": st.column_config.TextColumn("District", width="small"),
-                                                "Base Points": st.column_config.NumberColumn("Base Points", width="small"),
-                                                "Bonus Points": st.column_config.NumberColumn("Bonus Points", width="small"),
-                                                "Total Points": st.column_config.NumberColumn("Total Points", width="small", format="%d")
-                                            }
-                                        )
-                                        
-                                        # Download points data
-                                        points_csv = points_summary['points_df'][['User ID', 'Wallet Address', 'Assigned District', 'Base Points', 'Bonus Points', 'Total Points']].to_csv(index=False)
-                                    
-                                    # Handle votes 2a-2d (committee-based)
-                                    elif vote_key in ['vote2a', 'vote2b', 'vote2c', 'vote2d']:
-                                        # Display D threshold status for vote2d
-                                        if vote_key == 'vote2d':
-                                            if points_summary['d_threshold_met']:
-                                                st.success(f"🎁 **Shared Hub Bonus Activated!** D received ≥50% of votes")
-                                                st.caption("All D voters receive 20 points (12 base + 8 bonus)")
-                                            else:
-                                                st.info("ℹ️ D did not reach 50% threshold - no bonus activated")
-                                        
-                                        # Display initiative vote summary
-                                        st.markdown("#### Initiative Vote Summary")
-                                        initiative_summary_data = []
-                                        initiative_labels = {
-                                            'A': 'A – Citywide Campaign (Marketing)',
-                                            'B': 'B – Process Upgrade (Operations)',
-                                            'C': 'C – Community Program (Community)',
-                                            'D': 'D – Shared Hub'
-                                        }
-                                        for initiative in ['A', 'B', 'C', 'D']:
-                                            votes = points_summary['initiative_vote_counts'].get(initiative, 0)
-                                            percentage = (votes / points_summary['total_votes'] * 100) if points_summary['total_votes'] > 0 else 0
-                                            initiative_summary_data.append({
-                                                'Initiative': initiative_labels[initiative],
-                                                'Votes': votes,
-                                                'Percentage': f"{percentage:.1f}%"
-                                            })
-                                        
-                                        initiative_summary_df = pd.DataFrame(initiative_summary_data)
-                                        st.dataframe(initiative_summary_df, hide_index=True, width='stretch')
-                                        
-                                        # Display points leaderboard
-                                        st.markdown("#### Points Leaderboard")
-                                        points_display_df = points_summary['points_df'][['User ID', 'Wallet Address', 'Assigned Committee', 'Points']].copy()
-                                        points_display_df = points_display_df.sort_values('Points', ascending=False)
-                                        
-                                        # Format wallet addresses for display
-                                        points_display_df['Wallet Address'] = points_display_df['Wallet Address'].apply(
-                                            lambda x: f"{x[:6]}...{x[-4:]}" if pd.notna(x) and len(str(x)) > 10 else x
-                                        )
-                                        
-                                        st.dataframe(
-                                            points_display_df,
-                                            width='stretch',
-                                            hide_index=True,
-                                            height=min(600, 50 + len(points_display_df) * 40),
-                                            column_config={
-                                                "User ID": st.column_config.NumberColumn("User ID", width="small"),
-                                                "Wallet Address": st.column_config.TextColumn("Wallet Address", width="medium"),
-                                                "Assigned Committee": st.column_config.TextColumn("Committee", width="medium"),
-                                                "Points": st.column_config.NumberColumn("Points", width="small", format="%d")
-                                            }
-                                        )
-                                        
-                                        # Download points data
-                                        points_csv = points_summary['points_df'][['User ID', 'Wallet Address', 'Assigned Committee', 'Points']].to_csv(index=False)
-                                    
-                                    # Download button (common for both vote types)
-                                    st.download_button(
-                                        label="📥 Download Points Data (CSV)",
-                                        data=points_csv,
-                                        file_name=f"{vote_key}_points_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                                        mime="text/csv",
-                                        key=f"download_points_{vote_key}",
-                                        width='stretch'
-                                    )
-                
+                            # Debrief what-ifs on the same votes
+                            render_whatif_panel(vote_key)
+            
                 # Show existing data if available
                 elif vote_key in st.session_state.vote_data:
                     existing_df = st.session_state.vote_data[vote_key]
@@ -1145,7 +875,7 @@ else:
                         st.rerun()
                     
                     # Display existing data
-                    results = calculate_vote_results(existing_df, vote_config, participants_df)
+                    results = calculate_vote_results(existing_df, vote_config, participants)
                     if results:
                         st.markdown("### 📊 Current Results")
                         col1, col2 = st.columns(2)
@@ -1166,53 +896,31 @@ else:
                         vote_counts_df['Percentage'] = (vote_counts_df['Votes'] / results['total_votes'] * 100).round(1)
                         st.dataframe(vote_counts_df, hide_index=True)
                         
-                        # Points calculation for Vote 1a, 1b, and 2a-2d (existing data)
-                        if vote_key in ['vote1a', 'vote1b', 'vote2a', 'vote2b', 'vote2c', 'vote2d']:
+                        # Points calculation for votes with a payoff rule (existing data)
+                        points_summary = calculate_vote_points(results['results_df'], participants, vote_key)
+                        if points_summary:
                             st.divider()
                             st.markdown("### ⭐ Points Calculation")
                             
-                            # Use appropriate calculation function based on vote
-                            if vote_key == 'vote1a':
-                                points_summary = calculate_vote1a_points(results['results_df'], participants_df)
-                            elif vote_key == 'vote1b':
-                                points_summary = calculate_vote1b_points(results['results_df'], participants_df)
-                            elif vote_key in ['vote2a', 'vote2b', 'vote2c', 'vote2d']:
-                                points_summary = calculate_vote2_points(results['results_df'], participants_df, vote_key)
-                            else:
-                                points_summary = None
+                            # Similar display as above for existing data
+                            st.markdown("#### Points Summary")
+                            columns = points_columns(points_summary['rule'])
+                            points_display_df = points_summary['points_df'].sort_values('Total Points', ascending=False)
+                            points_display_df = participants.with_addresses(points_display_df[columns], short=True)
+                            st.dataframe(points_display_df, hide_index=True, width='stretch')
+                            points_csv = participants.with_addresses(points_summary['points_df'][columns]).to_csv(index=False)
                             
-                            if points_summary:
-                                # Handle votes 1a/1b (district-based)
-                                if vote_key in ['vote1a', 'vote1b']:
-                                    # Similar display as above for existing data
-                                    st.markdown("#### Points Summary")
-                                    points_display_df = points_summary['points_df'][['User ID', 'Wallet Address', 'Assigned District', 'Base Points', 'Bonus Points', 'Total Points']].copy()
-                                    points_display_df = points_display_df.sort_values('Total Points', ascending=False)
-                                    points_display_df['Wallet Address'] = points_display_df['Wallet Address'].apply(
-                                        lambda x: f"{x[:6]}...{x[-4:]}" if pd.notna(x) and len(str(x)) > 10 else x
-                                    )
-                                    st.dataframe(points_display_df, hide_index=True, width='stretch')
-                                    points_csv = points_summary['points_df'][['User ID', 'Wallet Address', 'Assigned District', 'Base Points', 'Bonus Points', 'Total Points']].to_csv(index=False)
-                                
-                                # Handle votes 2a-2d (committee-based)
-                                elif vote_key in ['vote2a', 'vote2b', 'vote2c', 'vote2d']:
-                                    st.markdown("#### Points Summary")
-                                    points_display_df = points_summary['points_df'][['User ID', 'Wallet Address', 'Assigned Committee', 'Points']].copy()
-                                    points_display_df = points_display_df.sort_values('Points', ascending=False)
-                                    points_display_df['Wallet Address'] = points_display_df['Wallet Address'].apply(
-                                        lambda x: f"{x[:6]}...{x[-4:]}" if pd.notna(x) and len(str(x)) > 10 else x
-                                    )
-                                    st.dataframe(points_display_df, hide_index=True, width='stretch')
-                                    points_csv = points_summary['points_df'][['User ID', 'Wallet Address', 'Assigned Committee', 'Points']].to_csv(index=False)
-                                
-                                st.download_button(
-                                    label="📥 Download Points Data (CSV)",
-                                    data=points_csv,
-                                    file_name=f"{vote_key}_points_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                                    mime="text/csv",
-                                    key=f"download_points_existing_{vote_key}",
-                                    width='stretch'
-                                )
+                            st.download_button(
+                                label="📥 Download Points Data (CSV)",
+                                data=points_csv,
+                                file_name=f"{vote_key}_points_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                                mime="text/csv",
+                                key=f"download_points_existing_{vote_key}",
+                                width='stretch'
+                            )
+                            
+                            # Debrief what-ifs on the same votes
+                            render_whatif_panel(vote_key)
                 
                 else:
                     st.info("💡 Upload a CSV file to view vote results. Example files are in the `example_data` folder.")
@@ -1258,9 +966,9 @@ else:
                 st.dataframe(summary_df, hide_index=True, width='stretch')
         
         # Final Points Summary - Aggregate all points from all votes
-        if participants_df is not None and len(participants_df) > 0:
+        if participants is not None and len(participants) > 0:
             # Check if we have any scored votes
-            scored_vote_keys = ['vote1a', 'vote1b', 'vote2a', 'vote2b', 'vote2c', 'vote2d']
+            scored_vote_keys = VOTES_CONFIG.scored_vote_keys
             has_scored_votes = any(st.session_state.vote_data.get(key) is not None for key in scored_vote_keys)
             
             if has_scored_votes:
@@ -1269,7 +977,7 @@ else:
                 st.caption("Aggregated points from all votes")
                 
                 # Initialize final points dataframe
-                final_points_df = participants_df.copy()
+                final_points_df = participants.frame
                 for vote_key in scored_vote_keys:
                     final_points_df[f'{vote_key.upper()} Points'] = 0
                 final_points_df['Total Points'] = 0
@@ -1278,52 +986,32 @@ else:
                 for vote_key in scored_vote_keys:
                     vote_data = st.session_state.vote_data.get(vote_key)
                     if vote_data is not None:
-                        results = calculate_vote_results(vote_data, VOTE_CONFIGS[vote_key], participants_df)
+                        results = calculate_vote_results(vote_data, VOTE_CONFIGS[vote_key], participants)
                         if results:
-                            # Calculate points based on vote type
-                            if vote_key == 'vote1a':
-                                points_summary = calculate_vote1a_points(results['results_df'], participants_df)
-                                points_col = 'Total Points'
-                            elif vote_key == 'vote1b':
-                                points_summary = calculate_vote1b_points(results['results_df'], participants_df)
-                                points_col = 'Total Points'
-                            elif vote_key in ['vote2a', 'vote2b', 'vote2c', 'vote2d']:
-                                points_summary = calculate_vote2_points(results['results_df'], participants_df, vote_key)
-                                points_col = 'Points'
-                            else:
-                                points_summary = None
-                                points_col = None
-                            
+                            points_summary = calculate_vote_points(results['results_df'], participants, vote_key)
                             if points_summary:
-                                # Merge points
-                                for _, row in points_summary['points_df'].iterrows():
-                                    user_id = row['User ID']
-                                    points = row[points_col]
-                                    idx = final_points_df.index[final_points_df['User ID'] == user_id].tolist()
-                                    if idx:
-                                        final_points_df.loc[idx[0], f'{vote_key.upper()} Points'] = points
-                                        final_points_df.loc[idx[0], 'Total Points'] += points
+                                # Points tables share the participant table's row order
+                                points = points_summary['points_df']['Total Points'].to_numpy()
+                                final_points_df[f'{vote_key.upper()} Points'] = points
+                                final_points_df['Total Points'] += points
                 
                 # Sort by total points
                 final_points_df = final_points_df.sort_values('Total Points', ascending=False)
                 
-                # Format wallet addresses for display
-                display_final_df = final_points_df.copy()
-                display_final_df['Wallet Address'] = display_final_df['Wallet Address'].apply(
-                    lambda x: f"{x[:6]}...{x[-4:]}" if pd.notna(x) and len(str(x)) > 10 else x
-                )
-                
                 # Select columns to display (only votes that have data)
-                display_columns = ['User ID', 'Wallet Address']
+                display_columns = ['User ID']
                 for vote_key in scored_vote_keys:
                     if st.session_state.vote_data.get(vote_key) is not None:
                         display_columns.append(f'{vote_key.upper()} Points')
                 display_columns.append('Total Points')
                 
+                # Format wallet addresses for display
+                display_final_df = participants.with_addresses(final_points_df[display_columns], short=True)
+                
                 # Display final leaderboard
                 st.markdown("#### Final Points Leaderboard")
                 st.dataframe(
-                    display_final_df[display_columns],
+                    display_final_df,
                     width='stretch',
                     hide_index=True,
                     height=min(600, 50 + len(display_final_df) * 40),
@@ -1331,12 +1019,12 @@ else:
                         "User ID": st.column_config.NumberColumn("User ID", width="small"),
                         "Wallet Address": st.column_config.TextColumn("Wallet Address", width="medium"),
                         **{col: st.column_config.NumberColumn(col, width="small", format="%d") 
-                           for col in display_columns if col not in ['User ID', 'Wallet Address']}
+                           for col in display_columns if col != 'User ID'}
                     }
                 )
                 
                 # Download final points data
-                final_csv = final_points_df[display_columns].to_csv(index=False)
+                final_csv = participants.with_addresses(final_points_df[display_columns]).to_csv(index=False)
                 st.download_button(
                     label="📥 Download Final Points Summary (CSV)",
                     data=final_csv,
@@ -1352,39 +1040,23 @@ else:
                 
                 # Use a fixed seed for consistency
                 SEED = "voting_workshop_2024"
-                random.seed(SEED)
-                
-                # Get top 3 winners (handle ties with seeded randomness)
-                # Group by total points and sort
-                sorted_df = final_points_df.sort_values('Total Points', ascending=False)
                 
-                # Get unique point values in descending order
-                unique_points = sorted_df['Total Points'].unique()
+                # Get top 3 winners (ties are shuffled with the seed, see workshop/ranking.py)
+                top_3 = select_top_k(
+                    final_points_df['Total Points'].to_numpy(),
+                    final_points_df['User ID'].to_numpy(),
+                    k=3,
+                    seed=SEED
+                )
                 
                 top_3_winners = []
-                for points_value in unique_points:
-                    if len(top_3_winners) >= 3:
-                        break
-                    
-                    # Get all participants with this point value
-                    tied_participants = sorted_df[sorted_df['Total Points'] == points_value].copy()
-                    
-                    # If there's a tie, shuffle using seeded random
-                    if len(tied_participants) > 1:
-                        # Create a list of indices and shuffle with seed
-                        indices = list(tied_participants.index)
-                        random.shuffle(indices)
-                        tied_participants = tied_participants.reindex(indices)
-                    
-                    # Add participants until we have 3
-                    for _, row in tied_participants.iterrows():
-                        if len(top_3_winners) >= 3:
-                            break
-                        top_3_winners.append({
-                            'User ID': row['User ID'],
-                            'Wallet Address': row['Wallet Address'],
-                            'Total Points': row['Total Points']
-                        })
+                for position in top_3['positions']:
+                    row = final_points_df.iloc[position]
+                    top_3_winners.append({
+                        'User ID': row['User ID'],
+                        'Wallet Address': participants.address(row.name),
+                        'Total Points': row['Total Points']
+                    })
                 
                 # Display top 3 winners
                 st.markdown("#### 🥇 Top 3 Winners")
@@ -1395,7 +1067,7 @@ else:
                         winners_data.append({
                             'Rank': f"{medals[idx] if idx < 3 else ''} {idx + 1}",
                             'User ID': winner['User ID'],
-                            'Wallet Address': f"{winner['Wallet Address'][:6]}...{winner['Wallet Address'][-4:]}",
+                            'Wallet Address': short_address(winner['Wallet Address']),
                             'Total Points': winner['Total Points']
                         })
                     
@@ -1411,25 +1083,42 @@ else:
                             "Total Points": st.column_config.NumberColumn("Total Points", width="small", format="%d")
                         }
                     )
+                    
+                    # Tie-break trace, so the draw can be checked afterwards
+                    if top_3['tie_breaks']:
+                        with st.expander("🎲 Tie-break details"):
+                            st.caption(f"Tied groups were ordered by User ID and shuffled with seed \"{SEED}\"")
+                            st.dataframe(
+                                pd.DataFrame([
+                                    {
+                                        'Points': tie['score'],
+                                        'Ranks': ', '.join(str(rank) for rank in tie['ranks']),
+                                        'Tied User IDs': ', '.join(str(user_id) for user_id in tie['tied_ids']),
+                                        'Drawn Order': ', '.join(str(user_id) for user_id in tie['drawn_order']),
+                                        'Awarded': ', '.join(str(user_id) for user_id in tie['awarded_ids'])
+                                    }
+                                    for tie in top_3['tie_breaks']
+                                ]),
+                                width='stretch',
+                                hide_index=True
+                            )
                 else:
                     st.info("No winners to display")
                 
                 # Random participant selection (using seeded randomness)
                 st.markdown("#### 🎲 Random Participant (Bonus Reward)")
-                random.seed(SEED + "_random_participant")  # Different seed for random participant
                 
-                # Select a random participant from all participants
-                all_participants = final_points_df.copy()
-                if len(all_participants) > 0:
-                    random_idx = random.randint(0, len(all_participants) - 1)
-                    random_participant = all_participants.iloc[random_idx]
+                # Select a random participant from all participants (different seed)
+                random_idx = select_random(final_points_df['User ID'].to_numpy(), SEED + "_random_participant")
+                if random_idx is not None:
+                    random_participant = final_points_df.iloc[random_idx]
                     
                     st.success(f"**Selected Participant:**")
                     col1, col2, col3 = st.columns(3)
                     with col1:
                         st.metric("User ID", random_participant['User ID'])
                     with col2:
-                        st.metric("Wallet Address", f"{random_participant['Wallet Address'][:6]}...{random_participant['Wallet Address'][-4:]}")
+                        st.metric("Wallet Address", short_address(participants.address(random_participant.name)))
                     with col3:
                         st.metric("Total Points", random_participant['Total Points'])
                     
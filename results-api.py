@@ -0,0 +1,67 @@
+"""
+Voting Workshop Results API
+Serves the current election results as read-only JSON for the voting booth,
+the projector screen and attendee browsers, from the same results service,
+snapshots and decryption checkpoints the dashboards use (see
+workshop/results_api.py). Browsers can poll it freely: one background
+refresher does all the RPC reads.
+
+Usage:
+    RPC_URL=https://... python results-api.py --port 8600
+
+    curl http://localhost:8600/results
+    curl -H 'If-None-Match: "<etag>"' 'http://localhost:8600/results/2?wait=25'
+
+Private election tallies are only published once the election is closed and
+DECRYPTION_KEY is set.
+"""
+
+import argparse
+import os
+
+import uvicorn
+
+from workshop.chain import connect, load_contract
+from workshop.chain_follower import get_chain_follower
+from workshop.config import load_votes_config
+from workshop.results_api import create_app
+from workshop.results_service import REFRESH_INTERVAL_SECONDS, ResultsService
+
+DEFAULT_RPC_URL = "https://public.sepolia.rpc.status.network"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Read-only election results API")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--rpc-url", default=os.environ.get("RPC_URL", DEFAULT_RPC_URL))
+    parser.add_argument("--refresh-interval", type=float, default=REFRESH_INTERVAL_SECONDS,
+                        help="Seconds between refresh passes")
+    parser.add_argument("--deployment-block", type=int, default=os.environ.get("CONTRACT_DEPLOYMENT_BLOCK"),
+                        help="Block the contract was deployed at; follow its vote events incrementally from there")
+    parser.add_argument("--cors-origins", default=os.environ.get("RESULTS_API_CORS_ORIGINS", "*"),
+                        help="Comma-separated origins allowed to read the API from a browser")
+    args = parser.parse_args()
+
+    votes_config = load_votes_config()
+    contract_address = os.environ.get("CONTRACT_ADDRESS", votes_config.contract_address)
+    contract = load_contract(connect(args.rpc_url), contract_address)
+    follower = get_chain_follower(contract, args.deployment_block) if args.deployment_block is not None else None
+
+    service = ResultsService(
+        contract,
+        votes_config,
+        os.environ.get("DECRYPTION_KEY") or None,
+        refresh_interval=args.refresh_interval,
+        # Never publish a running tally of a secret ballot
+        live_private_tallies=False,
+        follower=follower,
+    )
+    service.start()
+
+    app = create_app(service, votes_config, [origin.strip() for origin in args.cors_origins.split(",")])
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/bin/bash
+
+# Voting Workshop Results API Launcher
+# This script helps you set up and run the read-only results API
+
+echo "📡 Voting Workshop Results API"
+echo "==============================="
+echo ""
+
+# Check if Python is installed
+if ! command -v python3 &> /dev/null; then
+    echo "❌ Python 3 is not installed. Please install Python 3.8 or higher."
+    exit 1
+fi
+
+echo "✅ Python 3 found: $(python3 --version)"
+echo ""
+
+# Check if virtual environment exists
+if [ ! -d "venv-dashboard" ]; then
+    echo "📦 Creating virtual environment..."
+    python3 -m venv venv-dashboard
+    echo "✅ Virtual environment created"
+    echo ""
+fi
+
+# Activate virtual environment
+echo "🔌 Activating virtual environment..."
+source venv-dashboard/bin/activate
+
+# Install/update dependencies
+echo "📥 Installing dependencies..."
+pip install -q --upgrade pip
+pip install -q -r requirements-dashboard.txt
+echo "✅ Dependencies installed"
+echo ""
+
+# Check for RPC URL
+if [ -z "$RPC_URL" ]; then
+    echo "⚠️  RPC_URL environment variable not set - using the default Status Sepolia RPC"
+    echo ""
+else
+    echo "✅ RPC_URL configured"
+    echo ""
+fi
+
+if [ -z "$DECRYPTION_KEY" ]; then
+    echo "⚠️  DECRYPTION_KEY not set - private election results will not be published"
+    echo ""
+fi
+
+echo "🚀 Starting results API..."
+echo ""
+echo "   Results will be served at: http://localhost:8600/results"
+echo "   Press Ctrl+C to stop the API"
+echo ""
+
+python results-api.py "$@"
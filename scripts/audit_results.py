@@ -0,0 +1,65 @@
+"""
+Voting Workshop Consistency Audit
+Cross-checks every configured election's tally sources at one block: the
+contract's counters (getElectionResults), the vote arrays (getAllPublicVotes
+/ getVotersInElection), the vote event log and, with DECRYPTION_KEY set, the
+decrypted private votes. Prints one row per election and exits non-zero on
+any mismatch.
+
+Usage:
+    RPC_URL=https://... python scripts/audit_results.py --deployment-block 1234567
+    DECRYPTION_KEY=... python scripts/audit_results.py --json
+
+Without a deployment block the event log is not checked.
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from workshop.audit import AUDIT_WORKERS, audit_elections, audit_frame  # noqa: E402
+from workshop.chain import connect, load_contract  # noqa: E402
+from workshop.config import load_votes_config  # noqa: E402
+
+DEFAULT_RPC_URL = "https://public.sepolia.rpc.status.network"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rpc-url", default=os.environ.get("RPC_URL", DEFAULT_RPC_URL))
+    parser.add_argument("--deployment-block", type=int, default=os.environ.get("CONTRACT_DEPLOYMENT_BLOCK"),
+                        help="Block the contract was deployed at; vote events are read from there")
+    parser.add_argument("--workers", type=int, default=AUDIT_WORKERS, help="Concurrent RPC requests")
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON")
+    args = parser.parse_args()
+
+    votes_config = load_votes_config()
+    contract_address = os.environ.get("CONTRACT_ADDRESS", votes_config.contract_address)
+    contract = load_contract(connect(args.rpc_url), contract_address)
+
+    report = audit_elections(
+        contract,
+        votes_config,
+        decryption_key=os.environ.get("DECRYPTION_KEY") or None,
+        from_block=args.deployment_block,
+        workers=args.workers,
+    )
+
+    if args.json:
+        print(json.dumps(report, indent=2, default=str))
+    else:
+        print(f"Contract {contract_address} at block {report['block']} ({report['seconds']:.1f}s)")
+        if args.deployment_block is None:
+            print("Event log not checked (no --deployment-block)")
+        print(audit_frame(report).to_string(index=False))
+        print("All sources agree" if report['ok'] else "MISMATCHES FOUND")
+    sys.exit(0 if report['ok'] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Dashboard Startup Benchmark
+Measures, in fresh interpreters, how long the heavy dependencies take to
+import and how long each dashboard takes to draw its connect screen (first
+script run, no blockchain connection).
+
+Usage:
+    python scripts/bench_imports.py
+    python scripts/bench_imports.py --runs 5 --dashboards dashboard.py
+
+Compare the numbers before and after a change to catch startup regressions.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+DASHBOARDS = ["dashboard.py", "backup-dashboard.py", "points-dashboard.py"]
+
+# Dependencies the dashboards used to import at the top level
+MODULES = [
+    "streamlit",
+    "pandas",
+    "web3",
+    "eth_account",
+    "plotly.graph_objects",
+    "nacl.public",
+]
+
+IMPORT_SNIPPET = """
+import time
+started = time.perf_counter()
+import {module}
+print(time.perf_counter() - started)
+"""
+
+# Runs the dashboard script once, as `streamlit run` would for a new session
+FIRST_RUN_SNIPPET = """
+import time
+from streamlit.testing.v1 import AppTest
+started = time.perf_counter()
+app = AppTest.from_file({path!r}, default_timeout=120).run()
+elapsed = time.perf_counter() - started
+if app.exception:
+    raise SystemExit(f"Dashboard raised: {{app.exception[0].value}}")
+print(elapsed)
+"""
+
+
+def time_snippet(snippet: str) -> float:
+    """Run a snippet in a fresh interpreter and return the time it printed"""
+    result = subprocess.run(
+        [sys.executable, "-c", snippet],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def median_time(snippet: str, runs: int) -> float:
+    return statistics.median(time_snippet(snippet) for _ in range(runs))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dashboard import and first-render time")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters per measurement (median is reported)")
+    parser.add_argument("--dashboards", nargs="*", default=DASHBOARDS, help="Dashboard scripts to time")
+    parser.add_argument("--skip-modules", action="store_true", help="Only time the dashboards")
+    args = parser.parse_args()
+
+    if not args.skip_modules:
+        print("📦 Cold import time per module")
+        for module in MODULES:
+            try:
+                elapsed = median_time(IMPORT_SNIPPET.format(module=module), args.runs)
+            except subprocess.CalledProcessError:
+                print(f"  {module:<24} not installed")
+                continue
+            print(f"  {module:<24} {elapsed * 1000:8.0f} ms")
+        print("")
+
+    print("🖥️  Connect screen (first script run, includes streamlit import)")
+    for dashboard in args.dashboards:
+        path = str(REPO_ROOT / dashboard)
+        try:
+            elapsed = median_time(FIRST_RUN_SNIPPET.format(path=path), args.runs)
+        except subprocess.CalledProcessError as e:
+            print(f"  {dashboard:<24} failed: {e.stderr.strip().splitlines()[-1] if e.stderr else e}")
+            continue
+        print(f"  {dashboard:<24} {elapsed * 1000:8.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Offline Dashboard Benchmark
+Runs each dashboard against a recorded RPC cassette (see workshop/cassettes.py)
+instead of a live endpoint: connect screen, connecting, and the first fully
+connected render, each in a fresh interpreter, so timings do not depend on
+the network and can be compared run to run.
+
+Record a cassette during a real workshop (or a scripts/simulate_workshop.py
+run) by starting the dashboards with RPC_CASSETTE_RECORD set, then:
+
+    python scripts/bench_replay.py workshop.json.gz
+    python scripts/bench_replay.py workshop.json.gz --latency recorded --runs 5
+    python scripts/bench_replay.py workshop.json.gz --latency 80+-30 --profile --dashboards dashboard.py
+    python scripts/bench_replay.py workshop.json.gz --rate 100000
+
+Requests still pass the per-endpoint rate limiter (workshop/rpc_scheduler.py)
+as they would live; --rate lifts it to time the dashboards themselves.
+
+Use the same CONTRACT_ADDRESS as when recording: contract calls are matched
+by their exact parameters.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from workshop.cassettes import LATENCY_ENV, REPLAY_ENV  # noqa: E402
+from workshop.rpc_scheduler import RATE_ENV  # noqa: E402
+
+DASHBOARDS = ["dashboard.py", "backup-dashboard.py", "points-dashboard.py"]
+
+# Any key works: replayed requests are never signed or sent
+BENCH_PRIVATE_KEY = "0x" + "11" * 32
+
+# Connect screen, connect click and connected render of one dashboard session;
+# prints the profile of every thread started during the connected render
+# (optional) and then the timings as JSON on the last line
+SESSION_SNIPPET = """
+import cProfile, io, json, pstats, sys, threading, time
+from streamlit.testing.v1 import AppTest
+
+profilers = []
+
+def profile_thread(*_):
+    # Streamlit runs the script (and the dashboards their work) in other threads
+    sys.setprofile(None)
+    profilers.append(cProfile.Profile())
+    profilers[-1].enable()
+
+def timed(step):
+    started = time.perf_counter()
+    step()
+    if app.exception:
+        raise SystemExit(f"Dashboard raised: {{app.exception[0].value}}")
+    return time.perf_counter() - started
+
+app = AppTest.from_file({path!r}, default_timeout=600)
+timings = {{'connectScreen': timed(app.run)}}
+next(box for box in app.text_input if box.label == "Wallet Private Key").input({key!r})
+next(button for button in app.button if "Connect" in button.label).click()
+timings['connect'] = timed(app.run)
+if {profile!r}:
+    threading.setprofile(profile_thread)
+timings['connectedRender'] = timed(app.run)
+if profilers:
+    threading.setprofile(None)
+    out = io.StringIO()
+    pstats.Stats(*profilers, stream=out).sort_stats("tottime").print_stats({top})
+    print(out.getvalue())
+print(json.dumps(timings))
+"""
+
+
+def run_session(dashboard: str, env: dict, profile: bool, top: int) -> tuple:
+    """One dashboard session in a fresh interpreter -> (timings, profile output)"""
+    snippet = SESSION_SNIPPET.format(path=str(REPO_ROOT / dashboard), key=BENCH_PRIVATE_KEY, profile=profile, top=top)
+    result = subprocess.run(
+        [sys.executable, "-c", snippet],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    lines = result.stdout.strip().splitlines()
+    return json.loads(lines[-1]), "\n".join(lines[:-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("cassette", help="RPC cassette recorded with RPC_CASSETTE_RECORD")
+    parser.add_argument("--latency", default="none",
+                        help="Replay latency: none, recorded, recorded*0.5, 50 or 50+-20 (ms)")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters per dashboard (median is reported)")
+    parser.add_argument("--dashboards", nargs="*", default=DASHBOARDS, help="Dashboard scripts to run")
+    parser.add_argument("--rate", type=float, default=None,
+                        help="RPC requests per second (default: the live rate limit; raise it to time the dashboards alone)")
+    parser.add_argument("--profile", action="store_true", help="Print a cProfile of the connected render (first run)")
+    parser.add_argument("--top", type=int, default=25, help="Functions shown per profile")
+    args = parser.parse_args()
+
+    env = dict(os.environ, **{REPLAY_ENV: str(Path(args.cassette).resolve()), LATENCY_ENV: args.latency})
+    if args.rate is not None:
+        env[RATE_ENV] = str(args.rate)
+    # Every run starts from cold caches, like a fresh deployment
+    cache_root = REPO_ROOT / ".dashboard-cache" / "bench-replay"
+
+    print(f"📼 Replaying {args.cassette} (latency: {args.latency})")
+    for dashboard in args.dashboards:
+        runs = []
+        for run in range(args.runs):
+            shutil.rmtree(cache_root, ignore_errors=True)
+            env["DASHBOARD_CACHE_DIR"] = str(cache_root)
+            try:
+                timings, profile = run_session(dashboard, env, args.profile and run == 0, args.top)
+            except subprocess.CalledProcessError as e:
+                print(f"  {dashboard:<24} failed: {e.stderr.strip().splitlines()[-1] if e.stderr else e}")
+                break
+            if profile:
+                print(profile)
+            runs.append(timings)
+        if not runs:
+            continue
+        medians = {step: statistics.median(run[step] for run in runs) * 1000 for step in runs[0]}
+        print(f"  {dashboard:<24} connect screen {medians['connectScreen']:7.0f} ms   "
+              f"connect {medians['connect']:7.0f} ms   connected render {medians['connectedRender']:7.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,30 +7,19 @@ const nacl = require('tweetnacl');
 const util = require('tweetnacl-util');
 const { verifyMessage } = require('viem');
 
+const votesData = require('../src/config/votes.json');
+
 /**
- * Vote options for verification
- * Must match the options in votesConfig.ts
+ * Vote options for verification (from the shared votes config)
  */
-const VOTE_1B_OPTIONS = [
-  "I vote for District A",
-  "I vote for District B",
-  "I vote for District C",
-  "I vote for District D",
-];
-
-const VOTE_2C_OPTIONS = [
-  "I vote for A – Citywide Campaign (Marketing)",
-  "I vote for B – Process Upgrade (Operations)",
-  "I vote for C – Community Program (Community)",
-  "I vote for D – Shared Hub (Everyone)",
-];
+function getSignatureOptions(voteKey) {
+  const vote = votesData.votes.find((v) => v.voteKey === voteKey);
+  return vote.options.map((option) => `I vote for ${option.text}`);
+}
 
-const VOTE_2D_OPTIONS = [
-  "I vote for A – Citywide Campaign (Marketing)",
-  "I vote for B – Process Upgrade (Operations)",
-  "I vote for C – Community Program (Community)",
-  "I vote for D – Shared Hub (Everyone, bonus if ≥50%)",
-];
+const VOTE_1B_OPTIONS = getSignatureOptions('vote1b');
+const VOTE_2C_OPTIONS = getSignatureOptions('vote2c');
+const VOTE_2D_OPTIONS = getSignatureOptions('vote2d');
 
 /**
  * Parse transaction input data to extract encrypted signature
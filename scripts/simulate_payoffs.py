@@ -0,0 +1,83 @@
+"""
+Voting Workshop Payoff Simulator
+Monte Carlo view of a scored vote's payoff rule (the "payoff" object in
+src/config/votes.json): expected points and spread per voting strategy,
+inequality of the resulting points and how often its thresholds (school,
+Shared Hub bonus) are hit, for a given population mix. Use it to calibrate
+thresholds before changing them for a live workshop.
+
+Usage:
+    python scripts/simulate_payoffs.py --vote vote1a --mix home=0.6,focal=0.3,random=0.1
+    python scripts/simulate_payoffs.py --vote vote2d --threshold 40 45 50 55 --workers 4
+
+Strategies: home, focal, random (district votes); committee, shared, random
+(committee votes).
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from workshop.config import load_votes_config  # noqa: E402
+from workshop.simulation import STRATEGIES, simulate_payoffs  # noqa: E402
+
+
+def parse_mix(text: str) -> dict:
+    """'home=0.6,random=0.4' -> {'home': 0.6, 'random': 0.4}"""
+    mix = {}
+    for part in text.split(","):
+        name, _, share = part.partition("=")
+        mix[name.strip()] = float(share)
+    return mix
+
+
+def main():
+    votes_config = load_votes_config()
+    scored = votes_config.scored_vote_keys
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vote", choices=scored, default=scored[0], help="Scored vote whose payoff rule to simulate")
+    parser.add_argument("--profiles", type=int, default=1_000_000, help="Simulated workshops")
+    parser.add_argument("--participants", type=int, default=50)
+    parser.add_argument("--mix", type=parse_mix, default=None,
+                        help="Strategy shares, e.g. home=0.6,focal=0.3,random=0.1 (default: uniform)")
+    parser.add_argument("--turnout", type=float, default=1.0, help="Probability that a participant votes")
+    parser.add_argument("--threshold", type=float, nargs="+", default=[None],
+                        help="School / Shared Hub threshold(s) in percent (default: the live rule)")
+    parser.add_argument("--workers", type=int, default=1, help="Processes to spread the profiles over")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rule = votes_config.payoff_rule(args.vote)
+    print(f"Vote: {args.vote} (strategies: {', '.join(STRATEGIES[rule.groups])})")
+    print(f"{args.profiles:,} workshops of {args.participants} participants, turnout {args.turnout:.0%}")
+
+    for threshold in args.threshold:
+        start = time.perf_counter()
+        result = simulate_payoffs(
+            rule,
+            profiles=args.profiles,
+            participants=args.participants,
+            mix=args.mix,
+            turnout=args.turnout,
+            threshold=threshold,
+            seed=args.seed,
+            workers=args.workers,
+        )
+        elapsed = time.perf_counter() - start
+
+        print()
+        if result['threshold'] is None:
+            print(f"No thresholds  ({elapsed:.1f}s)")
+        else:
+            print(f"Threshold {result['threshold']:g}%  ({elapsed:.1f}s)")
+        print(result['strategies'].to_string(index=False, float_format=lambda value: f"{value:.3f}"))
+        print(f"Mean Gini: {result['gini']:.3f}   Threshold hit rate: {result['threshold_hit_rate']:.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""
+Voting Workshop Load Generator
+Deploys VotingWorkshop.sol to a local node and replays a synthetic workshop
+(registrations, public votes and encrypted private votes) so the dashboards
+can be benchmarked at realistic scale before a live event.
+
+Usage:
+    forge build
+    anvil &
+    python scripts/simulate_workshop.py --participants 500 --rate 50
+
+Then point a dashboard at the simulated deployment:
+    CONTRACT_ADDRESS=<printed address> streamlit run dashboard.py
+and connect with RPC URL http://127.0.0.1:8545 and the printed owner key.
+
+Use --eth-tester to run against an in-process eth-tester chain instead of
+anvil (requires `pip install "web3[tester]"`); useful for timing the
+generator itself, but the dashboards cannot connect to it.
+"""
+
+import argparse
+import base64
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+import nacl.public
+import nacl.utils
+from eth_account import Account
+from eth_account.messages import encode_defunct
+from web3 import Web3
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from workshop.config import load_votes_config, signature_message  # noqa: E402
+
+# Foundry build artifact (produced by `forge build`)
+DEFAULT_ARTIFACT = REPO_ROOT / "out" / "VotingWorkshop.sol" / "VotingWorkshop.json"
+
+DEFAULT_RPC_URL = "http://127.0.0.1:8545"
+
+# First pre-funded anvil development account (never use on a real network)
+ANVIL_OWNER_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+
+# Same key the dashboards use to decrypt private votes (Base64 encoded)
+DEFAULT_DECRYPTION_KEY = "UgsmFEqNQrYE32riH1Ph0mBV7g2IVQ1FIXPEbTyb0zY="
+
+# Ether sent to each synthetic voter to pay for gas
+VOTER_FUNDING_WEI = Web3.to_wei(0.1, "ether")
+
+# Vote configuration shared with the dashboards and frontend
+VOTE_CONFIGS = load_votes_config().votes
+
+
+def connect(rpc_url: str, use_eth_tester: bool) -> Web3:
+    """Connect to anvil over HTTP or start an in-process eth-tester chain"""
+    if use_eth_tester:
+        try:
+            from web3 import EthereumTesterProvider
+        except ImportError:
+            sys.exit('eth-tester is not installed. Run: pip install "web3[tester]"')
+        return Web3(EthereumTesterProvider())
+
+    w3 = Web3(Web3.HTTPProvider(rpc_url, request_kwargs={"timeout": 30}))
+    if not w3.is_connected():
+        sys.exit(f"Could not connect to {rpc_url}. Is anvil running?")
+    return w3
+
+
+def load_artifact(path: Path):
+    """Load ABI and bytecode from a Foundry build artifact"""
+    if not path.exists():
+        sys.exit(f"Artifact not found at {path}. Run `forge build` first.")
+    with open(path, "r", encoding="utf-8") as f:
+        artifact = json.load(f)
+    bytecode = artifact["bytecode"]
+    if isinstance(bytecode, dict):
+        bytecode = bytecode["object"]
+    return artifact["abi"], bytecode
+
+
+def encrypt_signature(signature_hex: str, public_key: nacl.public.PublicKey) -> bytes:
+    """
+    Encrypt a vote signature the same way the voting booth does
+    (ephemeral public key + nonce + NaCl box ciphertext, see src/utils/encryption.ts)
+    """
+    ephemeral_key = nacl.public.PrivateKey.generate()
+    nonce = nacl.utils.random(nacl.public.Box.NONCE_SIZE)
+    box = nacl.public.Box(ephemeral_key, public_key)
+    encrypted = box.encrypt(signature_hex.encode("utf-8"), nonce).ciphertext
+    return bytes(ephemeral_key.public_key) + nonce + encrypted
+
+
+class Sender:
+    """Signs and sends transactions for one account with a locally tracked nonce"""
+
+    def __init__(self, w3: Web3, account):
+        self.w3 = w3
+        self.account = account
+        self.nonce = w3.eth.get_transaction_count(account.address)
+        self.chain_id = w3.eth.chain_id
+        # Headroom over the current price so a rising base fee never stalls the run
+        self.gas_price = w3.eth.gas_price * 2
+
+    def send(self, tx: dict):
+        tx = dict(tx)
+        tx.setdefault("from", self.account.address)
+        tx.setdefault("gas", 500000)
+        tx.update({"nonce": self.nonce, "chainId": self.chain_id, "gasPrice": self.gas_price})
+        signed = self.account.sign_transaction(tx)
+        tx_hash = self.w3.eth.send_raw_transaction(signed.raw_transaction)
+        self.nonce += 1
+        return tx_hash
+
+    def transact(self, contract_function):
+        return self.send(contract_function.build_transaction({
+            "from": self.account.address,
+            "nonce": self.nonce,
+            "gas": 500000,
+            "gasPrice": self.gas_price,
+        }))
+
+
+def wait_for_all(w3: Web3, tx_hashes, label: str):
+    """Wait for receipts and fail loudly on reverted transactions"""
+    failed = 0
+    for tx_hash in tx_hashes:
+        receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+        if receipt["status"] != 1:
+            failed += 1
+    if failed:
+        print(f"  ⚠️  {failed}/{len(tx_hashes)} {label} transactions reverted")
+
+
+class Throttle:
+    """Keep at most `rate` operations per second (0 = unlimited)"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0
+        self.next_time = time.monotonic()
+
+    def wait(self):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        if now < self.next_time:
+            time.sleep(self.next_time - now)
+        self.next_time = max(now, self.next_time) + self.interval
+
+
+def fund_owner(w3: Web3, owner):
+    """Top up the owner from an unlocked node account if it has no balance"""
+    if w3.eth.get_balance(owner.address) > 0:
+        return
+    funder = w3.eth.accounts[0]
+    tx_hash = w3.eth.send_transaction({
+        "from": funder,
+        "to": owner.address,
+        "value": Web3.to_wei(100, "ether"),
+    })
+    w3.eth.wait_for_transaction_receipt(tx_hash)
+
+
+def deploy(w3: Web3, owner_sender: Sender, abi, bytecode):
+    """Deploy VotingWorkshop and return the contract object"""
+    factory = w3.eth.contract(abi=abi, bytecode=bytecode)
+    tx_hash = owner_sender.send(factory.constructor().build_transaction({
+        "from": owner_sender.account.address,
+        "nonce": owner_sender.nonce,
+        "gas": 5000000,
+        "gasPrice": owner_sender.gas_price,
+    }))
+    receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+    return w3.eth.contract(address=receipt["contractAddress"], abi=abi)
+
+
+def create_voters(w3: Web3, owner_sender: Sender, count: int, rng: random.Random):
+    """Create deterministic synthetic wallets and fund them from the owner"""
+    voters = [Account.from_key(rng.getrandbits(256).to_bytes(32, "big")) for _ in range(count)]
+    tx_hashes = [
+        owner_sender.send({"to": voter.address, "value": VOTER_FUNDING_WEI, "gas": 21000})
+        for voter in voters
+    ]
+    wait_for_all(w3, tx_hashes, "funding")
+    return [Sender(w3, voter) for voter in voters]
+
+
+def register_voters(w3: Web3, contract, voters, throttle: Throttle):
+    """Register every voter (user IDs follow the list order)"""
+    tx_hashes = []
+    for voter in voters:
+        throttle.wait()
+        tx_hashes.append(voter.transact(contract.functions.register()))
+        # Wait for each registration so user IDs are assigned in list order
+        w3.eth.wait_for_transaction_receipt(tx_hashes[-1])
+    wait_for_all(w3, tx_hashes, "registration")
+
+
+def run_election(w3: Web3, contract, owner_sender: Sender, voters, config, rng: random.Random,
+                 turnout: float, throttle: Throttle, public_key, leave_open: bool):
+    """Open one election, cast votes from a random subset of voters, then close it"""
+    is_public = config["type"] == "public"
+    tx_hash = owner_sender.transact(contract.functions.openElection(0, is_public))
+    w3.eth.wait_for_transaction_receipt(tx_hash)
+    election_id = contract.functions.getTotalElections().call()
+
+    participating = [voter for voter in voters if rng.random() < turnout]
+    tally = [0] * len(config["options"])
+    tx_hashes = []
+    started = time.monotonic()
+
+    for voter in participating:
+        throttle.wait()
+        option_index = rng.randrange(len(config["options"]))
+        tally[option_index] += 1
+
+        if is_public:
+            call = contract.functions.castPublicVote(election_id, option_index + 1)
+        else:
+            # Same message the voting booth asks users to sign
+            message = signature_message(config["options"][option_index]["text"])
+            signed = voter.account.sign_message(encode_defunct(text=message))
+            signature_hex = "0x" + signed.signature.hex().removeprefix("0x")
+            call = contract.functions.castPrivateVote(election_id, encrypt_signature(signature_hex, public_key))
+
+        tx_hashes.append(voter.transact(call))
+
+    wait_for_all(w3, tx_hashes, "vote")
+    elapsed = time.monotonic() - started
+
+    if not leave_open:
+        tx_hash = owner_sender.transact(contract.functions.closeElection(election_id))
+        w3.eth.wait_for_transaction_receipt(tx_hash)
+
+    rate = len(participating) / elapsed if elapsed > 0 else 0
+    print(f"  🗳️  Election {election_id} ({config['type']}): {len(participating)} votes "
+          f"in {elapsed:.1f}s ({rate:.0f}/s) - tally {tally}")
+    return {"electionId": election_id, "type": config["type"], "tally": tally}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate a voting workshop on a local chain")
+    parser.add_argument("--participants", type=int, default=500, help="Number of synthetic voters")
+    parser.add_argument("--rate", type=float, default=0, help="Transactions per second (0 = as fast as possible)")
+    parser.add_argument("--turnout", type=float, default=0.9, help="Fraction of voters casting each vote")
+    parser.add_argument("--elections", type=int, default=len(VOTE_CONFIGS), help="Number of configured elections to run")
+    parser.add_argument("--seed", type=int, default=2024, help="Seed for wallets and vote choices")
+    parser.add_argument("--rpc-url", default=DEFAULT_RPC_URL, help="Local node RPC URL (anvil)")
+    parser.add_argument("--eth-tester", action="store_true", help="Use an in-process eth-tester chain instead of anvil")
+    parser.add_argument("--owner-key", default=ANVIL_OWNER_KEY, help="Private key of the deploying owner")
+    parser.add_argument("--decryption-key", default=DEFAULT_DECRYPTION_KEY, help="Base64 private key the dashboards decrypt with")
+    parser.add_argument("--artifact", type=Path, default=DEFAULT_ARTIFACT, help="Foundry artifact for VotingWorkshop")
+    parser.add_argument("--leave-open", action="store_true", help="Leave elections open after voting")
+    parser.add_argument("--summary", type=Path, help="Write a JSON summary (address, tallies) to this file")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    throttle = Throttle(args.rate)
+    public_key = nacl.public.PrivateKey(base64.b64decode(args.decryption_key)).public_key
+
+    w3 = connect(args.rpc_url, args.eth_tester)
+    abi, bytecode = load_artifact(args.artifact)
+
+    owner = Account.from_key(args.owner_key)
+    fund_owner(w3, owner)
+    owner_sender = Sender(w3, owner)
+
+    print("🚀 Deploying VotingWorkshop...")
+    contract = deploy(w3, owner_sender, abi, bytecode)
+    print(f"  📄 Contract: {contract.address}")
+
+    print(f"👥 Creating and registering {args.participants} voters...")
+    started = time.monotonic()
+    voters = create_voters(w3, owner_sender, args.participants, rng)
+    register_voters(w3, contract, voters, throttle)
+    print(f"  ✅ Registered {contract.functions.getTotalRegistered().call()} voters "
+          f"in {time.monotonic() - started:.1f}s")
+
+    print("🗳️  Running elections...")
+    results = [
+        run_election(w3, contract, owner_sender, voters, config, rng, args.turnout,
+                     throttle, public_key, args.leave_open)
+        for config in VOTE_CONFIGS[:args.elections]
+    ]
+
+    summary = {
+        "contractAddress": contract.address,
+        "ownerAddress": owner.address,
+        "participants": args.participants,
+        "seed": args.seed,
+        "elections": results,
+    }
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+    print("")
+    print("✅ Simulation complete")
+    print(f"   CONTRACT_ADDRESS={contract.address}")
+    print(f"   RPC URL: {args.rpc_url if not args.eth_tester else '(in-process eth-tester)'}")
+    print(f"   Owner key: {args.owner_key}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,13 +5,49 @@
  * and voting flow settings for the workshop.
  */
 
-export const VOTING_CONTRACT_ADDRESS = "0xBA2741D011e34F154FF6E886e051c4278aC8B9AF";
+import votesData from "./votes.json";
+
+/**
+ * Vote definitions live in votes.json, which is shared with the Python
+ * dashboards (workshop/config.py) so both sides always agree.
+ */
+export const VOTING_CONTRACT_ADDRESS = votesData.contractAddress;
 
 export type VoteType = "public" | "private";
 
 export interface VoteOption {
   id: number;
   text: string;
+  // Short code used when scoring (district / initiative letter)
+  code?: string;
+  // Short label for dashboard charts
+  label?: string;
+}
+
+export interface PayoffThreshold {
+  // Shown on the points dashboard (e.g. "School")
+  name: string;
+  // Share of the votes (percent) an option needs
+  share: number;
+  // Option codes that can reach it (default: all)
+  options?: string[];
+  // Paid to everyone who voted for an option that reached it
+  voterBonus?: number;
+  // Multiplies the resident points of every other option once reached
+  otherOptionsMultiplier?: number;
+  // Shown when reached; {share} and {voterBonus} are filled in
+  description?: string;
+}
+
+// Points rule of a scored vote, evaluated by the points dashboard (workshop/payoffs.py)
+export interface PayoffRule {
+  // Participants are paid by their district or committee
+  groups: "district" | "committee";
+  // Each vote for an option pays this to every resident of its district
+  residentPoints?: number;
+  // Option code -> { group or "*": points } paid to each voter for their own vote
+  voterPoints?: Record<string, Record<string, number>>;
+  thresholds?: PayoffThreshold[];
 }
 
 export interface VoteConfig {
@@ -23,6 +59,8 @@ export interface VoteConfig {
   type: VoteType;
   // Display title
   title: string;
+  // Compact title for the management dashboard
+  shortTitle: string;
   // Question/description
   question: string;
   // Additional context or instructions
@@ -35,149 +73,21 @@ export interface VoteConfig {
   requiresDistrictAssignment?: boolean;
   // Coordination threshold (e.g., 0.6 for 60%)
   coordinationThreshold?: number;
+  // Points rule for scored votes
+  payoff?: PayoffRule;
 }
 
+const VOTES = votesData.votes as VoteConfig[];
+
 /**
  * All votes for the workshop
  * Maps app vote keys to contract election IDs and defines voting flow
  */
-export const VOTES_CONFIG: Record<string, VoteConfig> = {
-  // Vote 0: Training Ground (using public voting for now)
-  vote0: {
-    voteKey: "vote0",
-    electionId: 1, // First election in contract
-    type: "public", // Using public for initial implementation
-    title: "Training Ground",
-    question: "How are you today?",
-    context: "This is a practice vote to help everyone get familiar with the voting interface. It has no impact on points or outcomes — just a warm-up.",
-    isPractice: true,
-    options: [
-      { id: 1, text: "Feeling Messi-level productive today" },
-      { id: 2, text: "Surviving on empanadas and wine" },
-      { id: 3, text: "Could use a siesta." },
-      { id: 4, text: "Like the Buenos Aires weather - a bit unpredictable" },
-    ],
-  },
-
-  // Vote 1a: Public Coordination
-  vote1a: {
-    voteKey: "vote1a",
-    electionId: 2,
-    type: "public",
-    title: "Vote 1a: Coordination",
-    question: "What is your preferred district?",
-    context: "You are a member of a worker cooperative in Río Plata Sur, a fictional mid-sized city in Argentina, that builds software for local businesses. The co-op has just received a grant to expand programming education across the city. Via programming bootcamps, it hopes to upskill participants to later recruit them. As voting members, you must decide how to allocate these funds across 4 districts.\n\nEach of you lives in one of these districts. You'll benefit if the funds are allocated to your district as you'll be running the bootcamps and rewarded for that.",
-    requiresDistrictAssignment: true,
-    coordinationThreshold: 0.6,
-    options: [
-      { id: 1, text: "District A" },
-      { id: 2, text: "District B" },
-      { id: 3, text: "District C" },
-      { id: 4, text: "District D" },
-    ],
-  },
-
-  // Vote 1b: Private Coordination
-  vote1b: {
-    voteKey: "vote1b",
-    electionId: 3,
-    type: "private",
-    title: "Vote 1b: Private Coordination",
-    question: "Which district should receive the programming education grant?",
-    context: "The co-op has received another grant for programming education. However, you have recently moved to a different district. This time, votes are private—no one can see your choice until the organizer reveals results after voting closes.",
-    requiresDistrictAssignment: true,
-    coordinationThreshold: 0.6,
-    options: [
-      { id: 1, text: "District A" },
-      { id: 2, text: "District B" },
-      { id: 3, text: "District C" },
-      { id: 4, text: "District D" },
-    ],
-  },
-
-  // Vote 2a: Reciprocity Round 1 (Public)
-  vote2a: {
-    voteKey: "vote2a",
-    electionId: 4,
-    type: "public",
-    title: "Vote 2a: Strategic Initiative - Round 1 (Public)",
-    question: "Which strategic initiative should the co-op prioritize for the next quarter?",
-    context: "The co-op must decide which strategic initiative to prioritize. Members are organized into three committees: Marketing, Operations, and Community. Each committee has different priorities.",
-    requiresDistrictAssignment: false,
-    options: [
-      { id: 1, text: "A – Citywide Campaign (Marketing)" },
-      { id: 2, text: "B – Process Upgrade (Operations)" },
-      { id: 3, text: "C – Community Program (Community)" },
-      { id: 4, text: "D – Shared Hub (Everyone)" },
-    ],
-  },
-
-  // Vote 2b: Reciprocity Round 2 (Public)
-  vote2b: {
-    voteKey: "vote2b",
-    electionId: 5,
-    type: "public",
-    title: "Vote 2b: Strategic Initiative - Round 2 (Public)",
-    question: "Which strategic initiative should the co-op prioritize for the next quarter?",
-    context: "Same decision as before, votes remain public.",
-    requiresDistrictAssignment: false,
-    options: [
-      { id: 1, text: "A – Citywide Campaign (Marketing)" },
-      { id: 2, text: "B – Process Upgrade (Operations)" },
-      { id: 3, text: "C – Community Program (Community)" },
-      { id: 4, text: "D – Shared Hub (Everyone)" },
-    ],
-  },
-
-  // Vote 2c: Reciprocity Round 3 (Private)
-  vote2c: {
-    voteKey: "vote2c",
-    electionId: 6,
-    type: "private",
-    title: "Vote 2c: Strategic Initiative - Round 3 (Private)",
-    question: "Which strategic initiative should the co-op prioritize for the next quarter?",
-    context: "Same decision as before, but now votes are secret. No one can see your choice until the organizer reveals results.",
-    requiresDistrictAssignment: false,
-    options: [
-      { id: 1, text: "A – Citywide Campaign (Marketing)" },
-      { id: 2, text: "B – Process Upgrade (Operations)" },
-      { id: 3, text: "C – Community Program (Community)" },
-      { id: 4, text: "D – Shared Hub (Everyone)" },
-    ],
-  },
-
-  // Vote 2d: Reciprocity Round 4 (Private with Bonus)
-  vote2d: {
-    voteKey: "vote2d",
-    electionId: 7,
-    type: "private",
-    title: "Vote 2d: Strategic Initiative - Round 4 (Final, Private)",
-    question: "Which strategic initiative should the co-op prioritize for the next quarter?",
-    context: "Votes remain private - no one can see your choice.",
-    requiresDistrictAssignment: false,
-    coordinationThreshold: 0.5,
-    options: [
-      { id: 1, text: "A – Citywide Campaign (Marketing)" },
-      { id: 2, text: "B – Process Upgrade (Operations)" },
-      { id: 3, text: "C – Community Program (Community)" },
-      { id: 4, text: "D – Shared Hub (Everyone, bonus if ≥50%)" },
-    ],
-  },
-
-  // Vote 3: Merit vs Luck
-  vote3: {
-    voteKey: "vote3",
-    electionId: 8,
-    type: "public",
-    title: "Vote 3: Merit vs Luck",
-    question: "How should Book #2 be awarded?",
-    context: "We're almost done with this workshop. Three prizes will be awarded based on the final points leaderboard. The 3rd place prize is a copy of \"Farewell to Westphalia\" by Jarrad Hope and Peter Ludlow.\n\nThe organizer will announce who is currently in 3rd place before the vote. You can decide how this book should be awarded.\n\nThis vote is fully public – everyone can see who supports each option. Open discussion is encouraged.",
-    options: [
-      { id: 1, text: "Award to current 3rd place participant" },
-      { id: 2, text: "Random draw among all participants" },
-    ],
-  },
-};
+export const VOTES_CONFIG: Record<string, VoteConfig> = Object.fromEntries(
+  VOTES.map((vote) => [vote.voteKey, vote])
+);
+
+const VOTES_BY_ELECTION_ID = new Map(VOTES.map((vote) => [vote.electionId, vote]));
 
 /**
  * Get vote configuration by key
@@ -190,14 +100,29 @@ export function getVoteConfig(voteKey: string): VoteConfig | undefined {
  * Get all vote keys in order
  */
 export function getAllVoteKeys(): string[] {
-  return Object.keys(VOTES_CONFIG);
+  return VOTES.map((vote) => vote.voteKey);
 }
 
 /**
  * Get vote config by election ID
  */
 export function getVoteByElectionId(electionId: number): VoteConfig | undefined {
-  return Object.values(VOTES_CONFIG).find(vote => vote.electionId === electionId);
+  return VOTES_BY_ELECTION_ID.get(electionId);
+}
+
+/**
+ * Message a voter signs for a private vote option
+ */
+export function getSignatureMessage(optionText: string): string {
+  return `I vote for ${optionText}`;
+}
+
+/**
+ * Signature messages for every option of a vote, in choice order
+ */
+export function getSignatureOptions(voteKey: string): string[] {
+  const vote = VOTES_CONFIG[voteKey];
+  return vote ? vote.options.map((option) => getSignatureMessage(option.text)) : [];
 }
 
 /**
@@ -7,7 +7,7 @@ import { useState } from 'react';
 import { usePrivy, useSendTransaction } from '@privy-io/react-auth';
 import { encodeFunctionData } from 'viem';
 import { encryptSignature, verifySignature } from '@/utils/encryption';
-import { VoteConfig, VOTING_CONTRACT_ADDRESS } from '@/config/votesConfig';
+import { VoteConfig, VOTING_CONTRACT_ADDRESS, getSignatureMessage } from '@/config/votesConfig';
 
 // ABI for castPrivateVote function
 const CAST_PRIVATE_VOTE_ABI = [
@@ -28,7 +28,7 @@ const CAST_PRIVATE_VOTE_ABI = [
  * This message will be signed by the user's wallet
  */
 export function generateVoteMessage(optionText: string): string {
-  return `I vote for ${optionText}`;
+  return getSignatureMessage(optionText);
 }
 
 export interface UsePrivateVotingProps {
@@ -5,21 +5,17 @@
  * Note: Uses both ESM (for Next.js) and CommonJS (for CLI scripts)
  */
 
+import { getSignatureOptions } from "../config/votesConfig";
+
 // Dynamic imports for Node.js compatibility
 let nacl: any;
 let util: any;
 let verifyMessage: any;
 
 /**
- * Vote options for verification
- * Must match the options in votesConfig.ts
+ * Vote options for verification (from the shared votes config)
  */
-export const VOTE_1B_OPTIONS = [
-  "I vote for District A",
-  "I vote for District B",
-  "I vote for District C",
-  "I vote for District D",
-];
+export const VOTE_1B_OPTIONS = getSignatureOptions("vote1b");
 
 // Initialize immediately for CommonJS
 // eslint-disable-next-line @typescript-eslint/no-require-imports
@@ -0,0 +1,6 @@
+"""
+Voting Workshop shared helpers
+Code shared by the Streamlit dashboards (dashboard.py, backup-dashboard.py,
+points-dashboard.py). The dashboards are standalone scripts with hyphenated
+names, so anything more than one of them needs lives here.
+"""
@@ -0,0 +1,168 @@
+"""
+Voter address directory
+Registration is append-only (user IDs are sequential and never reassigned), so
+the ID -> address mapping is loaded once in batches, persisted to disk, and
+afterwards only IDs above the highest known one are fetched.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from workshop.rpc_scheduler import bind_priority
+from workshop.storage import contract_cache_dir, read_json, write_json_atomic
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+# Number of idToAddress calls sent per JSON-RPC batch
+BATCH_SIZE = 100
+
+# Concurrent calls used when the endpoint does not support batching
+FALLBACK_WORKERS = 8
+
+
+class AddressDirectory:
+    """Append-only user ID -> wallet address map for one contract"""
+
+    def __init__(self, contract):
+        self.contract = contract
+        self.path = contract_cache_dir(contract.address, "addresses") / "directory.json"
+        self._lock = threading.Lock()
+        self._addresses = {}
+        # Registration count when the cache was last checked against the chain
+        self._checked_total = None
+
+        stored = read_json(self.path, default={})
+        for user_id, address in stored.get("addresses", {}).items():
+            self._addresses[int(user_id)] = address
+
+    @property
+    def highest_id(self) -> int:
+        """Highest user ID currently known"""
+        return max(self._addresses) if self._addresses else 0
+
+    def __len__(self):
+        return len(self._addresses)
+
+    def refresh(self, progress=None) -> int:
+        """
+        Fetch any registrations not loaded yet
+
+        Args:
+            progress: Optional callback progress(done, total) for UI updates
+
+        Returns:
+            Number of newly loaded addresses
+        """
+        with self._lock:
+            total_registered = self.contract.functions.getTotalRegistered().call()
+
+            # Fewer registrations than we know about means the cache belongs
+            # to an earlier deployment at the same address (e.g. a local node).
+            # An unchanged count since the last check needs no tip check
+            if total_registered < self.highest_id or \
+                    (total_registered != self._checked_total and not self._tip_matches()):
+                self._addresses = {}
+            self._checked_total = total_registered
+
+            # Normally just the IDs above the highest known one, plus any
+            # earlier ID whose fetch failed last time
+            missing_ids = [
+                user_id for user_id in range(1, total_registered + 1)
+                if user_id not in self._addresses
+            ]
+            if not missing_ids:
+                return 0
+
+            loaded = 0
+            for offset in range(0, len(missing_ids), BATCH_SIZE):
+                chunk = missing_ids[offset:offset + BATCH_SIZE]
+                for user_id, address in zip(chunk, self._fetch_chunk(chunk)):
+                    if address and address != ZERO_ADDRESS:
+                        self._addresses[user_id] = address
+                        loaded += 1
+                if progress:
+                    progress(offset + len(chunk), len(missing_ids))
+
+            self._save()
+            return loaded
+
+    def lookup(self, user_ids) -> dict:
+        """
+        Map user IDs to addresses, refreshing once if any ID is unknown
+
+        Returns:
+            Dict of user_id -> address for every ID that is registered
+        """
+        user_ids = [int(user_id) for user_id in user_ids]
+        if any(user_id not in self._addresses for user_id in user_ids):
+            self.refresh()
+        return {
+            user_id: self._addresses[user_id]
+            for user_id in user_ids
+            if user_id in self._addresses
+        }
+
+    def items(self):
+        """All (user_id, address) pairs ordered by user ID"""
+        return sorted(self._addresses.items())
+
+    def _tip_matches(self) -> bool:
+        """
+        Check the highest cached entry still matches the chain
+
+        Raises:
+            Exception: If idToAddress fails (e.g. a timeout or rate limit) -
+                that says nothing about the cache, so it is kept
+        """
+        if not self._addresses:
+            return True
+        highest_id = self.highest_id
+        address = self.contract.functions.idToAddress(highest_id).call()
+        return address.lower() == self._addresses[highest_id].lower()
+
+    def _fetch_chunk(self, user_ids):
+        """Fetch addresses for a chunk of IDs in one JSON-RPC batch"""
+        w3 = self.contract.w3
+        if hasattr(w3, "batch_requests"):
+            try:
+                with w3.batch_requests() as batch:
+                    for user_id in user_ids:
+                        batch.add(self.contract.functions.idToAddress(user_id))
+                    return batch.execute()
+            except Exception:
+                # Endpoint does not accept batches - fall back to single calls
+                pass
+
+        with ThreadPoolExecutor(max_workers=FALLBACK_WORKERS) as pool:
+            # Workers send with the caller's priority
+            return list(pool.map(bind_priority(self._fetch_one), user_ids))
+
+    def _fetch_one(self, user_id):
+        try:
+            return self.contract.functions.idToAddress(user_id).call()
+        except Exception:
+            return None
+
+    def _save(self):
+        write_json_atomic(self.path, {
+            "contractAddress": self.contract.address,
+            "addresses": {str(user_id): address for user_id, address in self._addresses.items()},
+        })
+
+
+_directories = {}
+_directories_lock = threading.Lock()
+
+
+def get_address_directory(contract) -> AddressDirectory:
+    """Process-wide directory for a contract, shared by every session"""
+    key = contract.address.lower()
+    with _directories_lock:
+        directory = _directories.get(key)
+        if directory is None:
+            directory = AddressDirectory(contract)
+            _directories[key] = directory
+        else:
+            # Use the caller's connection for any further fetches
+            directory.contract = contract
+        return directory
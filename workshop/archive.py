@@ -0,0 +1,131 @@
+"""
+Bulk export archive
+A single zip file holding one CSV per election plus a manifest.json, written by
+backup-dashboard.py and read back by points-dashboard.py in one upload.
+"""
+
+import hashlib
+import io
+import json
+import zipfile
+from datetime import datetime
+
+import pandas as pd
+
+ARCHIVE_FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+
+def election_csv_name(election_id: int, vote_type: str) -> str:
+    """File name for an election CSV (same names as the single-election downloads)"""
+    if vote_type == "private":
+        return f"decrypted_votes_election_{election_id}.csv"
+    return f"public_votes_election_{election_id}.csv"
+
+
+def build_export_archive(elections, contract_address: str):
+    """
+    Build a compressed archive for a bulk export
+
+    Args:
+        elections: List of dicts with keys voteKey, electionId, type, title,
+            status, voteCount, votes_df (DataFrame or None) and failed
+            (list of {'User ID', 'Error'} dicts for undecryptable votes)
+        contract_address: Contract the data was read from
+
+    Returns:
+        Tuple of (zip archive as bytes, manifest dict)
+    """
+    manifest = {
+        "version": ARCHIVE_FORMAT_VERSION,
+        "contractAddress": contract_address,
+        "exportedAt": datetime.now().isoformat(timespec="seconds"),
+        "elections": [],
+    }
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for election in elections:
+            entry = {
+                "voteKey": election["voteKey"],
+                "electionId": election["electionId"],
+                "type": election["type"],
+                "title": election["title"],
+                "status": election["status"],
+                "voteCount": election["voteCount"],
+                "file": None,
+                "rows": 0,
+                "failed": election.get("failed", []),
+            }
+
+            votes_df = election.get("votes_df")
+            if votes_df is not None and len(votes_df) > 0:
+                file_name = election_csv_name(election["electionId"], election["type"])
+                data = votes_df.to_csv(index=False).encode("utf-8")
+                zf.writestr(file_name, data)
+                entry["file"] = file_name
+                entry["rows"] = len(votes_df)
+                entry["sha256"] = hashlib.sha256(data).hexdigest()
+
+            manifest["elections"].append(entry)
+
+        zf.writestr(MANIFEST_NAME, json.dumps(manifest, indent=2, ensure_ascii=False))
+
+    return buffer.getvalue(), manifest
+
+
+def read_export_archive(uploaded_file):
+    """
+    Read a bulk export archive
+
+    Args:
+        uploaded_file: Path or file-like object of the zip archive
+
+    Returns:
+        Tuple of (manifest dict, {voteKey: io.BytesIO of the election CSV}).
+        Elections without votes are listed in the manifest but have no CSV.
+
+    Raises:
+        ValueError: If the archive has no manifest or a CSV fails its checksum
+    """
+    files = {}
+    with zipfile.ZipFile(uploaded_file) as zf:
+        if MANIFEST_NAME not in zf.namelist():
+            raise ValueError(f"Archive is missing {MANIFEST_NAME}")
+
+        manifest = json.loads(zf.read(MANIFEST_NAME).decode("utf-8"))
+        if manifest.get("version") != ARCHIVE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported archive version: {manifest.get('version')}")
+
+        for entry in manifest["elections"]:
+            if not entry.get("file"):
+                continue
+
+            data = zf.read(entry["file"])
+            if hashlib.sha256(data).hexdigest() != entry.get("sha256"):
+                raise ValueError(f"Checksum mismatch for {entry['file']}")
+
+            files[entry["voteKey"]] = io.BytesIO(data)
+
+    return manifest, files
+
+
+def archive_file_name() -> str:
+    """Default download name for a bulk export"""
+    return f"workshop_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+
+
+def summarize_manifest(manifest) -> pd.DataFrame:
+    """One row per election for display after an export or upload"""
+    return pd.DataFrame([
+        {
+            "Vote": entry["title"],
+            "Election ID": entry["electionId"],
+            "Type": entry["type"].title(),
+            "Status": entry["status"],
+            "Votes Cast": entry["voteCount"],
+            "Rows Exported": entry["rows"],
+            "Failed": len(entry.get("failed", [])),
+        }
+        for entry in manifest["elections"]
+    ])
@@ -0,0 +1,286 @@
+"""
+Consistency audit
+The dashboards show public tallies from the contract's per-choice counters
+(getElectionResults) next to voter breakdowns from getAllPublicVotes, and
+private tallies from decryption; nothing checks that these agree. The audit
+reads every source for all configured elections concurrently, pinned to one
+block, and compares them with array operations:
+
+    public: getVoteCount, getElectionResults, getAllPublicVotes and the
+        PublicVoteCast event log must agree on every voter and choice
+    private: getVoteCount, getVotersInElection and the PrivateVoteCast event
+        log must agree on the voters, and every vote must decrypt
+
+Every mismatch is reported in one pass instead of stopping at the first.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from workshop.chain import STATUS_OPEN
+from workshop.chain_follower import LOG_RANGE
+from workshop.decryption_jobs import get_decryption_job
+
+# Concurrent RPC requests while auditing
+AUDIT_WORKERS = 8
+
+AUDITED_EVENTS = ("PublicVoteCast", "PrivateVoteCast")
+
+
+def _result(future):
+    """A future's result, or None if its call reverted or failed"""
+    try:
+        return future.result()
+    except Exception:
+        return None
+
+
+def _fetch_events(contract, pool, from_block: int, to_block: int, log_range: int):
+    """
+    Vote events between two blocks, fetched in parallel block ranges
+
+    Returns:
+        Dict event name -> int array of rows (electionId, userId, choice);
+        choice is 0 for private votes
+    """
+    from eth_utils import event_abi_to_log_topic
+
+    topics = {
+        event_abi_to_log_topic(item): item["name"]
+        for item in contract.abi
+        if item.get("type") == "event" and item["name"] in AUDITED_EVENTS
+    }
+    topic_filter = ["0x" + topic.hex() for topic in topics]
+
+    def fetch(start):
+        return contract.w3.eth.get_logs({
+            "address": contract.address,
+            "fromBlock": start,
+            "toBlock": min(start + log_range - 1, to_block),
+            "topics": [topic_filter],
+        })
+
+    rows = {name: [] for name in AUDITED_EVENTS}
+    for logs in pool.map(fetch, range(from_block, to_block + 1, log_range)):
+        for log in logs:
+            name = topics[bytes(log["topics"][0])]
+            args = getattr(contract.events, name)().process_log(log)["args"]
+            rows[name].append((args["electionId"], args["userId"], args.get("choice", 0)))
+    return {name: np.array(values, dtype=np.int64).reshape(-1, 3) for name, values in rows.items()}
+
+
+def _diff_voters(label: str, expected, actual) -> list:
+    """Issues for user IDs missing from or extra in a source"""
+    issues = []
+    missing = np.setdiff1d(expected, actual)
+    extra = np.setdiff1d(actual, expected)
+    if missing.size:
+        issues.append(f"{label} is missing {missing.size} voter(s): {missing[:10].tolist()}")
+    if extra.size:
+        issues.append(f"{label} has {extra.size} unexpected voter(s): {extra[:10].tolist()}")
+    return issues
+
+
+def _check_public(num_options: int, vote_count: int, counts, user_ids, choices, events) -> dict:
+    """Cross-check one public election's counters, vote arrays and events"""
+    counts = np.asarray(counts, dtype=np.int64)
+    user_ids = np.asarray(user_ids, dtype=np.int64)
+    choices = np.asarray(choices, dtype=np.int64)
+    issues = []
+
+    in_range = (choices >= 1) & (choices <= num_options)
+    if not in_range.all():
+        issues.append(f"getAllPublicVotes has {(~in_range).sum()} choice(s) outside 1-{num_options}")
+    votes_tally = np.bincount(choices[in_range], minlength=num_options + 1)[1:]
+
+    duplicates = user_ids.size - np.unique(user_ids).size
+    if duplicates:
+        issues.append(f"getAllPublicVotes lists {duplicates} voter(s) more than once")
+    if user_ids.size != vote_count:
+        issues.append(f"getAllPublicVotes has {user_ids.size} votes, getVoteCount says {vote_count}")
+    if counts.sum() != vote_count:
+        issues.append(f"getElectionResults adds up to {counts.sum()} votes, getVoteCount says {vote_count}")
+    wrong = np.flatnonzero(counts != votes_tally)
+    if wrong.size:
+        issues.append("getElectionResults disagrees with getAllPublicVotes on option(s) "
+                      + ", ".join(f"{option + 1} ({counts[option]} vs {votes_tally[option]})" for option in wrong))
+
+    events_tally = None
+    if events is not None:
+        event_users, event_choices = events[:, 1], events[:, 2]
+        events_tally = np.bincount(np.clip(event_choices, 0, num_options + 1), minlength=num_options + 2)[1:-1]
+        issues += _diff_voters("The PublicVoteCast log", user_ids, event_users)
+        _, in_votes, in_events = np.intersect1d(user_ids, event_users, return_indices=True)
+        changed = np.flatnonzero(choices[in_votes] != event_choices[in_events])
+        if changed.size:
+            issues.append(f"{changed.size} voter(s) have a different choice in the PublicVoteCast log: "
+                          f"{user_ids[in_votes[changed[:10]]].tolist()}")
+
+    return {
+        'contractTally': counts.tolist(),
+        'votesTally': votes_tally.tolist(),
+        'eventsTally': None if events_tally is None else events_tally.tolist(),
+        'issues': issues,
+    }
+
+
+def _check_private(vote_count: int, voters, events, job, is_open: bool) -> dict:
+    """Cross-check one private election's voters and events, and collect undecryptable votes"""
+    voters = np.asarray(voters, dtype=np.int64)
+    issues = []
+
+    if voters.size != vote_count:
+        issues.append(f"getVotersInElection has {voters.size} voters, getVoteCount says {vote_count}")
+    if events is not None:
+        issues += _diff_voters("The PrivateVoteCast log", voters, events[:, 1])
+
+    undecryptable = {}
+    if job is not None:
+        status = job.status()
+        if status['state'] != "done":
+            issues.append(f"Decryption stopped: {status['error']}")
+        undecryptable = job.failures()
+        if undecryptable:
+            issues.append(f"{len(undecryptable)} vote(s) could not be decrypted: {sorted(undecryptable)[:10]}")
+        decrypted = np.array(sorted(set(job.results()) | set(undecryptable)), dtype=np.int64)
+        if is_open:
+            # Decryption reads the latest block, so it may already have newer votes
+            decrypted = np.intersect1d(decrypted, voters)
+        issues += _diff_voters("Decryption", voters, decrypted)
+
+    return {'undecryptable': undecryptable, 'issues': issues}
+
+
+def audit_elections(contract, votes_config, decryption_key: str = None, from_block: int = None,
+                    log_range: int = LOG_RANGE, workers: int = AUDIT_WORKERS) -> dict:
+    """
+    Cross-check the tallies of every configured election
+
+    Args:
+        contract: Web3 contract object
+        votes_config: Parsed votes config (workshop.config.VotesConfig)
+        decryption_key: Base64 private key; without it private votes are not decrypted
+        from_block: Block to read vote events from (the contract's deployment
+            block); None skips the event log
+        log_range: Blocks per eth_getLogs request
+        workers: Concurrent RPC requests
+
+    Returns:
+        Dict with 'block' (the block every read is pinned to), 'ok',
+        'seconds' and 'elections' (one dict per configured election, with
+        its tallies per source and a list of 'issues')
+    """
+    started = time.monotonic()
+    block = contract.w3.eth.block_number
+    functions = contract.functions
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        def submit(call):
+            return pool.submit(call.call, block_identifier=block)
+
+        # Every read is queued at once; the event ranges and decryption run alongside them
+        reads, jobs = {}, {}
+        for vote in votes_config.votes:
+            election_id = vote['electionId']
+            reads[election_id] = {
+                'election': submit(functions.getElection(election_id)),
+                'voteCount': submit(functions.getVoteCount(election_id)),
+            }
+            if vote['type'] == 'public':
+                reads[election_id]['counts'] = submit(functions.getElectionResults(election_id, len(vote['options'])))
+                reads[election_id]['votes'] = submit(functions.getAllPublicVotes(election_id))
+            else:
+                reads[election_id]['voters'] = submit(functions.getVotersInElection(election_id))
+                if decryption_key:
+                    jobs[election_id] = get_decryption_job(contract, election_id,
+                                                           votes_config.signature_options(election_id))
+                    jobs[election_id].start(decryption_key)
+
+        events = None
+        if from_block is not None:
+            events = _fetch_events(contract, pool, from_block, block, log_range)
+
+        elections = []
+        for vote in votes_config.votes:
+            election_id = vote['electionId']
+            is_private = vote['type'] == 'private'
+            election = _result(reads[election_id]['election'])
+            entry = {
+                'electionId': election_id,
+                'voteKey': vote['voteKey'],
+                'type': vote['type'],
+                'status': "Not Created",
+                'voteCount': 0,
+                'contractTally': None,
+                'votesTally': None,
+                'eventsTally': None,
+                'undecryptable': {},
+                'issues': [],
+            }
+            elections.append(entry)
+
+            if election is None:
+                if events is not None:
+                    orphans = sum(int((rows[:, 0] == election_id).sum()) for rows in events.values())
+                    if orphans:
+                        entry['issues'].append(f"{orphans} vote event(s) for an election that does not exist")
+                continue
+
+            entry['status'] = "Open" if election[1] == STATUS_OPEN else "Closed"
+            if bool(election[2]) == is_private:
+                entry['issues'].append(f"The contract has this election as {'public' if election[2] else 'private'}")
+                continue
+
+            try:
+                values = {key: future.result() for key, future in reads[election_id].items()}
+            except Exception as e:
+                entry['issues'].append(f"Could not read the election: {e}")
+                continue
+            entry['voteCount'] = vote_count = int(values['voteCount'])
+
+            if is_private:
+                election_events = None if events is None else \
+                    events["PrivateVoteCast"][events["PrivateVoteCast"][:, 0] == election_id]
+                job = jobs.get(election_id)
+                if job is not None:
+                    job.wait()
+                entry.update(_check_private(vote_count, values['voters'], election_events, job,
+                                            entry['status'] == "Open"))
+            else:
+                election_events = None if events is None else \
+                    events["PublicVoteCast"][events["PublicVoteCast"][:, 0] == election_id]
+                user_ids, choices = values['votes']
+                entry.update(_check_public(len(vote['options']), vote_count, values['counts'],
+                                           user_ids, choices, election_events))
+
+    return {
+        'block': int(block),
+        'ok': not any(entry['issues'] for entry in elections),
+        'seconds': round(time.monotonic() - started, 3),
+        'elections': elections,
+    }
+
+
+def audit_frame(report: dict) -> pd.DataFrame:
+    """One row per election of an audit report, for display"""
+    def tally(values):
+        return "" if values is None else " / ".join(str(value) for value in values)
+
+    return pd.DataFrame([
+        {
+            'Election': entry['electionId'],
+            'Vote': entry['voteKey'],
+            'Type': entry['type'].title(),
+            'Status': entry['status'],
+            'Votes': entry['voteCount'],
+            'Contract Tally': tally(entry['contractTally']),
+            'Vote Arrays Tally': tally(entry['votesTally']),
+            'Event Log Tally': tally(entry['eventsTally']),
+            'Undecryptable': len(entry['undecryptable']),
+            'Result': "OK" if not entry['issues'] else "; ".join(entry['issues']),
+        }
+        for entry in report['elections']
+    ])
@@ -0,0 +1,267 @@
+"""
+RPC cassettes
+Record every JSON-RPC request the dashboards send during a real workshop,
+with its response and round-trip time, into one gzipped JSON file, then
+replay it offline so the dashboards can be run and profiled without a
+network and with reproducible timings.
+
+    RPC_CASSETTE_RECORD=workshop.json.gz streamlit run dashboard.py
+    RPC_CASSETTE_REPLAY=workshop.json.gz RPC_REPLAY_LATENCY=recorded streamlit run dashboard.py
+
+Both hook in below the scheduler and the request coalescer
+(workshop/rpc_scheduler.py), so a replay sends requests exactly as a live
+run would. Identical requests (same method and parameters) are answered
+with their recorded responses in recorded order; once those run out, the
+last one repeats. A request that was never recorded gets a JSON-RPC error,
+so record with empty dashboard caches (DASHBOARD_CACHE_DIR) to capture every
+request a cold start makes.
+
+Latency models (RPC_REPLAY_LATENCY):
+    none (default): answer immediately
+    recorded: sleep the recorded round-trip time; "recorded*0.5" scales it
+    50: sleep 50 ms per request; "50+-20" adds uniform jitter of up to 20 ms,
+        seeded per request so every run sleeps the same
+"""
+
+import atexit
+import copy
+import functools
+import gzip
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from workshop.rpc_scheduler import scheduled_provider_class
+
+CASSETTE_VERSION = 1
+
+RECORD_ENV = "RPC_CASSETTE_RECORD"
+REPLAY_ENV = "RPC_CASSETTE_REPLAY"
+LATENCY_ENV = "RPC_REPLAY_LATENCY"
+
+# Recorded interactions between writes of the cassette (it is also written at exit)
+SAVE_EVERY = 200
+
+# JSON-RPC error code returned for requests missing from a cassette
+MISSING_ERROR_CODE = -32099
+
+
+def request_key(method: str, params) -> str:
+    """Canonical identity of a request"""
+    return json.dumps([method, params], sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _strip_id(response: dict) -> dict:
+    return {key: value for key, value in response.items() if key != "id"}
+
+
+class Cassette:
+    """Recorded requests of one RPC endpoint"""
+
+    def __init__(self, path, endpoint: str = None):
+        self.path = Path(path)
+        self.endpoint = endpoint
+        self.recorded_at = None
+        self._lock = threading.Lock()
+        self._interactions = []     # [key, response, seconds] in recorded order
+        self._unsaved = 0
+
+    @classmethod
+    def load(cls, path) -> "Cassette":
+        """
+        Read a cassette file
+
+        Raises:
+            ValueError: If the file is not a cassette of this version
+        """
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"{path} is not a version {CASSETTE_VERSION} RPC cassette")
+        cassette = cls(path, data.get("endpoint"))
+        cassette.recorded_at = data.get("recordedAt")
+        cassette._interactions = data["interactions"]
+        return cassette
+
+    def __len__(self):
+        return len(self._interactions)
+
+    def record(self, method: str, params, response: dict, seconds: float):
+        with self._lock:
+            self._interactions.append([request_key(method, params), _strip_id(response), round(seconds, 6)])
+            self._unsaved += 1
+            save = self._unsaved >= SAVE_EVERY
+        if save:
+            self.save()
+
+    def save(self):
+        """Write the cassette atomically (gzipped JSON)"""
+        with self._lock:
+            payload = {
+                "version": CASSETTE_VERSION,
+                "endpoint": self.endpoint,
+                "recordedAt": self.recorded_at or datetime.now().isoformat(timespec="seconds"),
+                "interactions": list(self._interactions),
+            }
+            self._unsaved = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8") as f:
+                json.dump(payload, f, separators=(",", ":"), default=str)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def responses(self) -> dict:
+        """Request key -> [(response, seconds), ...] in recorded order"""
+        grouped = {}
+        for key, response, seconds in self._interactions:
+            grouped.setdefault(key, []).append((response, seconds))
+        return grouped
+
+
+class LatencyModel:
+    """Simulated round-trip time of replayed requests"""
+
+    def __init__(self, spec: str = None, seed: int = 0):
+        """
+        Args:
+            spec: "none", "recorded", "recorded*<scale>", "<ms>" or "<ms>+-<jitter ms>"
+            seed: Seed of the jitter
+
+        Raises:
+            ValueError: On an unknown spec
+        """
+        spec = (spec or "none").strip().lower()
+        self.spec = spec
+        self.seed = seed
+        self.recorded_scale = None
+        self.fixed = self.jitter = 0.0
+        try:
+            if spec == "none":
+                pass
+            elif spec.startswith("recorded"):
+                _, _, scale = spec.partition("*")
+                self.recorded_scale = float(scale or 1)
+            else:
+                fixed, _, jitter = spec.partition("+-")
+                self.fixed, self.jitter = float(fixed) / 1000, float(jitter or 0) / 1000
+        except ValueError:
+            raise ValueError(f"Unknown replay latency {spec!r} (none, recorded, recorded*0.5, 50 or 50+-20)") from None
+
+    def delay(self, key: str, occurrence: int, recorded_seconds: float) -> float:
+        """Seconds to wait before answering the occurrence-th request with a key"""
+        if self.recorded_scale is not None:
+            return recorded_seconds * self.recorded_scale
+        if not self.jitter:
+            return self.fixed
+        # Seeded by the request, not by arrival order, so threads cannot change it
+        rng = random.Random(f"{self.seed}:{occurrence}:{key}")
+        return max(0.0, self.fixed + rng.uniform(-self.jitter, self.jitter))
+
+
+@functools.lru_cache(maxsize=None)
+def _cassette_provider_classes():
+    """Recording and replaying subclasses of the scheduled provider (web3 imported lazily)"""
+    base = scheduled_provider_class()
+
+    class RecordingHTTPProvider(base):
+        def __init__(self, endpoint_uri: str, cassette: Cassette, **kwargs):
+            super().__init__(endpoint_uri, **kwargs)
+            self.cassette = cassette
+
+        def _http_request(self, method, params):
+            started = time.perf_counter()
+            response = super()._http_request(method, params)
+            self.cassette.record(method, params, response, time.perf_counter() - started)
+            return response
+
+        def _http_batch_request(self, batch_requests):
+            started = time.perf_counter()
+            responses = super()._http_batch_request(batch_requests)
+            if isinstance(responses, list):
+                seconds = (time.perf_counter() - started) / max(len(batch_requests), 1)
+                for (method, params), response in zip(batch_requests, responses):
+                    self.cassette.record(method, params, response, seconds)
+            return responses
+
+    class ReplayProvider(base):
+        def __init__(self, cassette: Cassette, latency: LatencyModel = None, **kwargs):
+            # Scheduled and coalesced like the recorded endpoint, but never sent
+            super().__init__(cassette.endpoint or f"replay:{cassette.path}", **kwargs)
+            self.cassette = cassette
+            self.latency = latency or LatencyModel()
+            self._responses = cassette.responses()
+            self._served = {}
+            self._served_lock = threading.Lock()
+            self.missing = 0
+
+        def is_connected(self, show_traceback: bool = False) -> bool:
+            return True
+
+        def _answer(self, method, params, request_id) -> dict:
+            key = request_key(method, params)
+            recorded = self._responses.get(key)
+            with self._served_lock:
+                occurrence = self._served.get(key, 0)
+                self._served[key] = occurrence + 1
+                if not recorded:
+                    self.missing += 1
+            if not recorded:
+                return {"jsonrpc": "2.0", "id": request_id,
+                        "error": {"code": MISSING_ERROR_CODE, "message": f"{method} request not in cassette"}}
+            response, seconds = recorded[min(occurrence, len(recorded) - 1)]
+            time.sleep(self.latency.delay(key, occurrence, seconds))
+            return dict(copy.deepcopy(response), id=request_id)
+
+        def _http_request(self, method, params):
+            return self._answer(method, params, 0)
+
+        def _http_batch_request(self, batch_requests):
+            return [self._answer(method, params, index) for index, (method, params) in enumerate(batch_requests)]
+
+    return RecordingHTTPProvider, ReplayProvider
+
+
+_recordings = {}
+_recordings_lock = threading.Lock()
+
+
+def recording_provider(rpc_url: str, path, **kwargs):
+    """
+    Scheduled HTTPProvider that appends every request it sends to a cassette
+
+    An existing cassette file is extended, so the dashboards can be recorded
+    one after another into the same file (processes recording at the same
+    time need a file each).
+    """
+    recording_class, _ = _cassette_provider_classes()
+    with _recordings_lock:
+        # One cassette per file and process, however many connections record
+        cassette = _recordings.get(str(path))
+        if cassette is None:
+            cassette = Cassette.load(path) if Path(path).exists() else Cassette(path, rpc_url)
+            atexit.register(cassette.save)
+            _recordings[str(path)] = cassette
+    return recording_class(rpc_url, cassette, **kwargs)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_cassette(path: str) -> Cassette:
+    return Cassette.load(path)
+
+
+def replay_provider(path, latency: str = None, **kwargs):
+    """Provider answering from a cassette instead of the network"""
+    _, replay_class = _cassette_provider_classes()
+    return replay_class(_load_cassette(str(path)), LatencyModel(latency), **kwargs)
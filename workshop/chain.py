@@ -0,0 +1,74 @@
+"""
+Blockchain connection helpers
+web3 is only imported once a connection is made, so the dashboards can draw
+their connect screen without paying for it. The contract ABI lives in
+VotingWorkshop.abi.json and is parsed once per process.
+"""
+
+import functools
+import json
+import os
+from pathlib import Path
+
+ABI_PATH = Path(__file__).resolve().parent / "VotingWorkshop.abi.json"
+
+# Per-request RPC timeout in seconds (fail fast on a dead endpoint)
+RPC_TIMEOUT = 5
+
+# ElectionStatus enum in VotingWorkshop.sol (getElection()[1])
+STATUS_CLOSED = 0
+STATUS_OPEN = 1
+
+
+@functools.lru_cache(maxsize=None)
+def load_contract_abi() -> list:
+    """Parsed VotingWorkshop ABI, read from disk once per process"""
+    with open(ABI_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def connect(rpc_url: str, timeout: int = RPC_TIMEOUT):
+    """
+    Create a Web3 connection to an RPC endpoint
+
+    Requests are rate limited per endpoint and prioritised by
+    workshop.rpc_scheduler. With RPC_CASSETTE_RECORD set they are also
+    recorded to that cassette file, and with RPC_CASSETTE_REPLAY set they are
+    answered from it without any network (see workshop.cassettes).
+
+    Returns:
+        Web3 instance with the POA middleware injected when available
+    """
+    from web3 import Web3
+
+    from workshop.cassettes import LATENCY_ENV, RECORD_ENV, REPLAY_ENV, recording_provider, replay_provider
+    from workshop.rpc_scheduler import scheduled_provider
+
+    # Requests share the endpoint's rate limit with every other connection to it
+    request_kwargs = {"timeout": timeout}
+    if os.environ.get(REPLAY_ENV):
+        provider = replay_provider(os.environ[REPLAY_ENV], os.environ.get(LATENCY_ENV), request_kwargs=request_kwargs)
+    elif os.environ.get(RECORD_ENV):
+        provider = recording_provider(rpc_url, os.environ[RECORD_ENV], request_kwargs=request_kwargs)
+    else:
+        provider = scheduled_provider(rpc_url, request_kwargs=request_kwargs)
+    w3 = Web3(provider)
+
+    # Add POA middleware for compatibility
+    try:
+        from web3.middleware.proof_of_authority import ExtraDataToPOAMiddleware
+        w3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
+    except ImportError:
+        pass
+
+    return w3
+
+
+def load_contract(w3, contract_address: str):
+    """VotingWorkshop contract object bound to a connection"""
+    from web3 import Web3
+
+    return w3.eth.contract(
+        address=Web3.to_checksum_address(contract_address),
+        abi=load_contract_abi(),
+    )
@@ -0,0 +1,309 @@
+"""
+Chain follower
+Incremental, reorg-safe index of the contract's PublicVoteCast,
+PrivateVoteCast and UserRegistered events. Each poll only reads the logs of
+the blocks added since the previous one. The hashes of the recent blocks it
+has seen are kept, and when the last indexed one no longer matches the chain,
+every event above the last block that still matches is rolled back and read
+again.
+
+Events less than `confirmations` blocks deep are provisional. Only confirmed
+events are persisted, so a restart resumes from the last confirmed block and
+re-reads just the provisional tail.
+"""
+
+import threading
+import time
+
+from workshop.storage import contract_cache_dir, read_json, write_json_atomic
+
+# Blocks an event must be buried under before it counts as final
+CONFIRMATIONS = 6
+
+# Recent blocks whose hashes are kept to find where a reorg forked off
+REORG_WINDOW = 128
+
+# Blocks per eth_getLogs request
+LOG_RANGE = 2000
+
+INDEXED_EVENTS = ("PublicVoteCast", "PrivateVoteCast", "UserRegistered")
+
+
+def _hex(value) -> str:
+    """0x-prefixed hex of bytes, HexBytes or a hex string"""
+    text = value.hex() if isinstance(value, (bytes, bytearray)) else str(value)
+    return text if text.startswith("0x") else "0x" + text
+
+
+class ChainFollower:
+    """Reorg-aware event index of one contract"""
+
+    def __init__(self, contract, start_block: int = 0, confirmations: int = CONFIRMATIONS,
+                 reorg_window: int = REORG_WINDOW, log_range: int = LOG_RANGE):
+        """
+        Args:
+            contract: Web3 contract object
+            start_block: First block to index (the contract's deployment block)
+            confirmations: Depth at which events are final
+            reorg_window: Recent blocks whose hashes are kept (must exceed confirmations)
+            log_range: Blocks per eth_getLogs request
+        """
+        from eth_utils import event_abi_to_log_topic
+
+        self.contract = contract
+        self.start_block = start_block
+        self.confirmations = confirmations
+        self.reorg_window = max(reorg_window, confirmations + 1)
+        self.log_range = log_range
+        self.path = contract_cache_dir(contract.address, "follower") / "events.json"
+
+        self._topics = {
+            _hex(event_abi_to_log_topic(item)): item["name"]
+            for item in contract.abi
+            if item.get("type") == "event" and item["name"] in INDEXED_EVENTS
+        }
+        self._lock = threading.Lock()
+        self._events = []           # Decoded events in chain order
+        self._hashes = {}           # Block number -> hash, for recent blocks
+        self._persisted = 0         # Confirmed events already on disk
+        self.cursor = start_block - 1
+        self.head = None
+        self.reorgs = 0
+        self.last_reorg = None
+        self._reset_views()
+        self._load()
+
+    @property
+    def confirmed_block(self) -> int:
+        """Highest block whose events are final"""
+        if self.head is None:
+            return self.cursor
+        return min(self.cursor, self.head - self.confirmations)
+
+    def poll(self) -> dict:
+        """
+        Catch up with the chain: undo any reorg, then index the new blocks
+
+        Returns:
+            status()
+        """
+        with self._lock:
+            w3 = self.contract.w3
+            # Hash first, logs second: if the chain reorgs in between, the
+            # stored hash no longer matches and the next poll re-reads
+            latest = w3.eth.get_block("latest")
+            head, head_hash = int(latest["number"]), _hex(latest["hash"])
+
+            # Is the last indexed block still on the chain? Free when the
+            # head has not moved or moved by one block
+            cursor_hash = self._hashes.get(self.cursor)
+            if head < self.cursor:
+                self._unwind_reorg()
+            elif cursor_hash is not None:
+                if head == self.cursor:
+                    current_hash = head_hash
+                elif head == self.cursor + 1:
+                    current_hash = _hex(latest["parentHash"])
+                else:
+                    current_hash = self._block_hash(self.cursor)
+                if current_hash != cursor_hash:
+                    self._unwind_reorg()
+
+            start = self.cursor + 1
+            while start <= head:
+                end = min(start + self.log_range - 1, head)
+                logs = w3.eth.get_logs({
+                    "address": self.contract.address,
+                    "fromBlock": start,
+                    "toBlock": end,
+                    "topics": [list(self._topics)],
+                })
+                for log in logs:
+                    self._add(self._decode(log))
+                    if log["blockNumber"] > head - self.reorg_window:
+                        self._hashes[int(log["blockNumber"])] = _hex(log["blockHash"])
+                self.cursor = end
+                start = end + 1
+
+            self._hashes[head] = head_hash
+            self.head = head
+            for number in [number for number in self._hashes if number <= head - self.reorg_window]:
+                del self._hashes[number]
+            self._save()
+            return self._status()
+
+    def status(self) -> dict:
+        """Head, cursor, confirmed block and reorg counters"""
+        with self._lock:
+            return self._status()
+
+    def public_votes(self, election_id: int, confirmed_only: bool = False):
+        """
+        Public votes of an election in the order they were cast
+
+        Returns:
+            Tuple (user_ids, choices), like getAllPublicVotes
+        """
+        with self._lock:
+            votes = self._select(self._public.get(election_id, {}), confirmed_only)
+            return [user_id for user_id, _ in votes], [choice for _, (choice, _) in votes]
+
+    def private_voters(self, election_id: int, confirmed_only: bool = False) -> list:
+        """User IDs that cast a private vote in an election"""
+        with self._lock:
+            return [user_id for user_id, _ in self._select(self._private.get(election_id, {}), confirmed_only)]
+
+    def registrations(self, confirmed_only: bool = False) -> dict:
+        """User ID -> wallet address of every registration"""
+        with self._lock:
+            return {user_id: address for user_id, (address, _) in self._select(self._registered, confirmed_only)}
+
+    def provisional_votes(self, election_id: int) -> int:
+        """Votes of an election that are not yet `confirmations` blocks deep"""
+        with self._lock:
+            confirmed = self.confirmed_block
+            votes = list(self._public.get(election_id, {}).values()) + list(self._private.get(election_id, {}).values())
+            return sum(1 for _, block in votes if block > confirmed)
+
+    def _status(self) -> dict:
+        return {
+            'head': self.head,
+            'cursor': self.cursor,
+            'confirmedBlock': self.confirmed_block,
+            'events': len(self._events),
+            'reorgs': self.reorgs,
+            'lastReorg': self.last_reorg,
+        }
+
+    def _select(self, entries: dict, confirmed_only: bool) -> list:
+        """(key, (value, block)) pairs of a view, optionally only the confirmed ones"""
+        if not confirmed_only:
+            return list(entries.items())
+        confirmed = self.confirmed_block
+        return [(key, value) for key, value in entries.items() if value[1] <= confirmed]
+
+    def _block_hash(self, number: int):
+        """
+        Hash of a block on the current chain, None if the chain has no such block
+
+        Raises:
+            Exception: On any other RPC error (e.g. a timeout)
+        """
+        from web3.exceptions import BlockNotFound
+
+        try:
+            block = self.contract.w3.eth.get_block(number)
+        except BlockNotFound:
+            return None
+        return _hex(block["hash"]) if block else None
+
+    def _unwind_reorg(self):
+        """
+        Roll back to the newest remembered block that is still on the chain
+
+        Only a missing block or a different hash counts as a reorg: any other
+        RPC error propagates before anything is rolled back, so the poll is
+        simply retried.
+        """
+        if not self._hashes:
+            return
+        newest = max(self._hashes)
+        for number in sorted(self._hashes, reverse=True):
+            # None: block beyond the new (shorter) chain
+            still_there = self._block_hash(number) == self._hashes[number]
+            if still_there:
+                if number != newest:
+                    self._rollback(number)
+                return
+        # Forked below everything remembered: start over
+        self._rollback(self.start_block - 1)
+
+    def _rollback(self, block_number: int):
+        dropped = sum(1 for event in self._events if event["block"] > block_number)
+        self._events = [event for event in self._events if event["block"] <= block_number]
+        self._hashes = {number: value for number, value in self._hashes.items() if number <= block_number}
+        self.cursor = block_number
+        # Rewrite the persisted events on the next save
+        self._persisted = -1
+        self.reorgs += 1
+        self.last_reorg = {'block': block_number, 'droppedEvents': dropped, 'at': time.time()}
+        self._reset_views()
+        for event in self._events:
+            self._apply(event)
+
+    def _decode(self, log) -> dict:
+        name = self._topics[_hex(log["topics"][0])]
+        args = getattr(self.contract.events, name)().process_log(log)["args"]
+        return {
+            "event": name,
+            "block": int(log["blockNumber"]),
+            "args": {key: value if isinstance(value, (int, str)) else _hex(value) for key, value in args.items()},
+        }
+
+    def _reset_views(self):
+        self._public = {}       # election ID -> {user ID: (choice, block)}
+        self._private = {}      # election ID -> {user ID: (None, block)}
+        self._registered = {}   # user ID -> (address, block)
+
+    def _add(self, event: dict):
+        self._events.append(event)
+        self._apply(event)
+
+    def _apply(self, event: dict):
+        args, block = event["args"], event["block"]
+        if event["event"] == "PublicVoteCast":
+            self._public.setdefault(args["electionId"], {})[args["userId"]] = (args["choice"], block)
+        elif event["event"] == "PrivateVoteCast":
+            self._private.setdefault(args["electionId"], {})[args["userId"]] = (None, block)
+        elif event["event"] == "UserRegistered":
+            self._registered[args["userId"]] = (args["user"], block)
+
+    def _load(self):
+        stored = read_json(self.path, default={})
+        if not stored or stored.get("startBlock") != self.start_block:
+            return
+        try:
+            still_there = self._block_hash(stored["block"]) == stored["blockHash"]
+        except Exception:
+            still_there = False
+        if not still_there:
+            # Cache from another chain (e.g. a restarted local node)
+            return
+        for event in stored["events"]:
+            self._add(event)
+        self._persisted = len(self._events)
+        self.cursor = stored["block"]
+        self._hashes[stored["block"]] = stored["blockHash"]
+
+    def _save(self):
+        """Persist the confirmed events when there are new ones"""
+        confirmed = self.confirmed_block
+        events = [event for event in self._events if event["block"] <= confirmed]
+        if len(events) == self._persisted or confirmed < self.start_block:
+            return
+        write_json_atomic(self.path, {
+            "contractAddress": self.contract.address,
+            "startBlock": self.start_block,
+            "block": confirmed,
+            "blockHash": self._block_hash(confirmed),
+            "events": events,
+        })
+        self._persisted = len(events)
+
+
+_followers = {}
+_followers_lock = threading.Lock()
+
+
+def get_chain_follower(contract, start_block: int = 0, **kwargs) -> ChainFollower:
+    """Process-wide follower for a contract, shared by every session"""
+    key = contract.address.lower()
+    with _followers_lock:
+        follower = _followers.get(key)
+        if follower is None or follower.start_block != start_block:
+            follower = ChainFollower(contract, start_block, **kwargs)
+            _followers[key] = follower
+        else:
+            # Use the caller's connection for any further reads
+            follower.contract = contract
+        return follower
@@ -0,0 +1,173 @@
+"""
+Result charts
+Bar charts for election results are built once per (election, tally) and
+reused on every rerun until the tally changes. Building and validating a
+Plotly figure is the expensive part of rendering a results panel. The
+lightweight mode returns a small Vega-Lite spec instead and never imports
+Plotly at all.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+# Figures kept per process (a few per election is plenty)
+CHART_CACHE_ENTRIES = 256
+
+# Set to 1 to default the dashboards to lightweight (Vega-Lite) charts
+LIGHTWEIGHT_CHARTS_ENV = "LIGHTWEIGHT_CHARTS"
+
+WINNER_COLOR = '#ff6b6b'
+PUBLIC_COLOR = '#4ecdc4'
+PRIVATE_COLOR = '#a78bfa'
+
+# Layout presets of the management and backup dashboards
+STYLE_MANAGEMENT = "management"
+STYLE_BACKUP = "backup"
+
+_figures = OrderedDict()
+_figures_lock = threading.Lock()
+
+
+def lightweight_charts_default() -> bool:
+    """Whether dashboards start in lightweight chart mode"""
+    return os.environ.get(LIGHTWEIGHT_CHARTS_ENV, "0") == "1"
+
+
+def _percentages(votes, total):
+    return [round(v / total * 100, 1) if total > 0 else 0 for v in votes]
+
+
+def _bar_colors(votes, bar_color):
+    max_votes = max(votes) if votes else 0
+    return [WINNER_COLOR if v == max_votes else bar_color for v in votes]
+
+
+def _build_figure(labels, votes, total, title, bar_color, style):
+    import plotly.graph_objects as go
+
+    percentages = _percentages(votes, total)
+    fig = go.Figure(data=[
+        go.Bar(
+            y=labels,
+            x=votes,
+            orientation='h',
+            marker=dict(
+                color=_bar_colors(votes, bar_color),
+                line=dict(color='rgba(0,0,0,0.1)', width=1)
+            ),
+            text=[f"{v} ({p:.1f}%)" for v, p in zip(votes, percentages)],
+            textposition='outside',
+            hovertemplate='<b>%{y}</b><br>Votes: %{x}<br><extra></extra>'
+        )
+    ])
+
+    if style == STYLE_MANAGEMENT:
+        fig.update_layout(
+            title=dict(
+                text=title,
+                font=dict(size=16, color='#333')
+            ),
+            xaxis_title="Number of Votes",
+            yaxis_title="",
+            height=max(300, len(labels) * 80),
+            margin=dict(l=20, r=100, t=60, b=40),
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            font=dict(size=12),
+            xaxis=dict(
+                showgrid=True,
+                gridcolor='rgba(0,0,0,0.05)'
+            ),
+            yaxis=dict(
+                showgrid=False,
+                categoryorder='total ascending'
+            )
+        )
+    else:
+        fig.update_layout(
+            title=title,
+            xaxis_title="Number of Votes",
+            yaxis_title="",
+            height=max(300, len(labels) * 60),
+            showlegend=False,
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            margin=dict(l=20, r=20, t=40, b=20),
+            font=dict(size=12)
+        )
+        fig.update_xaxes(gridcolor='rgba(128,128,128,0.2)')
+        fig.update_yaxes(gridcolor='rgba(128,128,128,0.2)')
+
+    return fig
+
+
+def results_figure(election_id, labels, votes, total, title, bar_color=PUBLIC_COLOR, style=STYLE_MANAGEMENT):
+    """
+    Horizontal Plotly bar chart of an election's results (cached per tally)
+
+    Args:
+        election_id: Election the chart belongs to (part of the cache key)
+        labels: Option labels, in choice order
+        votes: Votes per option, in choice order
+        total: Vote count percentages are relative to
+        title: Chart title
+        bar_color: Colour of non-winning bars
+        style: STYLE_MANAGEMENT or STYLE_BACKUP layout
+
+    The returned figure is shared - do not modify it.
+    """
+    labels = tuple(labels)
+    votes = tuple(int(v) for v in votes)
+    key = (election_id, labels, votes, total, title, bar_color, style)
+
+    with _figures_lock:
+        fig = _figures.get(key)
+        if fig is not None:
+            _figures.move_to_end(key)
+            return fig
+
+    fig = _build_figure(list(labels), list(votes), total, title, bar_color, style)
+
+    with _figures_lock:
+        _figures[key] = fig
+        while len(_figures) > CHART_CACHE_ENTRIES:
+            _figures.popitem(last=False)
+    return fig
+
+
+def results_spec(labels, votes, total, title, bar_color=PUBLIC_COLOR) -> dict:
+    """Vega-Lite spec of the same chart for lightweight mode (no Plotly)"""
+    votes = [int(v) for v in votes]
+    percentages = _percentages(votes, total)
+    colors = _bar_colors(votes, bar_color)
+    rows = [
+        {
+            'Option': label,
+            'Votes': v,
+            'Label': f"{v} ({p:.1f}%)",
+            'Color': color,
+            'Order': i,
+        }
+        for i, (label, v, p, color) in enumerate(zip(labels, votes, percentages, colors))
+    ]
+
+    encoding = {
+        'y': {'field': 'Option', 'type': 'nominal', 'sort': {'field': 'Order'}, 'title': None},
+        'x': {'field': 'Votes', 'type': 'quantitative', 'title': 'Number of Votes'},
+    }
+    return {
+        'title': title,
+        'data': {'values': rows},
+        'encoding': encoding,
+        'layer': [
+            {
+                'mark': {'type': 'bar'},
+                'encoding': {'color': {'field': 'Color', 'type': 'nominal', 'scale': None}},
+            },
+            {
+                'mark': {'type': 'text', 'align': 'left', 'dx': 4},
+                'encoding': {'text': {'field': 'Label'}},
+            },
+        ],
+    }
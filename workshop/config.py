@@ -0,0 +1,112 @@
+"""
+Vote configuration
+src/config/votes.json is the single source of truth for the workshop's votes,
+shared by the dashboards and the frontend (src/config/votesConfig.ts). It is
+parsed once per process and indexed so every lookup is a dict access.
+"""
+
+import functools
+import json
+import os
+from pathlib import Path
+
+from workshop.payoffs import compile_payoff_rule
+
+CONFIG_PATH_ENV = "VOTES_CONFIG_PATH"
+DEFAULT_CONFIG_PATH = Path(__file__).resolve().parent.parent / "src" / "config" / "votes.json"
+
+# Message a voter signs for a private vote (see src/hooks/usePrivateVoting.ts)
+SIGNATURE_TEMPLATE = "I vote for {}"
+
+
+def signature_message(option_text: str) -> str:
+    """Message signed by a voter choosing an option"""
+    return SIGNATURE_TEMPLATE.format(option_text)
+
+
+class VotesConfig:
+    """Parsed votes.json with lookup indexes"""
+
+    def __init__(self, data: dict):
+        self.contract_address = data["contractAddress"]
+        self.votes = data["votes"]
+
+        self.by_key = {}
+        self.by_election_id = {}
+        self._option_ids = {}
+        self._option_codes = {}
+        self._signature_options = {}
+        self._signature_choices = {}
+        self._payoff_rules = {}
+
+        for vote in self.votes:
+            vote_key = vote["voteKey"]
+            election_id = vote["electionId"]
+            if vote_key in self.by_key or election_id in self.by_election_id:
+                raise ValueError(f"Duplicate vote {vote_key} / election {election_id} in votes config")
+
+            self.by_key[vote_key] = vote
+            self.by_election_id[election_id] = vote
+
+            messages = [signature_message(option["text"]) for option in vote["options"]]
+            self._option_ids[vote_key] = {option["text"]: option["id"] for option in vote["options"]}
+            self._option_codes[vote_key] = {
+                option["text"]: option["code"] for option in vote["options"] if "code" in option
+            }
+            self._signature_options[election_id] = messages
+            rule = compile_payoff_rule(vote)
+            if rule is not None:
+                self._payoff_rules[vote_key] = rule
+            self._signature_choices[election_id] = {
+                message: option["id"] for message, option in zip(messages, vote["options"])
+            }
+
+    def vote(self, vote_key: str) -> dict:
+        """Vote config by app vote key (e.g. 'vote1a')"""
+        return self.by_key[vote_key]
+
+    def election(self, election_id: int) -> dict:
+        """Vote config by contract election ID"""
+        return self.by_election_id[election_id]
+
+    def option_id(self, vote_key: str, option_text: str):
+        """1-indexed choice for an option text, or None if it is not an option"""
+        return self._option_ids[vote_key].get(option_text)
+
+    def option_codes(self, vote_key: str) -> dict:
+        """Option text -> short code (district / initiative letter) for a vote"""
+        return self._option_codes[vote_key]
+
+    @property
+    def scored_vote_keys(self) -> list:
+        """Keys of the votes with a payoff rule, in config order"""
+        return list(self._payoff_rules)
+
+    def payoff_rule(self, vote_key: str):
+        """Compiled payoff rule of a vote (workshop.payoffs.PayoffRule), or None if it is not scored"""
+        return self._payoff_rules.get(vote_key)
+
+    def option_labels(self, election_id: int) -> list:
+        """Short option labels for charts, in choice order"""
+        return [option.get("label", option["text"]) for option in self.election(election_id)["options"]]
+
+    def signature_options(self, election_id: int) -> list:
+        """Messages voters sign for each option, in choice order"""
+        return self._signature_options[election_id]
+
+    def signature_choice(self, election_id: int, message: str):
+        """1-indexed choice for a signed message, or None if it matches no option"""
+        return self._signature_choices[election_id].get(message)
+
+
+@functools.lru_cache(maxsize=None)
+def load_votes_config(path: str = None) -> VotesConfig:
+    """
+    Parse and index the votes config (cached per process)
+
+    Args:
+        path: Config file, defaults to $VOTES_CONFIG_PATH or src/config/votes.json
+    """
+    path = path or os.environ.get(CONFIG_PATH_ENV, DEFAULT_CONFIG_PATH)
+    with open(path, "r", encoding="utf-8") as f:
+        return VotesConfig(json.load(f))
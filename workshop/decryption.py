@@ -0,0 +1,132 @@
+"""
+Private vote decryption
+Decrypts NaCl-box encrypted vote signatures (format written by
+src/utils/encryption.ts) and recovers which option the voter signed.
+"""
+
+import base64
+
+from workshop.config import signature_message
+
+# nacl and eth_account are imported on first use - they are only needed once
+# votes are decrypted, not to draw the dashboards
+
+
+def get_vote_signature_options(vote_config):
+    """Generate signature verification options from vote config"""
+    return [signature_message(opt['text']) for opt in vote_config['options']]
+
+
+def extract_encrypted_signature(tx_input_data):
+    """Extract encrypted signature from transaction input data"""
+    hex_data = tx_input_data.hex() if isinstance(tx_input_data, bytes) else tx_input_data
+    if hex_data.startswith('0x'):
+        hex_data = hex_data[2:]
+    
+    # Parse transaction format:
+    # Function selector: 4 bytes (8 hex chars)
+    # Election ID: 32 bytes (64 hex chars)
+    # Offset: 32 bytes (64 hex chars)
+    # Length: 32 bytes at position 136-200
+    length_hex = hex_data[136:200]
+    length = int(length_hex, 16)
+    
+    # Encrypted signature starts at position 200
+    encrypted_hex = hex_data[200:200 + (length * 2)]
+    
+    # Convert hex to bytes
+    encrypted_bytes = bytes.fromhex(encrypted_hex)
+    
+    # Convert to base64
+    return base64.b64encode(encrypted_bytes).decode('utf-8')
+
+
+def decrypt_signature(encrypted_base64, private_key_base64):
+    """Decrypt an encrypted signature using the private key"""
+    try:
+        # Decode private key
+        private_key_bytes = base64.b64decode(private_key_base64)
+        
+        if len(private_key_bytes) != 32:
+            raise ValueError(f"Invalid private key length: {len(private_key_bytes)} bytes (expected 32)")
+        
+        # Decode encrypted message
+        full_message = base64.b64decode(encrypted_base64)
+        
+        # Extract components
+        ephemeral_public_key = full_message[0:32]
+        nonce = full_message[32:56]
+        encrypted = full_message[56:]
+        
+        # Create NaCl box for decryption
+        import nacl.public
+        private_key = nacl.public.PrivateKey(private_key_bytes)
+        public_key = nacl.public.PublicKey(ephemeral_public_key)
+        box = nacl.public.Box(private_key, public_key)
+        
+        # Decrypt
+        decrypted = box.decrypt(encrypted, nonce)
+        
+        # Convert to string (should be hex signature)
+        signature = decrypted.decode('utf-8')
+        
+        return signature
+    except Exception as e:
+        raise Exception(f"Decryption error: {str(e)}")
+
+
+def verify_vote_signature(signature, voter_address, options):
+    """Verify which option a signature corresponds to"""
+    from eth_account import Account
+    from eth_account.messages import encode_defunct
+    
+    try:
+        # Try each option
+        for i, message in enumerate(options):
+            try:
+                # Encode the message
+                encoded_message = encode_defunct(text=message)
+                
+                # Recover the address from the signature
+                recovered_address = Account.recover_message(encoded_message, signature=signature)
+                
+                # Check if it matches the voter address
+                if recovered_address.lower() == voter_address.lower():
+                    return {
+                        'optionIndex': i,
+                        'optionText': message,
+                        'choice': i + 1  # 1-indexed for display
+                    }
+            except Exception:
+                # This option doesn't match, continue
+                continue
+        
+        # No match found
+        return None
+    except Exception as e:
+        raise Exception(f"Signature verification error: {str(e)}")
+
+
+def decrypt_and_verify_vote(encrypted_bytes, voter_address, private_key_base64, options):
+    """Complete flow: Decrypt and verify a vote from contract bytes"""
+    try:
+        # encrypted_bytes is already the encrypted signature from contract (bytes)
+        # Convert to base64 if needed
+        if isinstance(encrypted_bytes, bytes):
+            encrypted_signature = base64.b64encode(encrypted_bytes).decode('utf-8')
+        else:
+            encrypted_signature = encrypted_bytes
+        
+        # Step 1: Decrypt signature
+        decrypted_signature = decrypt_signature(encrypted_signature, private_key_base64)
+        
+        # Step 2: Verify which option was voted for
+        vote = verify_vote_signature(decrypted_signature, voter_address, options)
+        
+        return {
+            'encryptedSignature': encrypted_signature,
+            'decryptedSignature': decrypted_signature,
+            'vote': vote
+        }
+    except Exception as e:
+        raise Exception(f"Failed to decrypt and verify vote: {str(e)}")
@@ -0,0 +1,284 @@
+"""
+Background decryption jobs
+Private votes are decrypted by one background thread per election instead of
+inside the Streamlit script, so reruns, navigation and closed tabs no longer
+throw work away. Decrypted choices are shared by every session but only kept
+in memory: the checkpoint on disk records progress (the ciphertext hash of
+every decrypted vote, and the votes that failed), and a restarted job
+re-derives the choices through the verified vote cache
+(workshop/vote_cache.py), so a ciphertext is not decrypted again as long as
+that cache's disk tier is on.
+
+Set DECRYPTION_CHECKPOINT_CHOICES=1 to also store the decrypted choices in
+the checkpoint, in plaintext, so a restarted job resumes from the last
+processed vote without re-deriving them.
+"""
+
+import hashlib
+import os
+import threading
+import time
+
+from workshop.addresses import get_address_directory
+from workshop.rpc_scheduler import PRIORITY_BACKGROUND, bind_priority
+from workshop.storage import contract_cache_dir, read_json, write_json_atomic
+from workshop.vote_cache import cached_decrypt_and_verify_vote
+
+CHECKPOINT_VERSION = 2
+
+# Set to 1 to keep decrypted choices (plaintext) in the checkpoint
+CHECKPOINT_CHOICES_ENV = "DECRYPTION_CHECKPOINT_CHOICES"
+
+# Votes requested per getPrivateVotesBatch call
+FETCH_BATCH_SIZE = 100
+
+# Write a checkpoint at least this often while decrypting
+CHECKPOINT_EVERY_VOTES = 25
+CHECKPOINT_EVERY_SECONDS = 2.0
+
+STATE_IDLE = "idle"
+STATE_RUNNING = "running"
+STATE_DONE = "done"
+STATE_ERROR = "error"
+
+
+def _fingerprint(value: str) -> str:
+    """Short stable hash used to detect a changed key or option list"""
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()[:16]
+
+
+def _checkpoint_choices() -> bool:
+    return os.environ.get(CHECKPOINT_CHOICES_ENV, "0") == "1"
+
+
+def ciphertext_hash(encrypted_sig) -> str:
+    """Hash identifying one encrypted vote"""
+    if isinstance(encrypted_sig, str):
+        encrypted_sig = encrypted_sig.encode("utf-8")
+    return hashlib.sha256(bytes(encrypted_sig)).hexdigest()
+
+
+class DecryptionJob:
+    """Resumable decryption of every private vote in one election"""
+
+    def __init__(self, contract, election_id: int, signature_options):
+        self.contract = contract
+        self.election_id = election_id
+        self.signature_options = list(signature_options)
+        self.path = contract_cache_dir(contract.address, "decryption") / f"election_{election_id}.json"
+
+        self._lock = threading.Lock()
+        self._thread = None
+        self.state = STATE_IDLE
+        self.error = None
+        self.total = 0
+
+        self._reset()
+        stored = read_json(self.path)
+        if stored and stored.get("version") == CHECKPOINT_VERSION \
+                and stored.get("optionsHash") == self._options_hash():
+            self.key_fingerprint = stored["keyFingerprint"]
+            self.total = stored.get("total", 0)
+            self.failed = {int(user_id): entry for user_id, entry in stored["failed"].items()}
+            if "votes" in stored and _checkpoint_choices():
+                self.votes = {int(user_id): vote for user_id, vote in stored["votes"].items()}
+                self.next_index = stored["nextIndex"]
+                if self.next_index and self.next_index >= self.total:
+                    self.state = STATE_DONE
+            # Otherwise the next run starts over: votes that failed are
+            # skipped and the rest are re-derived through the vote cache
+
+    def _options_hash(self) -> str:
+        return _fingerprint("\n".join(self.signature_options))
+
+    def _reset(self):
+        self.key_fingerprint = None
+        self.next_index = 0
+        self.votes = {}   # user_id -> {choice, optionText, ciphertextHash}
+        self.failed = {}  # user_id -> {error, ciphertextHash}
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, decryption_key: str) -> bool:
+        """
+        Start (or resume) decrypting in the background
+
+        Returns:
+            False if the job is already running
+        """
+        with self._lock:
+            if self.is_running:
+                return False
+
+            key_fingerprint = _fingerprint(decryption_key)
+            if self.key_fingerprint not in (None, key_fingerprint):
+                # Results from a different key are not trustworthy - start over
+                self._reset()
+            self.key_fingerprint = key_fingerprint
+
+            self.state = STATE_RUNNING
+            self.error = None
+            self._thread = threading.Thread(
+                target=bind_priority(self._run, PRIORITY_BACKGROUND),
+                args=(decryption_key,),
+                name=f"decrypt-election-{self.election_id}",
+                daemon=True,
+            )
+            self._thread.start()
+            return True
+
+    def wait(self, timeout: float = None, progress=None, poll_interval: float = 0.2) -> bool:
+        """
+        Block until the job stops
+
+        Args:
+            timeout: Give up after this many seconds (None = wait forever)
+            progress: Optional callback progress(done, total) for UI updates
+
+        Returns:
+            True if the job is no longer running
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.is_running:
+            if progress:
+                progress(self.next_index, self.total)
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            self._thread.join(poll_interval)
+        if progress:
+            progress(self.next_index, self.total)
+        return True
+
+    def status(self) -> dict:
+        """Progress visible to every session"""
+        with self._lock:
+            return {
+                "state": self.state,
+                "done": self.next_index,
+                "total": self.total,
+                "decrypted": len(self.votes),
+                "failed": len(self.failed),
+                "error": self.error,
+            }
+
+    def results(self) -> dict:
+        """Decrypted votes as user_id -> {'choice', 'optionText'}"""
+        with self._lock:
+            return {
+                user_id: {"choice": vote["choice"], "optionText": vote["optionText"]}
+                for user_id, vote in self.votes.items()
+            }
+
+    def failures(self) -> dict:
+        """Votes that could not be decrypted as user_id -> error message"""
+        with self._lock:
+            return {user_id: entry["error"] for user_id, entry in self.failed.items()}
+
+    def _run(self, decryption_key: str):
+        try:
+            self._decrypt_all(decryption_key)
+            with self._lock:
+                self.state = STATE_DONE
+        except Exception as e:
+            with self._lock:
+                self.state = STATE_ERROR
+                self.error = str(e)
+        finally:
+            with self._lock:
+                if self.state == STATE_RUNNING:
+                    self.state = STATE_ERROR
+                    self.error = "Interrupted"
+            self._checkpoint()
+
+    def _decrypt_all(self, decryption_key: str):
+        directory = get_address_directory(self.contract)
+        since_checkpoint = 0
+        last_checkpoint = time.monotonic()
+
+        while True:
+            user_ids, encrypted_sigs, total = self.contract.functions.getPrivateVotesBatch(
+                self.election_id, self.next_index, FETCH_BATCH_SIZE
+            ).call()
+            with self._lock:
+                self.total = int(total)
+            if not user_ids:
+                return
+
+            addresses = directory.lookup(user_ids)
+
+            for user_id, encrypted_sig in zip(user_ids, encrypted_sigs):
+                user_id = int(user_id)
+                digest = ciphertext_hash(encrypted_sig)
+
+                already_done = self.votes.get(user_id) or self.failed.get(user_id)
+                if not (already_done and already_done["ciphertextHash"] == digest):
+                    if user_id not in addresses:
+                        # Transient (RPC) failure - stop here so a restart retries this vote
+                        raise RuntimeError(f"Could not fetch address for user #{user_id}")
+                    self._decrypt_one(user_id, encrypted_sig, digest, addresses[user_id], decryption_key)
+
+                with self._lock:
+                    self.next_index += 1
+
+                since_checkpoint += 1
+                if since_checkpoint >= CHECKPOINT_EVERY_VOTES \
+                        or time.monotonic() - last_checkpoint >= CHECKPOINT_EVERY_SECONDS:
+                    self._checkpoint()
+                    since_checkpoint = 0
+                    last_checkpoint = time.monotonic()
+
+    def _decrypt_one(self, user_id, encrypted_sig, digest, voter_address, decryption_key):
+        try:
+            result = cached_decrypt_and_verify_vote(encrypted_sig, voter_address, decryption_key, self.signature_options)
+            error = None if result["vote"] else "Signature verification failed"
+        except Exception as e:
+            result, error = None, str(e)
+
+        with self._lock:
+            if error is None:
+                self.votes[user_id] = {
+                    "choice": result["vote"]["choice"],
+                    "optionText": result["vote"]["optionText"],
+                    "ciphertextHash": digest,
+                }
+                self.failed.pop(user_id, None)
+            else:
+                self.failed[user_id] = {"error": error, "ciphertextHash": digest}
+
+    def _checkpoint(self):
+        """Write progress to disk - decrypted choices only with DECRYPTION_CHECKPOINT_CHOICES=1"""
+        with self._lock:
+            payload = {
+                "version": CHECKPOINT_VERSION,
+                "contractAddress": self.contract.address,
+                "electionId": self.election_id,
+                "optionsHash": self._options_hash(),
+                "keyFingerprint": self.key_fingerprint,
+                "nextIndex": self.next_index,
+                "total": self.total,
+                "decrypted": {str(user_id): vote["ciphertextHash"] for user_id, vote in self.votes.items()},
+                "failed": {str(user_id): entry for user_id, entry in self.failed.items()},
+            }
+            if _checkpoint_choices():
+                payload["votes"] = {str(user_id): vote for user_id, vote in self.votes.items()}
+        write_json_atomic(self.path, payload)
+
+
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+
+def get_decryption_job(contract, election_id: int, signature_options) -> DecryptionJob:
+    """Process-wide decryption job for an election, shared by every session"""
+    key = (contract.address.lower(), election_id)
+    with _jobs_lock:
+        job = _jobs.get(key)
+        if job is None or job.signature_options != list(signature_options):
+            job = DecryptionJob(contract, election_id, signature_options)
+            _jobs[key] = job
+        else:
+            # Use the caller's connection for any further fetches
+            job.contract = contract
+        return job
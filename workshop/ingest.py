@@ -0,0 +1,250 @@
+"""
+Vote ingestion
+Vote exports are read in fixed-size chunks with explicit dtypes, so memory
+depends on the number of distinct voters rather than the size of the file.
+Choices are validated against a categorical built once from the option
+texts, bad rows are reported with their line numbers, and repeated User IDs
+are resolved as they stream in (last vote wins, or every vote of that user
+is rejected).
+
+Votes can also be read straight from the contract into the same compact
+table: closed elections come from their snapshot, open public elections
+from getAllPublicVotes and open private elections from the shared
+decryption job, so no CSV round trip is needed.
+"""
+
+import numpy as np
+import pandas as pd
+
+from workshop.chain import STATUS_OPEN
+from workshop.decryption_jobs import STATE_ERROR, get_decryption_job
+from workshop.snapshots import get_or_build_snapshot
+
+# Rows parsed per chunk
+CSV_CHUNK_ROWS = 50_000
+
+REQUIRED_COLUMNS = ['User ID', 'Choice']
+
+# How to handle a User ID that appears more than once
+DUPLICATES_LAST = "last"
+DUPLICATES_REJECT = "reject"
+
+# Issues kept for display (counts always cover every row)
+MAX_REPORTED_ISSUES = 50
+
+_MAX_USER_ID = np.iinfo(np.uint32).max
+
+
+class IngestReport:
+    """Row counts and line-numbered problems found while reading a vote CSV"""
+
+    def __init__(self):
+        self.rows = 0
+        self.accepted = 0
+        self.invalid = 0
+        self.duplicates = 0
+        self.issues = []  # (line, message), first MAX_REPORTED_ISSUES only
+
+    def add(self, line: int, message: str):
+        if len(self.issues) < MAX_REPORTED_ISSUES:
+            self.issues.append((int(line), message))
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """Reported issues as a 'Line' / 'Problem' table"""
+        return pd.DataFrame(self.issues, columns=['Line', 'Problem'])
+
+
+def _keep_last(user_ids, codes, lines):
+    """Rows of the last occurrence of each user ID, in file order"""
+    _, reversed_first = np.unique(user_ids[::-1], return_index=True)
+    keep = np.sort(len(user_ids) - 1 - reversed_first)
+    return user_ids[keep], codes[keep], lines[keep]
+
+
+def read_vote_csv(source, option_texts, duplicates: str = DUPLICATES_LAST,
+                  chunk_rows: int = CSV_CHUNK_ROWS):
+    """
+    Stream a 'User ID,Choice[,...]' vote CSV into a compact vote table
+
+    Line numbers count the header as line 1 and assume one line per row.
+
+    Args:
+        source: Path or file-like object
+        option_texts: Valid choices, in choice order
+        duplicates: DUPLICATES_LAST or DUPLICATES_REJECT
+        chunk_rows: Rows parsed per chunk
+
+    Returns:
+        Tuple of (votes, report): votes has a uint32 'User ID' and a
+        categorical 'Choice' over option_texts, one row per voter
+
+    Raises:
+        ValueError: If a required column is missing or duplicates is unknown
+    """
+    if duplicates not in (DUPLICATES_LAST, DUPLICATES_REJECT):
+        raise ValueError(f"Unknown duplicates policy: {duplicates}")
+
+    choices = pd.CategoricalDtype(categories=list(option_texts))
+    report = IngestReport()
+
+    user_ids = np.empty(0, dtype=np.uint32)
+    codes = np.empty(0, dtype=np.int8)
+    lines = np.empty(0, dtype=np.int64)
+    rejected = np.empty(0, dtype=np.uint32)
+
+    reader = pd.read_csv(
+        source,
+        usecols=lambda column: column in REQUIRED_COLUMNS,
+        dtype={'User ID': 'string', 'Choice': 'string'},
+        skip_blank_lines=False,
+        chunksize=chunk_rows,
+    )
+    with reader:
+        for chunk in reader:
+            missing = [column for column in REQUIRED_COLUMNS if column not in chunk.columns]
+            if missing:
+                raise ValueError(f"Missing required column: {missing[0]}")
+
+            # Blank lines keep their place in the numbering but are not rows
+            chunk = chunk.dropna(how='all')
+            chunk_lines = chunk.index.to_numpy(dtype=np.int64) + 2
+            report.rows += len(chunk)
+
+            raw_ids = chunk['User ID'].str.strip()
+            numeric_ids = pd.to_numeric(raw_ids, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+            valid_id = (numeric_ids >= 1) & (numeric_ids <= _MAX_USER_ID) & (numeric_ids == np.floor(numeric_ids))
+
+            chunk_codes = chunk['Choice'].str.strip().astype(choices).cat.codes.to_numpy()
+            valid_choice = chunk_codes >= 0
+
+            bad = ~(valid_id & valid_choice)
+            if bad.any():
+                report.invalid += int(bad.sum())
+                for line, user_id, choice, id_ok in zip(
+                    chunk_lines[bad], raw_ids[bad], chunk['Choice'][bad], valid_id[bad]
+                ):
+                    if len(report.issues) >= MAX_REPORTED_ISSUES:
+                        break
+                    if not id_ok:
+                        report.add(line, f"Invalid User ID {user_id!r}" if user_id is not pd.NA else "Missing User ID")
+                    else:
+                        report.add(line, f"Invalid choice {choice!r}" if choice is not pd.NA else "Missing choice")
+
+            good = ~bad
+            chunk_ids = numeric_ids[good].astype(np.uint32)
+            chunk_codes = chunk_codes[good].astype(np.int8)
+            chunk_lines = chunk_lines[good]
+
+            # Resolve repeats against everything read so far, keeping memory
+            # proportional to the number of distinct voters
+            all_ids = np.concatenate([user_ids, chunk_ids])
+            all_codes = np.concatenate([codes, chunk_codes])
+            all_lines = np.concatenate([lines, chunk_lines])
+            user_ids, codes, lines = _keep_last(all_ids, all_codes, all_lines)
+
+            dropped = np.ones(len(all_ids), dtype=bool)
+            dropped[np.isin(all_lines, lines)] = False
+            if dropped.any():
+                report.duplicates += int(dropped.sum())
+                for line, user_id in zip(all_lines[dropped], all_ids[dropped]):
+                    if len(report.issues) >= MAX_REPORTED_ISSUES:
+                        break
+                    if duplicates == DUPLICATES_LAST:
+                        report.add(line, f"User #{user_id} voted again later (last vote wins)")
+                    else:
+                        report.add(line, f"User #{user_id} voted more than once (rejected)")
+                if duplicates == DUPLICATES_REJECT:
+                    rejected = np.union1d(rejected, all_ids[dropped])
+
+    if duplicates == DUPLICATES_REJECT and len(rejected):
+        keep = ~np.isin(user_ids, rejected)
+        for line, user_id in zip(lines[~keep], user_ids[~keep]):
+            report.add(line, f"User #{user_id} voted more than once (rejected)")
+        report.duplicates += int((~keep).sum())
+        user_ids, codes = user_ids[keep], codes[keep]
+
+    report.accepted = len(user_ids)
+    votes = pd.DataFrame({
+        'User ID': user_ids,
+        'Choice': pd.Categorical.from_codes(codes, dtype=choices),
+    })
+    return votes, report
+
+
+def votes_from_choices(user_ids, choices, option_texts) -> pd.DataFrame:
+    """
+    Compact vote table from on-chain (user ID, 1-indexed choice) pairs
+
+    Choices outside the option range are dropped. Rows are sorted by User ID.
+    """
+    user_ids = np.asarray(user_ids, dtype=np.uint32)
+    codes = np.asarray(choices, dtype=np.int64) - 1
+    valid = (codes >= 0) & (codes < len(option_texts))
+    order = np.argsort(user_ids[valid], kind="stable")
+    return pd.DataFrame({
+        'User ID': user_ids[valid][order],
+        'Choice': pd.Categorical.from_codes(
+            codes[valid][order].astype(np.int8), dtype=pd.CategoricalDtype(categories=list(option_texts))
+        ),
+    })
+
+
+def read_chain_votes(contract, vote_config: dict, signature_options, decryption_key=None, progress=None):
+    """
+    Read one election's votes from the contract into a compact vote table
+
+    Args:
+        contract: Web3 contract object
+        vote_config: Vote config of the election
+        signature_options: Messages voters sign, in choice order
+        decryption_key: Base64 private key (required for private elections)
+        progress: Optional callback progress(done, total) while decrypting
+
+    Returns:
+        Tuple of (votes, info): votes as returned by votes_from_choices,
+        info a dict with 'status', 'source' ('snapshot' or 'live'),
+        'voteCount' and 'failed' (votes that could not be decrypted)
+
+    Raises:
+        ValueError: If a private election is read without a decryption key
+        RuntimeError: If decryption stopped early (e.g. an RPC failure)
+    """
+    election_id = vote_config['electionId']
+    option_texts = [option['text'] for option in vote_config['options']]
+    is_private = vote_config['type'] == 'private'
+    if is_private and not decryption_key:
+        raise ValueError(f"Decryption key required to read private election {election_id}")
+
+    election = contract.functions.getElection(election_id).call()
+    status = "Open" if election[1] == STATUS_OPEN else "Closed"
+
+    if status == "Closed":
+        # Built once per close (usually right after closeElection) and shared
+        snapshot = get_or_build_snapshot(
+            contract, election_id, election[4], len(option_texts),
+            decryption_key=decryption_key,
+            signature_options=signature_options if is_private else None,
+        )
+        pairs = snapshot['votes']
+        votes = votes_from_choices([pair[0] for pair in pairs], [pair[1] for pair in pairs], option_texts)
+        return votes, {
+            'status': status, 'source': 'snapshot', 'voteCount': snapshot['voteCount'], 'failed': len(snapshot['failed']),
+        }
+
+    if not is_private:
+        user_ids, choices = contract.functions.getAllPublicVotes(election_id).call()
+        votes = votes_from_choices(user_ids, choices, option_texts)
+        return votes, {'status': status, 'source': 'live', 'voteCount': len(user_ids), 'failed': 0}
+
+    # Only votes cast since the job last ran are decrypted
+    job = get_decryption_job(contract, election_id, signature_options)
+    job.start(decryption_key)
+    job.wait(progress=progress)
+    job_status = job.status()
+    if job_status['state'] == STATE_ERROR:
+        raise RuntimeError(f"Decryption stopped at vote {job_status['done'] + 1}: {job_status['error']}")
+
+    results = job.results()
+    votes = votes_from_choices(list(results), [vote['choice'] for vote in results.values()], option_texts)
+    return votes, {'status': status, 'source': 'live', 'voteCount': job_status['total'], 'failed': job_status['failed']}
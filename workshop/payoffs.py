@@ -0,0 +1,189 @@
+"""
+Payoff rules
+The points rules of the scored votes are declared in the vote config (the
+"payoff" object of a vote in votes.json) and compiled once into NumPy arrays,
+so the points dashboard (one real vote), the what-if panel and the payoff
+simulator (millions of sampled votes at once) evaluate exactly the same
+rules. Adding a scored vote means adding config, not code.
+
+A rule pays participants by their group ("district" or "committee"):
+    residentPoints: each vote for an option pays every participant whose
+        group has the option's code (e.g. residents of District A)
+    voterPoints: option code -> {group or "*": points} paid to each voter
+        for their own vote
+    thresholds: options reaching a share of the votes (percent) pay their
+        voters a voterBonus, and multiply the resident points of every other
+        option by otherOptionsMultiplier; "options" limits which option codes
+        qualify (default all)
+
+Evaluation accepts counts with any number of leading batch dimensions.
+"""
+
+import numpy as np
+
+from workshop.tables import COMMITTEES, DISTRICTS, NO_CODE
+
+# Group kinds -> labels of the participant codes they are scored by
+GROUP_LABELS = {
+    "district": DISTRICTS,
+    "committee": COMMITTEES,
+}
+
+# Wildcard group in voterPoints
+ANY_GROUP = "*"
+
+
+def _share(counts, total_votes):
+    """Percentage of the votes per option (0 where nobody voted)"""
+    counts = np.asarray(counts)
+    total_votes = np.asarray(total_votes)[..., np.newaxis]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(total_votes > 0, counts / total_votes * 100, 0)
+
+
+class PayoffRule:
+    """A vote's payoff rule compiled to arrays over (option, group)"""
+
+    def __init__(self, spec: dict, option_codes: list):
+        """
+        Args:
+            spec: The vote's "payoff" config
+            option_codes: Option codes in choice order (e.g. ['A', 'B', 'C', 'D'])
+
+        Raises:
+            ValueError: On an unknown group kind, option code or group label
+        """
+        groups = spec.get("groups")
+        if groups not in GROUP_LABELS:
+            raise ValueError(f"Unknown payoff groups: {groups!r} (choose from {', '.join(GROUP_LABELS)})")
+        self.groups = groups
+        self.group_labels = GROUP_LABELS[groups]
+        self.option_codes = list(option_codes)
+        num_options, num_groups = len(self.option_codes), len(self.group_labels)
+
+        # Residents: [option, group] is 1 where the group has the option's code
+        self.resident_points = int(spec.get("residentPoints", 0))
+        self.residents = np.array(
+            [[code == label for label in self.group_labels] for code in self.option_codes], dtype=np.int64
+        ).reshape(num_options, num_groups)
+
+        # Voters: points by [option voted, voter's group]
+        self.voter_points = np.zeros((num_options, num_groups), dtype=np.int64)
+        for code, points in spec.get("voterPoints", {}).items():
+            option = self._option(code)
+            unknown = set(points) - set(self.group_labels) - {ANY_GROUP}
+            if unknown:
+                raise ValueError(f"Unknown {groups} in payoff rule: {', '.join(sorted(unknown))}")
+            self.voter_points[option, :] = points.get(ANY_GROUP, 0)
+            for group, value in points.items():
+                if group != ANY_GROUP:
+                    self.voter_points[option, self.group_labels.index(group)] = value
+
+        self.thresholds = [dict(threshold) for threshold in spec.get("thresholds", [])]
+        self.threshold_shares = np.array([float(t["share"]) for t in self.thresholds])
+        self.threshold_options = np.array(
+            [[code in t.get("options", self.option_codes) for code in self.option_codes] for t in self.thresholds],
+            dtype=bool,
+        ).reshape(len(self.thresholds), num_options)
+        for t in self.thresholds:
+            for code in t.get("options", []):
+                self._option(code)
+        self.threshold_bonus = np.array([int(t.get("voterBonus", 0)) for t in self.thresholds], dtype=np.int64)
+        self.threshold_multiplier = np.array(
+            [int(t.get("otherOptionsMultiplier", 1)) for t in self.thresholds], dtype=np.int64
+        )
+
+    def _option(self, code) -> int:
+        if code not in self.option_codes:
+            raise ValueError(f"Unknown option code in payoff rule: {code!r}")
+        return self.option_codes.index(code)
+
+    @property
+    def has_thresholds(self) -> bool:
+        return len(self.thresholds) > 0
+
+    @property
+    def default_share(self):
+        """Share of the first threshold (the one the what-if panel and simulator vary), or None"""
+        return self.thresholds[0]["share"] if self.thresholds else None
+
+    def group_codes(self, participants, vote_key: str) -> np.ndarray:
+        """Group code of every participant of a ParticipantTable"""
+        if self.groups == "district":
+            return participants.district_codes(vote_key)
+        return participants.committee_codes()
+
+    def favourite_options(self) -> np.ndarray:
+        """Option paying each group the most (one vote's worth, ties to the first option)"""
+        return np.argmax(self.resident_points * self.residents + self.voter_points, axis=0)
+
+    def focal_option(self) -> int:
+        """Option whose worst-paid group gets the most (the natural coordination point)"""
+        return int(np.argmax((self.resident_points * self.residents + self.voter_points).min(axis=1)))
+
+    def describe(self, threshold: dict, share=None) -> str:
+        """A threshold's description with its share (or an override) and bonus filled in"""
+        values = dict(threshold, share=threshold["share"] if share is None else share)
+        return threshold.get("description", threshold["name"]).format(**values)
+
+    def evaluate(self, counts, total_votes, groups, voted, share=None) -> dict:
+        """
+        Points of every participant
+
+        Args:
+            counts: Votes per option, shape (..., options)
+            total_votes: Votes cast, shape (...) - shares are taken of this
+            groups: Group code per participant, shape (..., participants)
+            voted: Option code each participant voted for (NO_CODE if they
+                did not), shape (..., participants)
+            share: Overrides the share of every threshold (percent)
+
+        Returns:
+            Dict with 'hits' (bool, shape (..., thresholds, options): options
+            that reached each threshold), 'base', 'bonus' and 'points'
+            (per participant)
+        """
+        counts = np.asarray(counts)
+        groups = np.asarray(groups).astype(np.intp)
+        voted = np.asarray(voted)
+        shares = self.threshold_shares if share is None else np.full(len(self.thresholds), float(share))
+
+        option_share = _share(counts, total_votes)[..., np.newaxis, :]
+        hits = self.threshold_options & (option_share >= shares[:, np.newaxis])
+
+        # Residents of every option that missed a hit threshold get the multiplier
+        multiplier = np.ones(counts.shape, dtype=np.int64)
+        for t in range(len(self.thresholds)):
+            hit = hits[..., t, :]
+            raised = hit.any(axis=-1, keepdims=True) & ~hit
+            multiplier = multiplier * np.where(raised, self.threshold_multiplier[t], 1)
+        per_group = (self.resident_points * multiplier * counts) @ self.residents
+        base = np.take_along_axis(per_group, groups, axis=-1)
+
+        # Voters are paid for their own option, plus the bonus of a threshold it hit
+        cast = voted != NO_CODE
+        option = np.maximum(voted, 0).astype(np.intp)
+        base = base + np.where(cast, self.voter_points[option, groups], 0)
+        option_bonus = (hits * self.threshold_bonus[:, np.newaxis]).sum(axis=-2)
+        bonus = np.where(cast, np.take_along_axis(option_bonus, option, axis=-1), 0)
+
+        return {'hits': hits, 'base': base, 'bonus': bonus, 'points': base + bonus}
+
+
+def compile_payoff_rule(vote: dict):
+    """
+    Compile a vote config's payoff rule
+
+    Returns:
+        PayoffRule, or None if the vote is not scored
+
+    Raises:
+        ValueError: On an invalid rule or a scored vote whose options lack codes
+    """
+    spec = vote.get("payoff")
+    if spec is None:
+        return None
+    codes = [option.get("code") for option in vote["options"]]
+    if None in codes:
+        raise ValueError(f"Vote {vote['voteKey']} has a payoff rule but options without a code")
+    return PayoffRule(spec, codes)
@@ -0,0 +1,88 @@
+"""
+Leaderboard ranking
+Top-k selection uses a partial partition instead of sorting the whole
+leaderboard, and ties are broken with a local seeded RNG (never the global
+`random` state), so the same scores and seed always produce the same
+winners. Every tie-break is recorded so the draw can be audited afterwards.
+"""
+
+import random
+
+import numpy as np
+
+
+def select_top_k(scores, ids, k: int, seed: str) -> dict:
+    """
+    Pick the k highest scores, shuffling tied groups with a seeded RNG
+
+    Tied groups are ordered by ID before shuffling, so the result does not
+    depend on the order of the input rows. Groups are processed from the
+    highest score down, each consuming the same RNG in turn.
+
+    Args:
+        scores: Score per row
+        ids: Stable identifier per row (e.g. user IDs)
+        k: Number of winners
+        seed: Tie-break seed
+
+    Returns:
+        Dict with 'positions' (row positions of the winners, best first) and
+        'tie_breaks' (one entry per tied group that was shuffled)
+    """
+    scores = np.asarray(scores)
+    ids = np.asarray(ids)
+    k = min(k, len(scores))
+    if k <= 0:
+        return {'positions': [], 'tie_breaks': []}
+
+    # Everything scoring at least the k-th best value is a candidate: O(N)
+    threshold = np.partition(scores, len(scores) - k)[len(scores) - k]
+    candidates = np.flatnonzero(scores >= threshold)
+
+    # Only the candidates (k plus any ties at the boundary) are sorted
+    candidates = candidates[np.lexsort((ids[candidates], -scores[candidates]))]
+
+    rng = random.Random(seed)
+    positions = []
+    tie_breaks = []
+    start = 0
+    while start < len(candidates) and len(positions) < k:
+        end = start
+        while end < len(candidates) and scores[candidates[end]] == scores[candidates[start]]:
+            end += 1
+        group = candidates[start:end].tolist()
+
+        if len(group) > 1:
+            ordered = list(group)
+            rng.shuffle(ordered)
+            awarded = ordered[:k - len(positions)]
+            tie_breaks.append({
+                'score': scores[group[0]].item(),
+                'ranks': list(range(len(positions) + 1, len(positions) + len(awarded) + 1)),
+                'tied_ids': [ids[p].item() for p in group],
+                'drawn_order': [ids[p].item() for p in ordered],
+                'awarded_ids': [ids[p].item() for p in awarded],
+            })
+            positions.extend(awarded)
+        else:
+            positions.extend(group)
+        start = end
+
+    return {'positions': positions, 'tie_breaks': tie_breaks}
+
+
+def select_random(ids, seed: str):
+    """
+    Draw one row uniformly with a seeded RNG
+
+    Rows are ordered by ID first, so the draw only depends on who is in the
+    table and the seed.
+
+    Returns:
+        Row position of the drawn row, or None for an empty table
+    """
+    ids = np.asarray(ids)
+    if len(ids) == 0:
+        return None
+    order = np.argsort(ids, kind="stable")
+    return int(order[random.Random(seed).randrange(len(ids))])
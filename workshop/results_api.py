@@ -0,0 +1,259 @@
+"""
+Public results API
+Read-only HTTP/JSON view of a ResultsService for the voting booth, the
+projector screen and attendee browsers. Responses are rendered once per
+refresh pass and served from memory with an ETag, and clients can long-poll
+(If-None-Match plus ?wait=seconds) for the next change, so any number of
+polling browsers adds no RPC load.
+
+Private elections only expose their vote count until their final snapshot
+exists.
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import time
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+# How often the API checks the service for a new refresh pass
+POLL_INTERVAL_SECONDS = 0.5
+
+# Longest long-poll a client may ask for
+MAX_WAIT_SECONDS = 30
+
+ALL_ELECTIONS = "all"
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:20] + '"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    """Whether an If-None-Match header covers an ETag (weak comparison)"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate in ("*", etag):
+            return True
+    return False
+
+
+def election_document(vote: dict, labels: list, entry: dict, total_registered: int) -> dict:
+    """
+    Public JSON view of one results service entry
+
+    Args:
+        vote: Vote config of the election
+        labels: Option labels, in choice order
+        entry: ResultsService.election() entry
+        total_registered: Registered participants (for turnout)
+    """
+    snapshot = entry['snapshot']
+    is_public = vote['type'] == 'public'
+    show_tally = entry['tally'] is not None and (is_public or snapshot is not None)
+    tally = list(entry['tally']) if show_tally else [None] * len(labels)
+
+    return {
+        'electionId': vote['electionId'],
+        'voteKey': vote['voteKey'],
+        'title': vote['title'],
+        'type': vote['type'],
+        'status': entry['status'],
+        'voteCount': entry['voteCount'],
+        'counted': entry['counted'] if show_tally else 0,
+        # Counted votes not yet deep enough to be final (reorgs may still drop them)
+        'provisional': entry['provisional'] if show_tally else 0,
+        'turnout': round(entry['voteCount'] / total_registered, 4) if total_registered else 0,
+        'options': [
+            {'id': option['id'], 'label': label, 'text': option['text'], 'votes': votes}
+            for option, label, votes in zip(vote['options'], labels, tally)
+        ],
+        'final': snapshot is not None,
+        'snapshot': {
+            'blockNumber': snapshot['blockNumber'],
+            'checksum': snapshot['checksum'],
+            'createdAt': snapshot['createdAt'],
+        } if snapshot is not None else None,
+    }
+
+
+class ResultsFeed:
+    """Rendered JSON documents of a results service, with change notification"""
+
+    def __init__(self, service, votes_config):
+        self.service = service
+        self.votes_config = votes_config
+        self._documents = {}  # ALL_ELECTIONS / election_id -> (etag, body)
+        self._seen_passes = None
+        self._changed = None
+
+    def document(self, key):
+        """(etag, body) of a document, or None if it does not exist (yet)"""
+        return self._documents.get(key)
+
+    def update(self) -> bool:
+        """
+        Re-render after a new refresh pass
+
+        Returns:
+            True if any document changed
+        """
+        passes = self.service.passes
+        if passes == self._seen_passes:
+            return False
+        self._seen_passes = passes
+
+        overview = self.service.overview()
+        if overview is None:
+            return False
+
+        total_registered = overview['totalRegistered']
+        elections = [
+            election_document(
+                vote,
+                self.votes_config.option_labels(vote['electionId']),
+                self.service.election(vote['electionId']),
+                total_registered,
+            )
+            for vote in self.votes_config.votes
+        ]
+
+        documents = {
+            election['electionId']: self._render({'election': election, 'overview': overview})
+            for election in elections
+        }
+        documents[ALL_ELECTIONS] = self._render({'overview': overview, 'elections': elections})
+
+        changed = any(self._documents.get(key, (None,))[0] != etag for key, (etag, _) in documents.items())
+        self._documents = documents
+        if changed and self._changed is not None:
+            # Wake every waiting long-poll, later waiters get a fresh event
+            self._changed.set()
+            self._changed = asyncio.Event()
+        return changed
+
+    def _render(self, payload: dict):
+        # ETag covers the content only, so passes that change nothing keep it
+        content = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        body = json.dumps(
+            dict(payload, updatedAt=self.service.last_refresh),
+            sort_keys=True, separators=(",", ":"), ensure_ascii=False,
+        ).encode("utf-8")
+        return _etag(content), body
+
+    async def wait_for_change(self, key, etag: str, timeout: float):
+        """Wait until a document's ETag differs from etag, at most timeout seconds"""
+        deadline = time.monotonic() + timeout
+        while True:
+            current = self._documents.get(key)
+            remaining = deadline - time.monotonic()
+            if (current and current[0] != etag) or remaining <= 0:
+                return
+            if self._changed is None:
+                self._changed = asyncio.Event()
+            try:
+                await asyncio.wait_for(self._changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                return
+
+    async def follow(self):
+        """Pick up every refresh pass of the service (runs for the app's lifetime)"""
+        while True:
+            self.update()
+            await asyncio.sleep(POLL_INTERVAL_SECONDS)
+
+
+def _wait_seconds(request) -> float:
+    try:
+        wait = float(request.query_params.get("wait", 0))
+    except ValueError:
+        return 0
+    return min(max(wait, 0), MAX_WAIT_SECONDS)
+
+
+def create_app(service, votes_config, cors_origins=("*",)) -> Starlette:
+    """
+    Starlette app serving a results service
+
+    Routes:
+        GET /results                 Overview and every configured election
+        GET /results/{election_id}   One election
+        GET /health                  Refresh state of the service
+
+    Args:
+        service: Started ResultsService
+        votes_config: Parsed votes config
+        cors_origins: Origins allowed to read the API from a browser
+    """
+    feed = ResultsFeed(service, votes_config)
+
+    async def serve(request, key):
+        feed.update()
+        document = feed.document(key)
+        if document is None:
+            if service.overview() is None:
+                return JSONResponse({'error': 'Results are not available yet'}, status_code=503,
+                                    headers={'Retry-After': '5'})
+            return JSONResponse({'error': f'Unknown election {key}'}, status_code=404)
+
+        if_none_match = request.headers.get("if-none-match")
+        wait = _wait_seconds(request)
+        if wait and _matches(if_none_match, document[0]):
+            await feed.wait_for_change(key, document[0], wait)
+            document = feed.document(key)
+
+        etag, body = document
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        if _matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type="application/json", headers=headers)
+
+    async def all_results(request):
+        return await serve(request, ALL_ELECTIONS)
+
+    async def one_election(request):
+        return await serve(request, request.path_params['election_id'])
+
+    async def health(request):
+        return JSONResponse({
+            'ready': service.overview() is not None,
+            'passes': service.passes,
+            'lastRefresh': service.last_refresh,
+            'lastError': service.last_error,
+        })
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        task = asyncio.create_task(feed.follow())
+        try:
+            yield
+        finally:
+            task.cancel()
+
+    return Starlette(
+        routes=[
+            Route("/results", all_results),
+            Route("/results/{election_id:int}", one_election),
+            Route("/health", health),
+        ],
+        middleware=[
+            Middleware(
+                CORSMiddleware,
+                allow_origins=list(cors_origins),
+                allow_methods=["GET"],
+                allow_headers=["If-None-Match"],
+                expose_headers=["ETag"],
+            ),
+        ],
+        lifespan=lifespan,
+    )
@@ -0,0 +1,334 @@
+"""
+Shared results service
+One background thread per process keeps the status, vote count and current
+tally of every configured election, plus the overview statistics. Dashboard
+sessions only read its latest state, so the RPC and decryption load stays
+the same however many people have the results open.
+
+Closed elections are served from their snapshot, public tallies are only
+re-read when the vote count changes (or follow the contract's vote events
+when a chain follower is given), and private elections are decrypted
+incrementally by the shared decryption jobs. Without auto_decrypt, a closed
+private election is only snapshotted once its job has decrypted every vote,
+so the refresh thread never waits for a decryption.
+"""
+
+import threading
+import time
+
+from workshop.chain import STATUS_OPEN
+from workshop.decryption_jobs import STATE_DONE, get_decryption_job
+from workshop.rpc_scheduler import PRIORITY_BACKGROUND, bind_priority
+from workshop.snapshots import get_or_build_snapshot, get_snapshot_store, snapshot_voters_by_choice
+
+# Seconds between refresh passes
+REFRESH_INTERVAL_SECONDS = 5.0
+
+STATUS_NOT_CREATED = "Not Created"
+
+
+def _group_by_choice(pairs) -> dict:
+    """(user_id, choice) pairs -> {choice: [user_id, ...]}"""
+    grouped = {}
+    for user_id, choice in pairs:
+        grouped.setdefault(int(choice), []).append(int(user_id))
+    return grouped
+
+
+def _tally(voters_by_choice: dict, num_options: int) -> list:
+    return [len(voters_by_choice.get(choice, [])) for choice in range(1, num_options + 1)]
+
+
+class ResultsService:
+    """Process-wide, periodically refreshed results of every configured election"""
+
+    def __init__(self, contract, votes_config, decryption_key=None,
+                 refresh_interval: float = REFRESH_INTERVAL_SECONDS, live_private_tallies: bool = True,
+                 auto_decrypt: bool = True, follower=None):
+        """
+        Args:
+            contract: Web3 contract object
+            votes_config: Parsed votes config (workshop.config.VotesConfig)
+            decryption_key: Base64 private key for private elections
+            refresh_interval: Seconds between refresh passes
+            live_private_tallies: Decrypt private elections while they are
+                open (False: private tallies only once closed)
+            auto_decrypt: Start decrypting new private votes on every pass
+                (False: only report what decryption jobs started elsewhere,
+                e.g. by the owner, have decrypted)
+            follower: Optional workshop.chain_follower.ChainFollower that
+                open public tallies are read from incrementally
+        """
+        self.contract = contract
+        self.votes_config = votes_config
+        self.decryption_key = decryption_key
+        self.refresh_interval = refresh_interval
+        self.live_private_tallies = live_private_tallies
+        self.auto_decrypt = auto_decrypt
+        self.follower = follower
+
+        self._lock = threading.Lock()
+        # Notified (holding _lock) whenever a refresh pass finishes
+        self._pass_done = threading.Condition(self._lock)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._ready = threading.Event()
+        self._thread = None
+
+        self._elections = {}
+        self._overview = None
+        self._follower_ok = False
+        self.passes_started = 0
+        self.passes = 0
+        self.last_refresh = None
+        self.last_error = None
+
+    def start(self):
+        """Start the background refresher (no-op if already running)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=bind_priority(self._run, PRIORITY_BACKGROUND), name="results-service", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether the first refresh pass has finished"""
+        return self._ready.is_set()
+
+    def wait_until_ready(self, timeout: float = None) -> bool:
+        """Block until the first refresh pass has finished"""
+        return self._ready.wait(timeout)
+
+    def request_refresh(self, timeout: float = 0):
+        """
+        Ask for a refresh pass now instead of at the next interval
+
+        Args:
+            timeout: Wait up to this many seconds for a pass that started
+                after this call (so it sees e.g. a just mined transaction)
+                to finish
+        """
+        with self._lock:
+            # A pass already running may have read the chain before the change
+            target = self.passes_started + 1
+        self._wake.set()
+        with self._pass_done:
+            self._pass_done.wait_for(lambda: self.passes >= target, timeout)
+
+    def election(self, election_id: int) -> dict:
+        """Latest results of one election (treat as read-only)"""
+        with self._lock:
+            return self._elections.get(election_id) or self._not_created(election_id)
+
+    def elections(self) -> dict:
+        """Latest results of every configured election by election ID"""
+        with self._lock:
+            return dict(self._elections)
+
+    def overview(self) -> dict:
+        """Registration and election counts across the whole contract"""
+        with self._lock:
+            return self._overview
+
+    def _run(self):
+        while not self._stop.is_set():
+            with self._lock:
+                self.passes_started += 1
+            try:
+                self.refresh()
+            except Exception as e:
+                self.last_error = str(e)
+            with self._pass_done:
+                self.passes += 1
+                self._pass_done.notify_all()
+            self._ready.set()
+            self._wake.wait(self.refresh_interval)
+            self._wake.clear()
+
+    def refresh(self):
+        """One refresh pass over the overview and every configured election"""
+        functions = self.contract.functions
+        if self.follower is not None:
+            # Without the follower, tallies fall back to full reads
+            try:
+                self.follower.poll()
+                self._follower_ok = True
+            except Exception:
+                self._follower_ok = False
+        total_registered = functions.getTotalRegistered().call()
+        total_elections = functions.getTotalElections().call()
+
+        # Every election on the contract, configured or not, feeds the overview
+        raw = {}
+        for election_id in range(1, total_elections + 1):
+            try:
+                election = functions.getElection(election_id).call()
+                vote_count = functions.getVoteCount(election_id).call()
+            except Exception:
+                continue
+            raw[election_id] = (election, vote_count)
+
+        overview = {
+            'totalRegistered': total_registered,
+            'totalElections': total_elections,
+            'openElections': sum(1 for election, _ in raw.values() if election[1] == STATUS_OPEN),
+            'totalVotes': sum(vote_count for _, vote_count in raw.values()),
+        }
+
+        elections = {}
+        for vote in self.votes_config.votes:
+            election_id = vote['electionId']
+            if election_id not in raw:
+                elections[election_id] = self._not_created(election_id)
+                continue
+            election, vote_count = raw[election_id]
+            try:
+                elections[election_id] = self._refresh_election(vote, election, vote_count)
+            except Exception as e:
+                # Keep serving the last good state of this election
+                previous = self._elections.get(election_id)
+                elections[election_id] = dict(previous, error=str(e)) if previous else \
+                    dict(self._not_created(election_id), error=str(e))
+
+        with self._lock:
+            self._overview = overview
+            self._elections = elections
+            self.last_refresh = time.time()
+            self.last_error = None
+
+    def _not_created(self, election_id: int) -> dict:
+        return {
+            'electionId': election_id,
+            'status': STATUS_NOT_CREATED,
+            'voteCount': 0,
+            'tally': None,
+            'votersByChoice': {},
+            'counted': 0,
+            'snapshot': None,
+            'decryption': None,
+            'provisional': 0,
+            'error': None,
+        }
+
+    def _closed_snapshot(self, vote: dict, election, vote_count: int):
+        """
+        Snapshot of a closed election, built if needed
+
+        Returns:
+            Frozen snapshot, or None for a private election that is not
+            decrypted yet and may not be decrypted here
+        """
+        election_id = vote['electionId']
+        is_private = vote['type'] == 'private'
+        signature_options = self.votes_config.signature_options(election_id) if is_private else None
+        if is_private and not self.auto_decrypt:
+            snapshot = get_snapshot_store(self.contract.address).get(election_id, election[4])
+            if snapshot is not None:
+                return snapshot
+            # Building it would decrypt (and wait for) the remaining votes in
+            # this thread: leave that to the owner's decryption job
+            job = get_decryption_job(self.contract, election_id, signature_options)
+            job_status = job.status()
+            if job.is_running or job_status['state'] != STATE_DONE or job_status['done'] < vote_count:
+                return None
+        return get_or_build_snapshot(
+            self.contract,
+            election_id,
+            election[4],
+            len(vote['options']),
+            decryption_key=self.decryption_key,
+            signature_options=signature_options,
+        )
+
+    def _refresh_election(self, vote: dict, election, vote_count: int) -> dict:
+        election_id = vote['electionId']
+        num_options = len(vote['options'])
+        is_private = vote['type'] == 'private'
+        status = "Open" if election[1] == STATUS_OPEN else "Closed"
+        previous = self._elections.get(election_id)
+
+        entry = {
+            'electionId': election_id,
+            'status': status,
+            'voteCount': vote_count,
+            'tally': None,
+            'votersByChoice': {},
+            'counted': 0,
+            'snapshot': None,
+            'decryption': None,
+            'provisional': 0,
+            'error': None,
+        }
+
+        snapshot = None
+        if status == "Closed" and (not is_private or self.decryption_key):
+            snapshot = self._closed_snapshot(vote, election, vote_count)
+        if snapshot is not None:
+            if previous and previous['snapshot'] is snapshot:
+                return previous
+            entry.update(
+                voteCount=snapshot['voteCount'],
+                tally=list(snapshot['tally']),
+                votersByChoice=snapshot_voters_by_choice(snapshot),
+                counted=len(snapshot['votes']),
+                snapshot=snapshot,
+            )
+            return entry
+
+        if vote_count == 0:
+            return entry
+
+        if not is_private:
+            if self._follower_ok:
+                user_ids, choices = self.follower.public_votes(election_id)
+                # The follower may be a block behind the count; read directly then
+                if len(user_ids) == vote_count:
+                    voters_by_choice = _group_by_choice(zip(user_ids, choices))
+                    entry.update(
+                        tally=_tally(voters_by_choice, num_options),
+                        votersByChoice=voters_by_choice,
+                        counted=len(user_ids),
+                        provisional=self.follower.provisional_votes(election_id),
+                    )
+                    return entry
+            # Voter lists only change when the vote count does
+            if previous and previous['tally'] is not None and previous['status'] == status \
+                    and previous['voteCount'] == vote_count and previous['snapshot'] is None:
+                entry.update(tally=previous['tally'], votersByChoice=previous['votersByChoice'],
+                             counted=previous['counted'])
+                return entry
+            user_ids, choices = self.contract.functions.getAllPublicVotes(election_id).call()
+            voters_by_choice = _group_by_choice(zip(user_ids, choices))
+            entry.update(
+                tally=_tally(voters_by_choice, num_options),
+                votersByChoice=voters_by_choice,
+                counted=len(user_ids),
+            )
+            return entry
+
+        # Closed but not snapshotted yet: show what has been decrypted so far
+        if not self.decryption_key or (status == "Open" and not self.live_private_tallies):
+            return entry
+
+        # Shared job: only votes cast since the last pass are decrypted
+        job = get_decryption_job(self.contract, election_id, self.votes_config.signature_options(election_id))
+        job_status = job.status()
+        if self.auto_decrypt and not job.is_running and job_status['done'] < vote_count:
+            job.start(self.decryption_key)
+        results = job.results()
+        voters_by_choice = _group_by_choice((user_id, vote['choice']) for user_id, vote in results.items())
+        entry.update(
+            tally=_tally(voters_by_choice, num_options),
+            votersByChoice=voters_by_choice,
+            counted=len(results),
+            decryption=job.status(),
+        )
+        return entry
@@ -0,0 +1,289 @@
+"""
+RPC request scheduler
+Every JSON-RPC request a process sends to an endpoint goes through one shared
+token bucket, so background work (event indexing, decryption, address
+loading, bulk export) cannot spend the provider's rate limit that the
+organizer's clicks need. Waiting requests are served in priority order:
+interactive reads jump ahead of queued background work. When the endpoint
+answers HTTP 429 or a rate limit JSON-RPC error, the bucket is emptied and
+background requests back off exponentially, while interactive ones only
+wait for the next token.
+
+Code running in a background thread marks its requests with
+rpc_priority(PRIORITY_BACKGROUND); everything else is interactive.
+
+Identical read-only requests in flight at the same time (same method,
+parameters - including the block tag - and priority) are sent once and
+share the response (see workshop/singleflight.py).
+"""
+
+import contextvars
+import functools
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from workshop.singleflight import SingleFlight
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+
+# Requests per second and burst size per endpoint (override the rate with the
+# RPC_REQUESTS_PER_SECOND environment variable)
+RATE_ENV = "RPC_REQUESTS_PER_SECOND"
+DEFAULT_RATE = 20.0
+DEFAULT_BURST = 40
+
+# Background back-off after a rate limit response, doubling up to the maximum
+BACKOFF_INITIAL_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 30.0
+
+# Attempts per request when the endpoint keeps rate limiting
+RATE_LIMITED_ATTEMPTS = 4
+
+# Read-only methods whose concurrent identical requests are coalesced
+COALESCED_METHODS = {
+    "eth_call",
+    "eth_blockNumber",
+    "eth_chainId",
+    "net_version",
+    "eth_getBlockByNumber",
+    "eth_getBlockByHash",
+    "eth_getLogs",
+    "eth_getCode",
+    "eth_getTransactionByHash",
+    "eth_getTransactionReceipt",
+}
+
+# JSON-RPC error codes providers use for "too many requests"
+RATE_LIMIT_ERROR_CODES = {-32005, -32029, -32090, 429}
+
+_priority = contextvars.ContextVar("rpc_priority", default=PRIORITY_INTERACTIVE)
+
+
+def current_priority() -> int:
+    """Priority of the RPC requests sent from the current context"""
+    return _priority.get()
+
+
+@contextmanager
+def rpc_priority(priority: int):
+    """Send the RPC requests made inside the block with a priority"""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def bind_priority(fn, priority: int = None):
+    """
+    Wrap fn to run with a priority (default: the caller's), e.g. for thread
+    pool workers, which do not inherit it
+    """
+    priority = current_priority() if priority is None else priority
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with rpc_priority(priority):
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
+def is_rate_limit_error(error) -> bool:
+    """Whether a JSON-RPC error object means the request was rate limited"""
+    if not isinstance(error, dict):
+        return False
+    message = str(error.get("message", "")).lower()
+    return error.get("code") in RATE_LIMIT_ERROR_CODES \
+        or "rate limit" in message or "too many requests" in message
+
+
+class RequestScheduler:
+    """Token bucket with priority queueing for one RPC endpoint"""
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST):
+        """
+        Args:
+            rate: Requests per second
+            burst: Requests that may be sent at once after an idle period
+        """
+        self.rate = rate
+        self.burst = burst
+        self._cond = threading.Condition()
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._waiting = []          # Heap of (priority, ticket)
+        self._tickets = itertools.count()
+        self._backoff = 0.0
+        self._backoff_until = 0.0
+        self.sent = 0
+        self.rate_limited = 0
+
+    def acquire(self, priority: int = PRIORITY_INTERACTIVE, cost: int = 1) -> float:
+        """
+        Block until a request may be sent
+
+        Args:
+            priority: PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND
+            cost: Tokens the request uses (e.g. the size of a batch)
+
+        Returns:
+            Seconds spent waiting
+        """
+        cost = min(cost, self.burst)
+        started = time.monotonic()
+        with self._cond:
+            entry = (priority, next(self._tickets))
+            heapq.heappush(self._waiting, entry)
+            # A new head of the queue may change everyone's wait
+            self._cond.notify_all()
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    timeout = None
+                    if self._waiting[0] == entry:
+                        timeout = self._ready_in(priority, cost, now)
+                        if timeout <= 0:
+                            heapq.heappop(self._waiting)
+                            self._tokens -= cost
+                            self.sent += 1
+                            self._cond.notify_all()
+                            return now - started
+                    self._cond.wait(timeout)
+            except BaseException:
+                if entry in self._waiting:
+                    self._waiting.remove(entry)
+                    heapq.heapify(self._waiting)
+                    self._cond.notify_all()
+                raise
+
+    def rate_limit_hit(self):
+        """The endpoint rate limited a request: empty the bucket and back off background work"""
+        with self._cond:
+            self.rate_limited += 1
+            self._tokens = 0.0
+            self._backoff = min(max(self._backoff * 2, BACKOFF_INITIAL_SECONDS), BACKOFF_MAX_SECONDS)
+            self._backoff_until = time.monotonic() + self._backoff
+            self._cond.notify_all()
+
+    def request_succeeded(self):
+        """A request went through: the next rate limit starts from the initial back-off"""
+        with self._cond:
+            self._backoff = 0.0
+
+    def status(self) -> dict:
+        """Tokens, queue lengths and counters"""
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            return {
+                'tokens': round(self._tokens, 2),
+                'waitingInteractive': sum(1 for priority, _ in self._waiting if priority == PRIORITY_INTERACTIVE),
+                'waitingBackground': sum(1 for priority, _ in self._waiting if priority != PRIORITY_INTERACTIVE),
+                'backoffSeconds': round(max(0.0, self._backoff_until - now), 2),
+                'sent': self.sent,
+                'rateLimited': self.rate_limited,
+            }
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _ready_in(self, priority: int, cost: int, now: float) -> float:
+        """Seconds until the head of the queue may be sent"""
+        wait = max(0.0, (cost - self._tokens) / self.rate)
+        if priority != PRIORITY_INTERACTIVE:
+            wait = max(wait, self._backoff_until - now)
+        return wait
+
+
+_schedulers = {}
+_coalescers = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(endpoint: str) -> RequestScheduler:
+    """Process-wide scheduler for an RPC endpoint, shared by every connection to it"""
+    with _schedulers_lock:
+        scheduler = _schedulers.get(endpoint)
+        if scheduler is None:
+            scheduler = RequestScheduler(rate=float(os.environ.get(RATE_ENV, DEFAULT_RATE)))
+            _schedulers[endpoint] = scheduler
+        return scheduler
+
+
+def get_request_coalescer(endpoint: str) -> SingleFlight:
+    """Process-wide in-flight request coalescer for an RPC endpoint"""
+    with _schedulers_lock:
+        coalescer = _coalescers.get(endpoint)
+        if coalescer is None:
+            coalescer = SingleFlight()
+            _coalescers[endpoint] = coalescer
+        return coalescer
+
+
+@functools.lru_cache(maxsize=None)
+def scheduled_provider_class():
+    """HTTPProvider subclass sending through the endpoint's scheduler (web3 imported lazily)"""
+    import requests
+    from web3.providers import HTTPProvider
+
+    class ScheduledHTTPProvider(HTTPProvider):
+        def __init__(self, endpoint_uri: str, **kwargs):
+            # Rate limits are retried here, in priority order, instead of by web3
+            super().__init__(endpoint_uri, exception_retry_configuration=None, **kwargs)
+            self.scheduler = get_scheduler(str(endpoint_uri))
+            self.coalescer = get_request_coalescer(str(endpoint_uri))
+
+        def _send(self, send, cost: int):
+            priority = current_priority()
+            for attempt in range(RATE_LIMITED_ATTEMPTS):
+                self.scheduler.acquire(priority, cost)
+                try:
+                    response = send()
+                except requests.HTTPError as e:
+                    if e.response is None or e.response.status_code != 429 or attempt == RATE_LIMITED_ATTEMPTS - 1:
+                        raise
+                    self.scheduler.rate_limit_hit()
+                    continue
+                errors = [item.get("error") for item in (response if isinstance(response, list) else [response])]
+                if any(is_rate_limit_error(error) for error in errors) and attempt < RATE_LIMITED_ATTEMPTS - 1:
+                    self.scheduler.rate_limit_hit()
+                    continue
+                self.scheduler.request_succeeded()
+                return response
+
+        def make_request(self, method, params):
+            def send():
+                return self._send(lambda: self._http_request(method, params), 1)
+
+            if method not in COALESCED_METHODS:
+                return send()
+            # eth_call parameters carry the call data and the block tag
+            key = (current_priority(), method, json.dumps(params, sort_keys=True, default=str))
+            return self.coalescer.do(key, send)
+
+        def make_batch_request(self, batch_requests):
+            return self._send(lambda: self._http_batch_request(batch_requests), len(batch_requests))
+
+        # The requests actually sent, after scheduling and coalescing
+        # (overridden to record or replay them, see workshop/cassettes.py)
+        def _http_request(self, method, params):
+            return HTTPProvider.make_request(self, method, params)
+
+        def _http_batch_request(self, batch_requests):
+            return HTTPProvider.make_batch_request(self, batch_requests)
+
+    return ScheduledHTTPProvider
+
+
+def scheduled_provider(rpc_url: str, **kwargs):
+    """HTTPProvider whose requests go through the endpoint's shared scheduler"""
+    return scheduled_provider_class()(rpc_url, **kwargs)
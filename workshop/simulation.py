@@ -0,0 +1,170 @@
+"""
+Payoff simulation
+Samples many hypothetical workshops at once as NumPy arrays and scores them
+with a vote's compiled payoff rule (workshop.payoffs), to see how a
+threshold or bonus change shifts expected points, inequality and how often
+thresholds are hit before trying it on a live room.
+
+Each simulated profile draws every participant's residence district or
+committee, a voting strategy from a population mix and whether they turn
+out, then evaluates one vote. Profiles are processed in fixed-size batches,
+optionally spread over a process pool with independent seeds.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from workshop.payoffs import PayoffRule
+
+# Profiles evaluated per batch (bounds memory: batch x participants cells)
+SIMULATION_BATCH = 20_000
+
+# Strategies per group kind of the rule: name -> how a participant picks an option
+#   home/committee: the option paying their own group the most
+#   focal/shared: the option whose worst-paid group gets the most (district A /
+#       the Shared Hub), where everyone can coordinate
+#   random: uniformly at random
+STRATEGIES = {
+    "district": ("home", "focal", "random"),
+    "committee": ("committee", "shared", "random"),
+}
+
+
+def _gini(points):
+    """Gini coefficient of each row (0 = everyone equal)"""
+    points = np.sort(points, axis=1).astype(np.float64)
+    n = points.shape[1]
+    totals = points.sum(axis=1)
+    ranks = np.arange(1, n + 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        gini = (2 * (points * ranks).sum(axis=1) / (n * totals)) - (n + 1) / n
+    return np.where(totals > 0, gini, 0.0)
+
+
+def _counts(votes, num_options):
+    """Votes per option of each row; -1 marks an abstention"""
+    rows = votes.shape[0]
+    cast = votes >= 0
+    flat = (np.arange(rows)[:, np.newaxis] * num_options + votes.astype(np.int64))[cast]
+    return np.bincount(flat, minlength=rows * num_options).reshape(rows, num_options)
+
+
+def _simulate_batch(rng, rule, profiles, participants, mix, turnout, threshold):
+    """Points (profiles, participants), strategies and threshold hits of one batch"""
+    num_groups = len(rule.group_labels)
+    num_options = len(rule.option_codes)
+    shape = (profiles, participants)
+
+    groups = rng.integers(0, num_groups, shape, dtype=np.int8)
+    # Strategy index = number of cumulative shares a uniform draw passes
+    draws = rng.random(shape, dtype=np.float32)
+    strategies = np.zeros(shape, dtype=np.int8)
+    for boundary in np.cumsum(mix)[:-1]:
+        strategies += draws >= boundary
+
+    # Own group's option, then the focal option, then random
+    favourite = rule.favourite_options().astype(np.int8)
+    votes = np.where(strategies == 0, favourite[groups], np.int8(rule.focal_option()))
+    votes = np.where(strategies == 2, rng.integers(0, num_options, shape, dtype=np.int8), votes)
+    if turnout < 1:
+        votes[rng.random(shape, dtype=np.float32) >= turnout] = -1
+
+    counts = _counts(votes, num_options)
+    result = rule.evaluate(counts, counts.sum(axis=1), groups, votes, share=threshold)
+    hits = result['hits'].any(axis=(-2, -1))
+    return result['points'], strategies, hits
+
+
+def _simulate_chunk(args):
+    """Accumulated statistics of a share of the profiles (process pool entry point)"""
+    seed, rule, profiles, participants, mix, turnout, threshold, batch = args
+    rng = np.random.default_rng(seed)
+
+    points_sum = np.zeros(len(mix))
+    points_sq = np.zeros(len(mix))
+    members = np.zeros(len(mix))
+    gini_sum = 0.0
+    hits = 0
+
+    remaining = profiles
+    while remaining > 0:
+        size = min(batch, remaining)
+        points, strategies, batch_hits = _simulate_batch(rng, rule, size, participants, mix, turnout, threshold)
+        flat = strategies.ravel()
+        values = points.ravel().astype(np.float64)
+        points_sum += np.bincount(flat, weights=values, minlength=len(mix))
+        points_sq += np.bincount(flat, weights=values ** 2, minlength=len(mix))
+        members += np.bincount(flat, minlength=len(mix))
+        gini_sum += _gini(points).sum()
+        hits += int(batch_hits.sum())
+        remaining -= size
+
+    return points_sum, points_sq, members, gini_sum, hits
+
+
+def simulate_payoffs(rule: PayoffRule, profiles: int = 1_000_000, participants: int = 50, mix: dict = None,
+                     turnout: float = 1.0, threshold: float = None, seed: int = 0, workers: int = 1,
+                     batch: int = SIMULATION_BATCH) -> dict:
+    """
+    Monte Carlo estimate of a scored vote's payoffs
+
+    Args:
+        rule: The vote's compiled payoff rule (VotesConfig.payoff_rule)
+        profiles: Number of simulated workshops
+        participants: Participants per workshop
+        mix: Strategy name -> share of the population (defaults to uniform)
+        turnout: Probability that a participant votes
+        threshold: Share in percent for the rule's thresholds (defaults to the live rule)
+        seed: Seed of the whole run (same seed, same result for the same workers)
+        workers: Processes to spread the profiles over
+        batch: Profiles evaluated per batch
+
+    Returns:
+        Dict with 'strategies' (DataFrame of share, expected points and
+        standard deviation per strategy), 'gini' (mean Gini coefficient of
+        a workshop's points) and 'threshold_hit_rate' (share of workshops
+        where any threshold is reached, e.g. a school opens)
+
+    Raises:
+        ValueError: On an unknown strategy
+    """
+    names = STRATEGIES[rule.groups]
+    mix = mix or {name: 1 for name in names}
+    unknown = set(mix) - set(names)
+    if unknown:
+        raise ValueError(f"Unknown strategies for {rule.groups} votes: {', '.join(sorted(unknown))} (choose from {', '.join(names)})")
+    shares = np.array([mix.get(name, 0) for name in names], dtype=np.float64)
+    shares = shares / shares.sum()
+    if threshold is None:
+        threshold = rule.default_share
+
+    workers = max(1, min(workers, profiles))
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    sizes = [profiles // workers + (1 if i < profiles % workers else 0) for i in range(workers)]
+    chunks = [(s, rule, size, participants, shares, turnout, threshold, batch) for s, size in zip(seeds, sizes)]
+
+    if workers == 1:
+        results = [_simulate_chunk(chunks[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_simulate_chunk, chunks))
+
+    points_sum, points_sq, members, gini_sum, hits = (sum(values) for values in zip(*results))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = points_sum / members
+        std = np.sqrt(np.maximum(points_sq / members - mean ** 2, 0))
+
+    return {
+        'strategies': pd.DataFrame({
+            'Strategy': list(names),
+            'Share': shares,
+            'Expected Points': mean,
+            'Std Dev': std,
+        }),
+        'gini': gini_sum / profiles,
+        'threshold_hit_rate': hits / profiles,
+        'profiles': profiles,
+        'threshold': threshold,
+    }
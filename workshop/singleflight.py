@@ -0,0 +1,84 @@
+"""
+Request coalescing
+Concurrent identical reads (several sessions, or several panels of one
+rerun, asking for the same getVoteCount at the same moment) share one call:
+the first caller runs it and everyone asking for the same key while it is in
+flight waits for, and receives a copy of, that result. Nothing is cached
+once the call returns.
+"""
+
+import copy
+import threading
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls with the same key"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.calls = 0
+        self.shared = 0
+
+    def do(self, key, fn):
+        """
+        Run fn, or wait for the identical call already in flight
+
+        Args:
+            key: Hashable identity of the call
+            fn: Zero-argument callable doing the work
+
+        Returns:
+            fn's result (callers that joined get a deep copy, so nobody can
+            change what another caller sees)
+
+        Raises:
+            Whatever fn raised, in every caller that shared the call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.calls += 1
+            else:
+                call.waiters += 1
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        result = None
+        try:
+            result = fn()
+            return result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                # Nobody can join any more. The leader's caller gets the
+                # original and may change it, so waiters copy from a copy
+                if call.waiters and call.error is None:
+                    call.result = copy.deepcopy(result)
+            call.done.set()
+
+    def status(self) -> dict:
+        """Calls run, calls that joined one in flight, and calls in flight now"""
+        with self._lock:
+            return {'calls': self.calls, 'shared': self.shared, 'inFlight': len(self._calls)}
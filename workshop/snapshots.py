@@ -0,0 +1,225 @@
+"""
+Closed election snapshots
+Once an election is closed its results cannot change, so the final tally,
+voter lists and decrypted choices are computed once and stored as an
+immutable, checksummed snapshot. A snapshot is tied to the election's closedAt
+timestamp: reopening and closing again produces a new snapshot.
+"""
+
+import hashlib
+import json
+import threading
+from datetime import datetime
+from types import MappingProxyType
+from typing import Optional
+
+from workshop.chain import STATUS_CLOSED
+from workshop.decryption_jobs import STATE_DONE, get_decryption_job
+from workshop.storage import contract_cache_dir, read_json, write_json_atomic
+
+SNAPSHOT_VERSION = 1
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot cannot be built (e.g. election still open)"""
+
+
+def _checksum(payload: dict) -> str:
+    """SHA-256 over the canonical JSON encoding of a snapshot payload"""
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _freeze(value):
+    """Recursively turn dicts/lists into read-only mappings/tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def build_snapshot(contract, election_id: int, num_options: int,
+                   decryption_key: Optional[str] = None, signature_options=None) -> dict:
+    """
+    Compute the final results of a closed election
+
+    All reads are pinned to a single block so tally and voter lists agree.
+
+    Args:
+        contract: Web3 contract object
+        election_id: Election to snapshot
+        num_options: Number of choices in the election
+        decryption_key: Base64 private key (required for private elections)
+        signature_options: Messages voters signed (required for private elections)
+
+    Returns:
+        Snapshot payload (plain dict including its checksum)
+
+    Raises:
+        SnapshotError: If the election is open or a private election cannot be decrypted
+    """
+    block_number = contract.w3.eth.block_number
+    election = contract.functions.getElection(election_id).call(block_identifier=block_number)
+    _, status, is_public, opened_at, closed_at = election
+
+    if status != STATUS_CLOSED:
+        raise SnapshotError(f"Election {election_id} is still open")
+
+    failed = []
+    if is_public:
+        user_ids, choices = contract.functions.getAllPublicVotes(election_id).call(block_identifier=block_number)
+        votes = [[int(user_id), int(choice)] for user_id, choice in zip(user_ids, choices)]
+    else:
+        if not decryption_key or not signature_options:
+            raise SnapshotError(f"Decryption key required to snapshot private election {election_id}")
+
+        user_ids = contract.functions.getVotersInElection(election_id).call(block_identifier=block_number)
+
+        # Reuse (and finish) the shared decryption job so no vote is decrypted twice
+        job = get_decryption_job(contract, election_id, signature_options)
+        job.start(decryption_key)
+        job.wait()
+        status = job.status()
+        if status["state"] != STATE_DONE:
+            raise SnapshotError(f"Decryption of election {election_id} stopped: {status['error']}")
+
+        results = job.results()
+        failures = job.failures()
+        missing = [int(user_id) for user_id in user_ids if int(user_id) not in results and int(user_id) not in failures]
+        if missing:
+            raise SnapshotError(f"Votes of users {missing} were not decrypted")
+
+        votes = [[int(user_id), results[int(user_id)]["choice"]] for user_id in user_ids if int(user_id) in results]
+        failed = [{"userId": int(user_id), "error": failures[int(user_id)]} for user_id in user_ids if int(user_id) in failures]
+
+        if failed and not votes:
+            raise SnapshotError("No private votes could be decrypted - check the decryption key")
+
+    votes.sort()
+    tally = [0] * num_options
+    for _, choice in votes:
+        if 1 <= choice <= num_options:
+            tally[choice - 1] += 1
+
+    payload = {
+        "version": SNAPSHOT_VERSION,
+        "contractAddress": contract.address,
+        "electionId": election_id,
+        "isPublic": bool(is_public),
+        "openedAt": int(opened_at),
+        "closedAt": int(closed_at),
+        "blockNumber": int(block_number),
+        "numOptions": num_options,
+        "voteCount": len(user_ids),
+        "tally": tally,
+        "votes": votes,
+        "failed": failed,
+        "createdAt": datetime.now().isoformat(timespec="seconds"),
+    }
+    payload["checksum"] = _checksum(payload)
+    return payload
+
+
+class SnapshotStore:
+    """Write-once snapshot files for one contract with an in-memory read cache"""
+
+    def __init__(self, contract_address: str):
+        self.directory = contract_cache_dir(contract_address, "snapshots")
+        self._cache = {}
+        self._lock = threading.Lock()
+        self._build_locks = {}
+
+    def _path(self, election_id: int, closed_at: int):
+        return self.directory / f"election_{election_id}_{closed_at}.json"
+
+    def get(self, election_id: int, closed_at: int):
+        """
+        Return the verified, read-only snapshot for an election close
+
+        Returns:
+            Frozen snapshot mapping, or None if there is no valid snapshot
+        """
+        key = (election_id, closed_at)
+        with self._lock:
+            if key in self._cache:
+                return self._cache[key]
+
+        payload = read_json(self._path(election_id, closed_at))
+        if payload is None:
+            return None
+
+        checksum = payload.pop("checksum", None)
+        if checksum != _checksum(payload):
+            # Corrupted or edited on disk - ignore it so it gets rebuilt
+            return None
+        payload["checksum"] = checksum
+
+        snapshot = _freeze(payload)
+        with self._lock:
+            self._cache[key] = snapshot
+        return snapshot
+
+    def build_lock(self, election_id: int) -> threading.Lock:
+        """Lock held while a snapshot of an election is built, so concurrent callers build it once"""
+        with self._lock:
+            return self._build_locks.setdefault(election_id, threading.Lock())
+
+    def put(self, payload: dict):
+        """Store a snapshot unless one already exists for the same close"""
+        key = (payload["electionId"], payload["closedAt"])
+        existing = self.get(*key)
+        if existing is not None:
+            return existing
+
+        write_json_atomic(self._path(*key), payload)
+        snapshot = _freeze(payload)
+        with self._lock:
+            self._cache[key] = snapshot
+        return snapshot
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_snapshot_store(contract_address: str) -> SnapshotStore:
+    """Process-wide snapshot store for a contract"""
+    key = contract_address.lower()
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = SnapshotStore(contract_address)
+        return _stores[key]
+
+
+def get_or_build_snapshot(contract, election_id: int, closed_at: int, num_options: int,
+                          decryption_key: Optional[str] = None, signature_options=None):
+    """
+    Return the snapshot for a closed election, building it on first sight
+
+    Args:
+        closed_at: The election's closedAt as currently reported by the contract
+
+    Returns:
+        Frozen snapshot mapping
+    """
+    store = get_snapshot_store(contract.address)
+    snapshot = store.get(election_id, closed_at)
+    if snapshot is not None:
+        return snapshot
+
+    # Another thread (e.g. the cache warmup) may be building it right now
+    with store.build_lock(election_id):
+        snapshot = store.get(election_id, closed_at)
+        if snapshot is not None:
+            return snapshot
+        payload = build_snapshot(contract, election_id, num_options, decryption_key, signature_options)
+        return store.put(payload)
+
+
+def snapshot_voters_by_choice(snapshot) -> dict:
+    """Group snapshot voter IDs by their (1-indexed) choice"""
+    grouped = {}
+    for user_id, choice in snapshot["votes"]:
+        grouped.setdefault(choice, []).append(user_id)
+    return grouped
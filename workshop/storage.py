@@ -0,0 +1,52 @@
+"""
+Local cache storage
+All persisted dashboard caches live under one directory (default
+.dashboard-cache/ next to the dashboards, override with DASHBOARD_CACHE_DIR).
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+CACHE_DIR_ENV = "DASHBOARD_CACHE_DIR"
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / ".dashboard-cache"
+
+
+def cache_dir(*parts) -> Path:
+    """Return (and create) a directory inside the cache root"""
+    root = Path(os.environ.get(CACHE_DIR_ENV, DEFAULT_CACHE_DIR))
+    path = root.joinpath(*parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def contract_cache_dir(contract_address: str, *parts) -> Path:
+    """Cache directory scoped to one deployed contract"""
+    return cache_dir(contract_address.lower(), *parts)
+
+
+def read_json(path: Path, default=None):
+    """Read a JSON file, returning default if it is missing or unreadable"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def write_json_atomic(path: Path, data) -> None:
+    """Write a JSON file atomically so readers never see a partial file"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
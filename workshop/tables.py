@@ -0,0 +1,170 @@
+"""
+Compact participant and vote tables
+Participants are stored column-wise as uint32 user IDs and 20-byte binary
+addresses, with district/committee assignments precomputed once as uint8
+codes. Vote choices are categoricals over the option texts. Checksummed
+addresses are only formatted when a table is displayed or exported, so the
+core tables stay a few bytes per row and copying them is cheap.
+"""
+
+import functools
+
+import numpy as np
+import pandas as pd
+
+ADDRESS_BYTES = 20
+
+# Assignment labels, indexed by the uint8 codes below
+DISTRICTS = ['A', 'B', 'C', 'D']
+COMMITTEES = ['Marketing', 'Operations', 'Community']
+INITIATIVES = ['A', 'B', 'C', 'D']
+
+NO_CODE = -1
+
+_HEX_DIGITS = np.frombuffer(b"0123456789abcdef", dtype=np.uint8).astype(np.uint64)
+
+
+def _assignment_hash(text: str) -> int:
+    """31-multiplier string hash used by votesConfig.ts (JS `>>> 0` semantics)"""
+    hash_value = 0
+    for char in text:
+        hash_value = (hash_value * 31 + ord(char)) & 0xFFFFFFFF
+    return hash_value
+
+
+def district_index(wallet_address: str, seed: str = "default") -> int:
+    """Index into DISTRICTS assigned to a wallet address for a given seed"""
+    return _assignment_hash(wallet_address.lower() + seed) % len(DISTRICTS)
+
+
+def committee_index(wallet_address: str) -> int:
+    """Index into COMMITTEES assigned to a wallet address"""
+    return _assignment_hash(wallet_address.lower() + "committee") % len(COMMITTEES)
+
+
+@functools.lru_cache(maxsize=8192)
+def _checksum(raw: bytes) -> str:
+    from eth_utils import to_checksum_address
+
+    return to_checksum_address(raw)
+
+
+def short_address(address: str) -> str:
+    """0x1234...abcd form used in dashboard tables"""
+    return f"{address[:6]}...{address[-4:]}" if len(address) > 10 else address
+
+
+class ParticipantTable:
+    """Registered participants, sorted by user ID"""
+
+    def __init__(self, user_ids, addresses):
+        """
+        Args:
+            user_ids: Registration IDs
+            addresses: Raw 20-byte addresses, in the same order
+        """
+        user_ids = np.asarray(user_ids, dtype=np.uint32)
+        # One row of raw bytes per address (a bytes dtype would drop trailing zeros)
+        raw = np.frombuffer(b"".join(addresses), dtype=np.uint8).reshape(-1, ADDRESS_BYTES)
+        order = np.argsort(user_ids, kind="stable")
+        self.user_ids = user_ids[order]
+        self.addresses = raw[order]
+        self._districts = {}
+        self._committees = None
+
+    @classmethod
+    def from_items(cls, items):
+        """Build from (user_id, checksum address) pairs, e.g. AddressDirectory.items()"""
+        user_ids, addresses = [], []
+        for user_id, address in items:
+            user_ids.append(user_id)
+            addresses.append(bytes.fromhex(address[2:]))
+        return cls(user_ids, addresses)
+
+    def __len__(self):
+        return len(self.user_ids)
+
+    @property
+    def nbytes(self) -> int:
+        return self.user_ids.nbytes + self.addresses.nbytes
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """One row per participant (index = position in this table)"""
+        return pd.DataFrame({'User ID': self.user_ids})
+
+    def positions(self, user_ids) -> np.ndarray:
+        """Row position of each user ID, NO_CODE for unknown IDs"""
+        user_ids = np.asarray(user_ids, dtype=np.int64)
+        if len(self) == 0:
+            return np.full(len(user_ids), NO_CODE)
+        found = np.minimum(np.searchsorted(self.user_ids, user_ids), len(self) - 1)
+        return np.where(self.user_ids[found] == user_ids, found, NO_CODE)
+
+    def address(self, position: int) -> str:
+        """Checksummed address of one participant"""
+        return _checksum(self.addresses[position].tobytes())
+
+    def _assignment_hashes(self, suffix: str) -> np.ndarray:
+        """_assignment_hash(lowercase hex address + suffix) for every participant at once"""
+        nibbles = np.stack([self.addresses >> 4, self.addresses & 0xF], axis=-1).reshape(len(self), 2 * ADDRESS_BYTES)
+        chars = np.concatenate([
+            np.broadcast_to(np.array([ord(c) for c in "0x"], dtype=np.uint64), (len(self), 2)),
+            _HEX_DIGITS[nibbles],
+            np.broadcast_to(np.array([ord(c) for c in suffix], dtype=np.uint64), (len(self), len(suffix))),
+        ], axis=1)
+
+        hash_values = np.zeros(len(self), dtype=np.uint64)
+        for column in chars.T:
+            hash_values = (hash_values * 31 + column) & 0xFFFFFFFF
+        return hash_values
+
+    def district_codes(self, seed: str) -> np.ndarray:
+        """Assigned district per participant as uint8 codes into DISTRICTS"""
+        codes = self._districts.get(seed)
+        if codes is None:
+            codes = (self._assignment_hashes(seed) % len(DISTRICTS)).astype(np.uint8)
+            self._districts[seed] = codes
+        return codes
+
+    def committee_codes(self) -> np.ndarray:
+        """Assigned committee per participant as uint8 codes into COMMITTEES"""
+        if self._committees is None:
+            self._committees = (self._assignment_hashes("committee") % len(COMMITTEES)).astype(np.uint8)
+        return self._committees
+
+    def with_addresses(self, df: pd.DataFrame, short: bool = False) -> pd.DataFrame:
+        """
+        Copy of a table keyed by 'User ID' with a formatted 'Wallet Address'
+        column inserted after it, for display and CSV export
+
+        Args:
+            short: Abbreviate addresses (0x1234...abcd) for on-screen tables
+        """
+        positions = self.positions(df['User ID'].to_numpy())
+        formatted = []
+        for position in positions.tolist():
+            if position == NO_CODE:
+                formatted.append(None)
+            else:
+                address = self.address(position)
+                formatted.append(short_address(address) if short else address)
+
+        df = df.copy()
+        df.insert(df.columns.get_loc('User ID') + 1, 'Wallet Address', formatted)
+        return df
+
+
+def choice_lookup(choices: pd.Series, mapping: dict, labels) -> np.ndarray:
+    """
+    Map each categorical choice through mapping (option text -> label) to an
+    index into labels; NO_CODE where the choice has no mapped label
+    """
+    labels = list(labels)
+    per_category = np.array(
+        [labels.index(mapping[text]) if mapping.get(text) in labels else NO_CODE
+         for text in choices.cat.categories] + [NO_CODE],
+        dtype=np.int8,
+    )
+    # Missing values have code -1, which picks the trailing NO_CODE
+    return per_category[choices.cat.codes.to_numpy()]
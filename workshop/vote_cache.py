@@ -0,0 +1,146 @@
+"""
+Verified vote cache
+Encrypted votes are immutable once cast, so the option a (ciphertext, voter)
+pair decrypts to only has to be worked out once. Results are content-addressed
+by keccak(ciphertext), the voter address, the list of signed messages and the
+decryption key (so a session without the right key never gets a hit), kept
+in a bounded in-memory LRU and, optionally, in a SQLite file shared by every
+dashboard process.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from workshop.decryption import decrypt_and_verify_vote
+from workshop.storage import cache_dir
+
+# Entries kept in memory per process
+MEMORY_ENTRIES = 50_000
+
+# Set to 0 to keep the cache in memory only
+DISK_TIER_ENV = "VOTE_CACHE_DISK"
+DISK_FILE_NAME = "verified_votes.sqlite3"
+
+
+# Stored for a vote whose signature matches none of the options
+NO_MATCH = -1
+
+
+def _fingerprint(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()[:16]
+
+
+def cache_key(encrypted_sig, voter_address: str, options, private_key_base64: str) -> str:
+    """keccak(ciphertext) : voter address : fingerprint of the signed messages and key"""
+    from eth_utils import keccak
+
+    if isinstance(encrypted_sig, str):
+        encrypted_sig = encrypted_sig.encode("utf-8")
+    context = _fingerprint("\n".join(options) + "\n" + private_key_base64)
+    return f"{keccak(bytes(encrypted_sig)).hex()}:{voter_address.lower()}:{context}"
+
+
+class VerificationCache:
+    """Ciphertext -> recovered option index, LRU in memory with an optional disk tier"""
+
+    def __init__(self, max_entries: int = MEMORY_ENTRIES, disk_path=None):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        self._db = None
+        if disk_path is not None:
+            self._db = sqlite3.connect(str(disk_path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS verified_votes (key TEXT PRIMARY KEY, option_index INTEGER NOT NULL)"
+            )
+            self._db.commit()
+
+    def get(self, key: str):
+        """Recovered option index (0-based, NO_MATCH if none matched) or None if unknown"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT option_index FROM verified_votes WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    self._remember(key, row[0])
+                    self.hits += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, option_index: int):
+        with self._lock:
+            self._remember(key, option_index)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO verified_votes (key, option_index) VALUES (?, ?)",
+                    (key, option_index),
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, option_index: int):
+        self._entries[key] = option_index
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_verification_cache() -> VerificationCache:
+    """Process-wide cache shared by every session and dashboard"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            disk_path = None
+            if os.environ.get(DISK_TIER_ENV, "1") != "0":
+                disk_path = cache_dir() / DISK_FILE_NAME
+            _cache = VerificationCache(disk_path=disk_path)
+        return _cache
+
+
+def cached_decrypt_and_verify_vote(encrypted_bytes, voter_address, private_key_base64, options, cache=None):
+    """
+    decrypt_and_verify_vote with a cache lookup in front
+
+    Decryption errors are not cached and are retried on the next call.
+
+    Returns:
+        Same shape as decrypt_and_verify_vote; on a cache hit the signature
+        fields are None since nothing was decrypted
+    """
+    cache = cache or get_verification_cache()
+    key = cache_key(encrypted_bytes, voter_address, options, private_key_base64)
+
+    option_index = cache.get(key)
+    if option_index is not None and option_index < len(options):
+        vote = None
+        if option_index != NO_MATCH:
+            vote = {
+                'optionIndex': option_index,
+                'optionText': options[option_index],
+                'choice': option_index + 1,
+            }
+        return {'encryptedSignature': None, 'decryptedSignature': None, 'vote': vote}
+
+    result = decrypt_and_verify_vote(encrypted_bytes, voter_address, private_key_base64, options)
+    cache.put(key, result['vote']['optionIndex'] if result['vote'] else NO_MATCH)
+    return result
@@ -0,0 +1,202 @@
+"""
+Cache warmup
+Fills a contract's shared caches in background threads as soon as a
+dashboard connects, or when the process starts for a configured contract, so
+the organizer's first clicks hit warm caches instead of the RPC endpoint:
+
+    contract: web3 import, parsed ABI and contract object
+    participants: the voter address directory
+    snapshots: results snapshots of closed elections
+    ciphertexts: decryption of open private elections' votes (needs the key)
+
+Private votes are only decrypted (ciphertexts, and snapshots of closed
+private elections) with auto_decrypt, the same policy as the dashboard's
+results service (workshop/results_service.py).
+
+Every task fills the same process-wide caches the dashboards read, so a
+dashboard asking for something before its task has finished simply waits
+for, or shares, the work already in progress.
+"""
+
+import threading
+import time
+
+from workshop.addresses import get_address_directory
+from workshop.chain import STATUS_CLOSED, STATUS_OPEN, connect, load_contract, load_contract_abi
+from workshop.decryption_jobs import get_decryption_job
+from workshop.rpc_scheduler import PRIORITY_BACKGROUND, bind_priority
+from workshop.snapshots import get_or_build_snapshot
+
+WARMUP_TASKS = ("contract", "participants", "snapshots", "ciphertexts")
+
+STATE_PENDING = "pending"
+STATE_RUNNING = "running"
+STATE_DONE = "done"
+STATE_SKIPPED = "skipped"
+STATE_ERROR = "error"
+
+
+class Warmup:
+    """Background warmup of one contract's caches"""
+
+    def __init__(self, votes_config, contract=None, rpc_url: str = None, contract_address: str = None,
+                 decryption_key: str = None, auto_decrypt: bool = True):
+        """
+        Args:
+            votes_config: Parsed votes config (workshop.config.VotesConfig)
+            contract: Connected contract object, or None to connect in the
+                background with rpc_url and contract_address
+            decryption_key: Base64 private key; without it private elections are skipped
+            auto_decrypt: Decrypt private votes (False: private elections are
+                skipped, as without a key)
+        """
+        if contract is None and not (rpc_url and contract_address):
+            raise ValueError("Warmup needs a contract or an RPC URL and contract address")
+        self.votes_config = votes_config
+        self.contract = contract
+        self.rpc_url = rpc_url
+        self.contract_address = contract_address
+        self.decryption_key = decryption_key
+        self.auto_decrypt = auto_decrypt
+
+        self._lock = threading.Lock()
+        self._connected = threading.Event()
+        self._threads = []
+        self._tasks = {task: {'state': STATE_PENDING, 'seconds': None, 'detail': None, 'error': None}
+                       for task in WARMUP_TASKS}
+
+    def start(self) -> bool:
+        """
+        Start one daemon thread per task
+
+        Returns:
+            False if the warmup was already started
+        """
+        with self._lock:
+            if self._threads:
+                return False
+            for task in WARMUP_TASKS:
+                thread = threading.Thread(target=bind_priority(self._run, PRIORITY_BACKGROUND), args=(task,),
+                                          name=f"warmup-{task}", daemon=True)
+                self._threads.append(thread)
+                thread.start()
+            return True
+
+    def wait(self, timeout: float = None) -> bool:
+        """
+        Block until every task has finished
+
+        Returns:
+            True if nothing is still running
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in list(self._threads):
+            thread.join(None if deadline is None else max(0, deadline - time.monotonic()))
+        return not any(thread.is_alive() for thread in self._threads)
+
+    def status(self) -> dict:
+        """Task -> {'state', 'seconds', 'detail', 'error'}"""
+        with self._lock:
+            return {task: dict(info) for task, info in self._tasks.items()}
+
+    def _update(self, task: str, **values):
+        with self._lock:
+            self._tasks[task].update(values)
+
+    def _run(self, task: str):
+        if task != "contract":
+            # Everything else needs the contract object
+            self._connected.wait()
+            if self.contract is None:
+                self._update(task, state=STATE_SKIPPED, detail="not connected")
+                return
+
+        self._update(task, state=STATE_RUNNING)
+        started = time.monotonic()
+        try:
+            detail = getattr(self, f"_warm_{task}")()
+            state = STATE_SKIPPED if detail is None else STATE_DONE
+            self._update(task, state=state, detail=detail)
+        except Exception as e:
+            self._update(task, state=STATE_ERROR, error=str(e))
+        finally:
+            self._update(task, seconds=round(time.monotonic() - started, 3))
+            if task == "contract":
+                self._connected.set()
+
+    def _warm_contract(self):
+        load_contract_abi()
+        if self.contract is None:
+            self.contract = load_contract(connect(self.rpc_url), self.contract_address)
+        return self.contract.address
+
+    def _warm_participants(self):
+        directory = get_address_directory(self.contract)
+        loaded = directory.refresh()
+        return f"{len(directory)} participants ({loaded} fetched)"
+
+    def _elections(self, status: int, private_only: bool = False):
+        """(vote config, election) of every configured election with a status"""
+        for vote in self.votes_config.votes:
+            if private_only and vote['type'] != 'private':
+                continue
+            try:
+                election = self.contract.functions.getElection(vote['electionId']).call()
+            except Exception:
+                # Not created yet
+                continue
+            if election[1] == status:
+                yield vote, election
+
+    def _warm_snapshots(self):
+        built = 0
+        for vote, election in self._elections(STATUS_CLOSED):
+            is_private = vote['type'] == 'private'
+            if is_private and not (self.decryption_key and self.auto_decrypt):
+                continue
+            election_id = vote['electionId']
+            get_or_build_snapshot(
+                self.contract,
+                election_id,
+                election[4],
+                len(vote['options']),
+                decryption_key=self.decryption_key,
+                signature_options=self.votes_config.signature_options(election_id) if is_private else None,
+            )
+            built += 1
+        return f"{built} closed election(s)"
+
+    def _warm_ciphertexts(self):
+        if not self.decryption_key or not self.auto_decrypt:
+            return None
+        decrypted = 0
+        for vote, _ in self._elections(STATUS_OPEN, private_only=True):
+            election_id = vote['electionId']
+            job = get_decryption_job(self.contract, election_id, self.votes_config.signature_options(election_id))
+            job.start(self.decryption_key)
+            job.wait()
+            decrypted += job.status()['done']
+        return f"{decrypted} private vote(s) decrypted"
+
+
+_warmups = {}
+_warmups_lock = threading.Lock()
+
+
+def start_warmup(votes_config, contract=None, rpc_url: str = None, contract_address: str = None,
+                 decryption_key: str = None, auto_decrypt: bool = True) -> Warmup:
+    """
+    Start (once per contract and process) the warmup of a contract's caches
+
+    Pass either a connected contract or an RPC URL and contract address to
+    connect in the background. auto_decrypt decides whether private votes
+    are decrypted.
+    """
+    key = (contract.address if contract is not None else contract_address or "").lower()
+    with _warmups_lock:
+        warmup = _warmups.get(key)
+        if warmup is None:
+            warmup = Warmup(votes_config, contract, rpc_url, contract_address, decryption_key, auto_decrypt)
+            _warmups[key] = warmup
+        warmup.start()
+        return warmup
@@ -0,0 +1,91 @@
+"""
+What-if scoring
+Incremental models of the scored votes for the debrief ("what if two more
+people had voted District A?"). A model keeps the vote counts per option,
+every participant's own vote and their precomputed district or committee
+codes. Moving one vote or adding hypothetical voters is an O(1) count
+update, and re-scoring the whole leaderboard is one O(N) evaluation of the
+vote's compiled payoff rule (workshop.payoffs) - no DataFrames are rebuilt.
+"""
+
+import numpy as np
+
+from workshop.payoffs import PayoffRule
+from workshop.tables import NO_CODE
+
+
+class WhatIfModel:
+    """Vote counts plus each participant's vote, open to hypothetical changes"""
+
+    def __init__(self, rule: PayoffRule, groups, counts, voted, threshold=None):
+        """
+        Args:
+            rule: The vote's compiled payoff rule
+            groups: District / committee code per participant
+            counts: Votes per option, including voters outside the participant table
+            voted: Option code each participant voted for (NO_CODE if they did not)
+            threshold: Share in percent for the rule's thresholds (defaults to the rule's own)
+        """
+        self.rule = rule
+        self.groups = np.asarray(groups)
+        self.counts = np.asarray(counts, dtype=np.int64).copy()
+        self.voted = np.asarray(voted, dtype=np.int8).copy()
+        self.threshold = rule.default_share if threshold is None else threshold
+        self.extra = np.zeros(len(self.counts), dtype=np.int64)
+
+    @classmethod
+    def from_votes(cls, rule, groups, positions, choices, threshold=None):
+        """
+        Build from a vote table
+
+        Args:
+            rule: The vote's compiled payoff rule
+            groups: District / committee code per participant
+            positions: Participant position of each vote (NO_CODE for unknown voters)
+            choices: Option code of each vote (NO_CODE for unmapped choices)
+        """
+        positions = np.asarray(positions)
+        choices = np.asarray(choices)
+        counts = np.bincount(choices[choices != NO_CODE], minlength=len(rule.option_codes))
+        voted = np.full(len(groups), NO_CODE, dtype=np.int8)
+        known = positions != NO_CODE
+        # Later rows win, as when scoring
+        voted[positions[known]] = choices[known]
+        return cls(rule, groups, counts, voted, threshold)
+
+    def copy(self):
+        model = type(self)(self.rule, self.groups, self.counts, self.voted, self.threshold)
+        model.extra = self.extra.copy()
+        return model
+
+    @property
+    def total_counts(self) -> np.ndarray:
+        return self.counts + self.extra
+
+    @property
+    def total_votes(self) -> int:
+        return int(self.total_counts.sum())
+
+    def set_vote(self, position: int, option: int):
+        """Change one participant's vote (NO_CODE to withdraw it)"""
+        previous = self.voted[position]
+        if previous != NO_CODE:
+            self.counts[previous] -= 1
+        if option != NO_CODE:
+            self.counts[option] += 1
+        self.voted[position] = option
+
+    def set_extra(self, option: int, votes: int):
+        """Hypothetical voters (outside the participant table) for an option"""
+        self.extra[option] = votes
+
+    def evaluate(self) -> dict:
+        """
+        Returns:
+            Dict with 'counts', 'hits' (bool per threshold and option),
+            'base', 'bonus' and 'points' (per participant)
+        """
+        counts = self.total_counts
+        result = self.rule.evaluate(counts, counts.sum(), self.groups, self.voted, share=self.threshold)
+        result['counts'] = counts
+        return result